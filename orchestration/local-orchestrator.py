@@ -7,13 +7,17 @@ Uses GitHub Copilot (Claude Sonnet 4.0) without consuming cloud resources
 import subprocess
 import json
 import time
-import os
 from pathlib import Path
 from datetime import datetime
 import threading
 import queue
+import shutil
+import sys
 import psutil
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'src' / 'agents'))
+from worktree_pool import WorktreePool
+
 class LocalOrchestrator:
     def __init__(self, max_parallel=2):
         self.max_parallel = max_parallel
@@ -25,6 +29,11 @@ class LocalOrchestrator:
         self.cpu_threshold = 80  # Don't run if CPU > 80%
         self.memory_threshold = 80  # Don't run if memory > 80%
         
+        # Isolated worktrees for git operations (the local checkout is never touched)
+        self.projects_dir = Path("E:/Projects")
+        self.worktree_pool = WorktreePool("stevesurles", root=self.projects_dir / ".worktrees",
+                                          max_per_repo=max_parallel)
+        
     def check_system_resources(self):
         """Check if system has enough resources"""
         cpu_percent = psutil.cpu_percent(interval=1)
@@ -54,26 +63,64 @@ class LocalOrchestrator:
             print(f"Error creating issue: {e}")
         return None
     
-    def create_pr(self, repo, branch, title, body):
-        """Create PR for fixes"""
+    def _merge_base(self, repo_path, base):
+        """Commit where the local checkout's HEAD branched off origin/<base>"""
+        return subprocess.run(['git', 'merge-base', 'HEAD', f'origin/{base}'], cwd=str(repo_path),
+                              capture_output=True, text=True, check=True).stdout.strip()
+    
+    def _copy_local_changes(self, repo_path, worktree, since):
+        """Apply a local checkout's commits after `since` and its uncommitted changes to a worktree"""
+        diff = subprocess.run(['git', 'diff', since, '--binary'], cwd=str(repo_path),
+                              capture_output=True, check=True).stdout
+        if diff:
+            subprocess.run(['git', 'apply', '--index', '--3way', '-'], cwd=str(worktree),
+                           input=diff, capture_output=True, check=True)
+        
+        untracked = subprocess.run(['git', 'ls-files', '--others', '--exclude-standard', '-z'],
+                                   cwd=str(repo_path), capture_output=True, text=True, check=True).stdout
+        for relative in filter(None, untracked.split('\0')):
+            target = worktree / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy2(repo_path / relative, target)
+    
+    def create_pr(self, repo, branch, title, body, apply_changes=None, base="main"):
+        """Create PR for fixes
+        
+        The branch is built in a pooled worktree. With apply_changes(worktree_path)
+        it starts from origin/<base>; otherwise it starts from the merge-base of the
+        local checkout's HEAD and carries the checkout's local commits and
+        uncommitted changes. The local checkout itself is left as it is.
+        """
         try:
-            # Change to repo directory
-            repo_path = Path(f"E:/Projects/{repo}")
-            os.chdir(repo_path)
-            
-            # Create branch
-            subprocess.run(f"git checkout -b {branch}", shell=True)
+            repo_path = self.projects_dir / repo
+            start_point = f"origin/{base}" if apply_changes else self._merge_base(repo_path, base)
             
-            # Stage and commit changes (if any)
-            subprocess.run("git add .", shell=True)
-            subprocess.run(f'git commit -m "fix: {title}"', shell=True)
-            
-            # Push branch
-            subprocess.run(f"git push origin {branch}", shell=True)
+            with self.worktree_pool.worktree(repo, start_point) as worktree:
+                git = lambda *args: self.worktree_pool.git(list(args), worktree)
+                
+                # Create branch
+                git('checkout', '-B', branch)
+                
+                # Stage and commit changes (if any)
+                if apply_changes:
+                    apply_changes(worktree)
+                else:
+                    self._copy_local_changes(repo_path, worktree, start_point)
+                git('add', '-A')
+                if not git('status', '--porcelain').stdout.strip():
+                    print(f"ℹ️  No changes to open a PR for in {repo}")
+                    return None
+                git('commit', '-m', f"fix: {title}")
+                
+                # Push branch
+                git('push', '--force-with-lease', 'origin', f"HEAD:refs/heads/{branch}")
             
             # Create PR
-            cmd = f'gh pr create --title "{title}" --body "{body}" --base main --head {branch}'
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            result = subprocess.run(
+                ['gh', 'pr', 'create', '--repo', f'stevesurles/{repo}', '--title', title,
+                 '--body', body, '--base', base, '--head', branch],
+                capture_output=True, text=True
+            )
             
             if result.returncode == 0:
                 pr_url = result.stdout.strip()
@@ -18,8 +18,14 @@ import re
 import threading
 from pathlib import Path
 import hashlib
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'src' / 'agents'))
+from worktree_pool import WorktreePool
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -89,6 +95,300 @@ class MergeStrategy:
     require_checks: List[str]
     auto_merge: bool
 
+PR_FIELDS_FRAGMENT = """
+fragment PRFields on PullRequest {
+  number title body headRefName baseRefName headRefOid state isDraft mergeable
+  author { login }
+  createdAt updatedAt changedFiles additions deletions
+  labels(first: 50) { nodes { name } }
+  reviewRequests(first: 20) { nodes { requestedReviewer { ... on User { login } ... on Team { name } } } }
+  reviews(last: 50) { nodes { state body author { login } } }
+  commits(last: 100) { nodes { commit { oid } } }
+  headCommit: commits(last: 1) {
+    nodes { commit { statusCheckRollup { contexts(first: 50) { nodes {
+      __typename
+      ... on CheckRun { name status conclusion }
+      ... on StatusContext { context state }
+    } } } } }
+  }
+}
+"""
+
+OPEN_PRS_QUERY = PR_FIELDS_FRAGMENT + """
+query($owner: String!, $name: String!, $endCursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(states: OPEN, first: 50, after: $endCursor) {
+      nodes { ...PRFields }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+
+class PRRefreshEngine:
+    """Refreshes tracked PRs with batched GraphQL queries and reports only the ones that changed
+
+    Open PRs of a repository come from one paginated query; tracked PRs that
+    are no longer open (merged or closed) are fetched together in a single
+    aliased query. Repositories are refreshed concurrently.
+    """
+    
+    def __init__(self, owner: str, max_workers: int = 4, batch_size: int = 50):
+        self.owner = owner
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.fingerprints = {}  # (repo, number) -> fingerprint of the last seen state
+    
+    def _graphql(self, query: str, variables: Dict[str, Any], paginate: bool = False,
+                 jq: str = None) -> Optional[str]:
+        cmd = ['gh', 'api', 'graphql', '-f', f'query={query}']
+        for key, value in variables.items():
+            cmd.extend(['-F', f'{key}={value}'])
+        if paginate:
+            cmd.append('--paginate')
+        if jq:
+            cmd.extend(['--jq', jq])
+        
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        except Exception as e:
+            logger.error(f"GraphQL request failed: {e}")
+            return None
+        
+        if result.returncode != 0:
+            logger.error(f"GraphQL request failed: {result.stderr}")
+            return None
+        return result.stdout
+    
+    def fetch_open(self, repo: str) -> Optional[Dict[int, Dict[str, Any]]]:
+        """All open PRs of a repository, keyed by number"""
+        output = self._graphql(
+            OPEN_PRS_QUERY, {'owner': self.owner, 'name': repo}, paginate=True,
+            jq='.data.repository.pullRequests.nodes[]'
+        )
+        if output is None:
+            return None
+        nodes = [json.loads(line) for line in output.splitlines() if line.strip()]
+        return {node['number']: node for node in nodes}
+    
+    def fetch_numbers(self, repo: str, numbers: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Specific PRs of a repository via aliased pullRequest(number:) lookups"""
+        found = {}
+        for start in range(0, len(numbers), self.batch_size):
+            chunk = numbers[start:start + self.batch_size]
+            aliases = " ".join(f"pr{number}: pullRequest(number: {number}) {{ ...PRFields }}" for number in chunk)
+            query = PR_FIELDS_FRAGMENT + (
+                "query($owner: String!, $name: String!) { repository(owner: $owner, name: $name) { "
+                + aliases + " } }"
+            )
+            output = self._graphql(query, {'owner': self.owner, 'name': repo})
+            if output is None:
+                continue
+            repository = json.loads(output).get('data', {}).get('repository') or {}
+            for node in repository.values():
+                if node:
+                    found[node['number']] = node
+        return found
+    
+    @staticmethod
+    def fingerprint(node: Dict[str, Any]) -> str:
+        """Hash of the fields the orchestrator reacts to"""
+        relevant = {
+            'state': node.get('state'),
+            'isDraft': node.get('isDraft'),
+            'mergeable': node.get('mergeable'),
+            'updatedAt': node.get('updatedAt'),
+            'headRefOid': node.get('headRefOid'),
+            'labels': node.get('labels'),
+            'reviews': node.get('reviews'),
+            'checks': node.get('headCommit')
+        }
+        return hashlib.md5(json.dumps(relevant, sort_keys=True).encode()).hexdigest()
+    
+    def refresh_repository(self, repo: str, numbers: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Nodes for the tracked PRs of one repository that changed since the last refresh"""
+        nodes = self.fetch_open(repo)
+        if nodes is None:
+            return {}  # Keep the cached fingerprints so the next cycle retries
+        
+        missing = [number for number in numbers if number not in nodes]
+        if missing:
+            nodes.update(self.fetch_numbers(repo, missing))
+        
+        changed = {}
+        for number in numbers:
+            node = nodes.get(number)
+            if not node:
+                continue
+            fingerprint = self.fingerprint(node)
+            if self.fingerprints.get((repo, number)) != fingerprint:
+                self.fingerprints[(repo, number)] = fingerprint
+                changed[number] = node
+        return changed
+    
+    def refresh(self, tracked: Dict[str, List[int]]) -> Dict[Tuple[str, int], Dict[str, Any]]:
+        """Refresh every repository concurrently; returns changed nodes keyed by (repo, number)"""
+        changed = {}
+        if not tracked:
+            return changed
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tracked))) as executor:
+            futures = {repo: executor.submit(self.refresh_repository, repo, numbers)
+                       for repo, numbers in tracked.items()}
+            for repo, future in futures.items():
+                try:
+                    for number, node in future.result().items():
+                        changed[(repo, number)] = node
+                except Exception as e:
+                    logger.error(f"Error refreshing PRs in {repo}: {e}")
+        return changed
+    
+    def forget(self, repo: str, number: int):
+        self.fingerprints.pop((repo, number), None)
+
+
+class MergeTrain:
+    """Speculative batched merging for one (repository, base branch)
+    
+    Approved PRs are stacked on the base in an isolated worktree and checked
+    together. A passing batch is merged PR by PR without re-testing; a failing
+    batch is bisected so good PRs still merge and the culprit is ejected.
+    """
+    
+    def __init__(self, orchestrator: 'PROrchestrator', repo: str, base_branch: str,
+                 check_command: str = None, check_timeout: int = 3600, poll_interval: int = 30):
+        self.orchestrator = orchestrator
+        self.workspace = orchestrator.workspace
+        self.repo = repo
+        self.base_branch = base_branch
+        self.check_command = check_command
+        self.check_timeout = check_timeout
+        self.poll_interval = poll_interval
+    
+    def run(self, prs: List[PullRequest]) -> Dict[str, List[str]]:
+        """Run the train; returns PR ids by outcome (merged, ejected, deferred)"""
+        outcome = {'merged': [], 'ejected': [], 'deferred': []}
+        self._run_batch(prs, outcome)
+        return outcome
+    
+    def _run_batch(self, batch: List[PullRequest], outcome: Dict[str, List[str]]):
+        if not batch:
+            return
+        
+        result, clean = self._build_and_check(batch)
+        ejected = [pr for pr in batch if pr not in clean]
+        for pr in ejected:
+            self._eject(pr, "conflicts with the rest of the merge train", conflicts=True)
+            outcome['ejected'].append(pr.pr_id)
+        
+        if not clean:
+            return
+        if result is True:
+            for index, pr in enumerate(clean):
+                if not self.orchestrator.merge_pr(pr.pr_id):
+                    # Base moved or merge rejected: leave the rest queued for the next train
+                    outcome['deferred'].extend(p.pr_id for p in clean[index:])
+                    return
+                outcome['merged'].append(pr.pr_id)
+        elif result is None:
+            # Checks never reported; don't blame anyone
+            outcome['deferred'].extend(pr.pr_id for pr in clean)
+        elif len(clean) == 1:
+            self._eject(clean[0], "checks failed on top of the current base")
+            outcome['ejected'].append(clean[0].pr_id)
+        else:
+            # Bisect: the left half is tested alone, the right half on top of whatever merged
+            middle = len(clean) // 2
+            logger.info(f"Merge train for {self.repo}:{self.base_branch} failed with {len(clean)} PRs, bisecting")
+            self._run_batch(clean[:middle], outcome)
+            self._run_batch(clean[middle:], outcome)
+    
+    def _build_and_check(self, batch: List[PullRequest]) -> Tuple[Optional[bool], List[PullRequest]]:
+        """Stack the batch on the base branch and check the combined result"""
+        # Always start from the latest base: earlier halves of a bisection may have merged
+        self.workspace.mirror(self.repo, force_fetch=True)
+        clean = []
+        with self.workspace.worktree(self.repo, f"origin/{self.base_branch}") as path:
+            for pr in batch:
+                ref = self.workspace.fetch_pr(self.repo, pr.number)
+                merged = self.workspace.git(['merge', '--no-ff', '--no-edit', ref], path, check=False)
+                if merged.returncode == 0:
+                    clean.append(pr)
+                else:
+                    self.workspace.git(['merge', '--abort'], path, check=False)
+            
+            if not clean:
+                return None, clean
+            
+            if self.check_command:
+                checked = subprocess.run(self.check_command, shell=True, cwd=str(path),
+                                         capture_output=True, text=True, timeout=self.check_timeout)
+                return checked.returncode == 0, clean
+            
+            return self._remote_checks(path, clean), clean
+    
+    def _remote_checks(self, path: Path, batch: List[PullRequest]) -> Optional[bool]:
+        """Push the combined commit to a train branch and wait for the required checks"""
+        required = set()
+        for pr in batch:
+            required.update(self.orchestrator._get_merge_strategy(pr).require_checks)
+        if not required:
+            return True
+        
+        sha = self.workspace.git(['rev-parse', 'HEAD'], path).stdout.strip()
+        branch = f"merge-train/{self.base_branch}/{uuid.uuid4().hex[:8]}"
+        self.workspace.git(['push', 'origin', f'HEAD:refs/heads/{branch}'], path)
+        try:
+            deadline = time.time() + self.check_timeout
+            while time.time() < deadline:
+                statuses = self._check_statuses(sha)
+                results = {required_check: statuses.get(required_check, 'pending') for required_check in required}
+                if any(status in ('failure', 'error', 'cancelled', 'timed_out') for status in results.values()):
+                    return False
+                if all(status == 'success' for status in results.values()):
+                    return True
+                time.sleep(self.poll_interval)
+            logger.warning(f"Merge train checks for {self.repo}@{sha[:8]} timed out")
+            return None
+        finally:
+            self.workspace.git(['push', 'origin', '--delete', branch], path, check=False)
+    
+    def _check_statuses(self, sha: str) -> Dict[str, str]:
+        """Check run status by exact name; empty (all pending) if they can't be read this time"""
+        try:
+            result = subprocess.run(
+                ['gh', 'api', f'repos/{self.orchestrator.owner}/{self.repo}/commits/{sha}/check-runs',
+                 '--jq', '.check_runs[] | {name, status, conclusion}'],
+                capture_output=True, text=True, timeout=60
+            )
+        except subprocess.TimeoutExpired:
+            logger.warning(f"Timed out reading checks for {self.repo}@{sha[:8]}")
+            return {}
+        if result.returncode != 0:
+            logger.warning(f"Could not read checks for {self.repo}@{sha[:8]}: {result.stderr.strip()}")
+            return {}
+        statuses = {}
+        for line in result.stdout.splitlines():
+            if line.strip():
+                run = json.loads(line)
+                statuses[run['name']] = (run['conclusion'] or 'pending') if run['status'] == 'completed' else 'pending'
+        return statuses
+    
+    def _eject(self, pr: PullRequest, reason: str, conflicts: bool = False):
+        """Take a PR out of the merge queue and tell its author why"""
+        if pr.pr_id in self.orchestrator.merge_queue:
+            self.orchestrator.merge_queue.remove(pr.pr_id)
+        pr.conflicts = pr.conflicts or conflicts
+        pr.state = PRState.CONFLICT if conflicts else PRState.CHANGES_REQUESTED
+        subprocess.run(
+            ['gh', 'pr', 'comment', str(pr.number),
+             '--repo', f'{self.orchestrator.owner}/{self.repo}',
+             '--body', f'Removed from the merge train: {reason}.'],
+            capture_output=True
+        )
+        logger.info(f"Ejected PR {pr.pr_id} from merge train: {reason}")
+
+
 class PROrchestrator:
     """Main orchestrator for PR lifecycle management"""
     
@@ -200,6 +500,29 @@ class PROrchestrator:
             'minor_changes': {'additions': 10, 'deletions': 10}
         }
         
+        # Merge strategy per (repository, labels), see _get_merge_strategy
+        self._merge_strategy_cache = {}
+        
+        # Batched PR refresh
+        self.refresh_engine = PRRefreshEngine(owner)
+        
+        # Merge trains (one per repository and base branch, each on its own thread so
+        # waiting for checks never holds up monitoring)
+        self.workspace = WorktreePool(owner, root=Path("pr_workspaces"))
+        self.merge_train_enabled = True
+        self.max_train_size = 8
+        self.max_parallel_trains = 4
+        self.train_check_command = os.getenv('MERGE_TRAIN_CHECK_COMMAND')
+        self.running_trains: Dict[Tuple[str, str], float] = {}  # (repo, base) -> started at
+        self.finished_trains: List[Tuple[Tuple[str, str], float, Optional[Dict[str, List[str]]]]] = []
+        self._trains_lock = threading.Lock()
+        # A PR whose train checks never reported waits before riding again, and is
+        # ejected after max_train_deferrals (e.g. CI not running on merge-train/* branches)
+        self.train_deferrals: Dict[str, int] = {}
+        self.train_retry_at: Dict[str, float] = {}
+        self.train_retry_delay = 300
+        self.max_train_deferrals = 3
+        
         # Monitoring
         self.monitor_interval = 30
         self.monitoring = True
@@ -360,6 +683,67 @@ class PROrchestrator:
         
         return None
     
+    def _pr_from_graphql(self, repo: str, node: Dict[str, Any]) -> PullRequest:
+        """Build a PullRequest from a GraphQL PRFields node"""
+        reviewers = []
+        for request in node.get('reviewRequests', {}).get('nodes', []):
+            reviewer = request.get('requestedReviewer') or {}
+            if reviewer.get('login') or reviewer.get('name'):
+                reviewers.append(reviewer.get('login') or reviewer.get('name'))
+        
+        approvals = []
+        requested_changes = []
+        for review in node.get('reviews', {}).get('nodes', []):
+            author = (review.get('author') or {}).get('login', 'unknown')
+            if review['state'] == 'APPROVED':
+                approvals.append(author)
+            elif review['state'] == 'CHANGES_REQUESTED':
+                requested_changes.append({'author': author, 'body': review.get('body', '')})
+        
+        checks_status = {}
+        for commit in node.get('headCommit', {}).get('nodes', []):
+            rollup = commit['commit'].get('statusCheckRollup') or {}
+            for check in rollup.get('contexts', {}).get('nodes', []):
+                if check.get('__typename') == 'CheckRun':
+                    checks_status[check.get('name', 'unknown')] = (check.get('conclusion') or check.get('status') or 'pending').lower()
+                else:
+                    checks_status[check.get('context', 'unknown')] = (check.get('state') or 'pending').lower()
+        
+        if node['state'] == 'MERGED':
+            state = PRState.MERGED
+        elif node['state'] == 'CLOSED':
+            state = PRState.CLOSED
+        elif node.get('isDraft'):
+            state = PRState.DRAFT
+        else:
+            state = PRState.READY
+        
+        return PullRequest(
+            pr_id="",  # Will be set by caller
+            number=node['number'],
+            repository=repo,
+            title=node['title'],
+            description=node.get('body', ''),
+            branch=node['headRefName'],
+            base_branch=node['baseRefName'],
+            state=state,
+            author=(node.get('author') or {}).get('login', 'unknown'),
+            created_at=node['createdAt'],
+            updated_at=node['updatedAt'],
+            reviewers=reviewers,
+            approvals=approvals,
+            requested_changes=requested_changes,
+            labels=[l['name'] for l in node.get('labels', {}).get('nodes', [])],
+            checks_status=checks_status,
+            conflicts=node.get('mergeable') == 'CONFLICTING',
+            mergeable=node.get('mergeable') == 'MERGEABLE',
+            comments=[],
+            commits=[c['commit']['oid'] for c in node.get('commits', {}).get('nodes', [])],
+            files_changed=node.get('changedFiles', 0),
+            additions=node.get('additions', 0),
+            deletions=node.get('deletions', 0)
+        )
+    
     def _add_labels(self, repo: str, pr_number: int, labels: List[str]):
         """Add labels to a PR"""
         try:
@@ -561,7 +945,12 @@ class PROrchestrator:
         logger.info(f"Processed review from {reviewer} for PR {pr_id}: {status}")
     
     def _get_merge_strategy(self, pr: PullRequest) -> MergeStrategy:
-        """Get merge strategy for PR"""
+        """Get merge strategy for PR (memoized per repository and label set)"""
+        key = (pr.repository, tuple(pr.labels))
+        strategy = self._merge_strategy_cache.get(key)
+        if strategy is not None:
+            return strategy
+        
         # Determine PR type from labels or title
         pr_type = 'feature'  # Default
         
@@ -570,7 +959,9 @@ class PROrchestrator:
                 pr_type = label.lower()
                 break
         
-        return self.merge_strategies.get(pr_type, self.merge_strategies['feature'])
+        strategy = self.merge_strategies.get(pr_type, self.merge_strategies['feature'])
+        self._merge_strategy_cache[key] = strategy
+        return strategy
     
     def _queue_for_merge(self, pr: PullRequest):
         """Add PR to merge queue"""
@@ -685,24 +1076,27 @@ class PROrchestrator:
         
         if strategy == 'rebase':
             try:
-                # Attempt to rebase
-                result = subprocess.run(
-                    ['gh', 'pr', 'checkout', str(pr.number),
-                     '--repo', f'{self.owner}/{pr.repository}'],
-                    capture_output=True
-                )
-                
-                if result.returncode == 0:
-                    # Perform rebase
-                    subprocess.run(['git', 'rebase', pr.base_branch], capture_output=True)
-                    subprocess.run(['git', 'push', '--force-with-lease'], capture_output=True)
+                # Rebase in an isolated worktree so concurrent rebases can't interfere
+                self.workspace.mirror(pr.repository, force_fetch=True)
+                with self.workspace.worktree(pr.repository, f"origin/{pr.branch}") as path:
+                    head = self.workspace.git(['rev-parse', 'HEAD'], path).stdout.strip()
+                    result = self.workspace.git(['rebase', f"origin/{pr.base_branch}"], path, check=False)
                     
-                    pr.conflicts = False
-                    pr.state = PRState.READY
+                    if result.returncode == 0:
+                        self.workspace.git(
+                            ['push', f'--force-with-lease=refs/heads/{pr.branch}:{head}',
+                             'origin', f'HEAD:refs/heads/{pr.branch}'],
+                            path
+                        )
+                        
+                        pr.conflicts = False
+                        pr.state = PRState.READY
+                        
+                        self.metrics['conflict_resolutions'] += 1
+                        logger.info(f"Successfully rebased PR {pr_id}")
+                        return True
                     
-                    self.metrics['conflict_resolutions'] += 1
-                    logger.info(f"Successfully rebased PR {pr_id}")
-                    return True
+                    self.workspace.git(['rebase', '--abort'], path, check=False)
                     
             except Exception as e:
                 logger.error(f"Failed to rebase: {e}")
@@ -800,28 +1194,19 @@ class PROrchestrator:
         while self.monitoring:
             try:
                 # Process merge queue
-                for pr_id in list(self.merge_queue):
-                    pr = self.active_prs.get(pr_id)
-                    if pr and pr.state == PRState.APPROVED:
-                        if self._check_merge_requirements(pr):
-                            self.merge_pr(pr_id)
-                
-                # Check for PR updates
-                for pr_id, pr in list(self.active_prs.items()):
-                    if pr.state not in [PRState.MERGED, PRState.CLOSED]:
-                        # Refresh PR details
-                        updated_pr = self._get_pr_details(pr.repository, pr.number)
-                        if updated_pr:
-                            # Update tracked PR
-                            updated_pr.pr_id = pr_id
-                            self.active_prs[pr_id] = updated_pr
-                            
-                            # Check for state changes
-                            if len(updated_pr.approvals) >= self._get_merge_strategy(updated_pr).require_approvals:
-                                if updated_pr.state != PRState.APPROVED:
-                                    updated_pr.state = PRState.APPROVED
-                                    if self._get_merge_strategy(updated_pr).auto_merge:
-                                        self._queue_for_merge(updated_pr)
+                if self.merge_train_enabled:
+                    self.run_merge_trains()
+                else:
+                    for pr_id in list(self.merge_queue):
+                        pr = self.active_prs.get(pr_id)
+                        if pr and pr.state in [PRState.APPROVED, PRState.MERGING]:
+                            if self._check_merge_requirements(pr):
+                                self.merge_pr(pr_id)
+                
+                # Check for PR updates (one batched query per repository, changed PRs only)
+                self.refresh_prs()
+                
+                self.workspace.collect_garbage()
                 
                 # Log status
                 active_count = len([pr for pr in self.active_prs.values() 
@@ -834,6 +1219,128 @@ class PROrchestrator:
             
             time.sleep(self.monitor_interval)
     
+    def _plan_merge_trains(self) -> Dict[Tuple[str, str], List[PullRequest]]:
+        """Group ready PRs from the merge queue into trains, in queue order"""
+        trains = defaultdict(list)
+        now = time.time()
+        for pr_id in list(self.merge_queue):
+            pr = self.active_prs.get(pr_id)
+            if not pr or pr.state not in [PRState.APPROVED, PRState.MERGING]:
+                continue
+            if self.train_retry_at.get(pr_id, 0) > now:
+                continue
+            if not self._check_merge_requirements(pr):
+                continue
+            key = (pr.repository, pr.base_branch)
+            if len(trains[key]) < self.max_train_size:
+                trains[key].append(pr)
+        return dict(trains)
+    
+    def run_merge_trains(self) -> Dict[str, List[str]]:
+        """Start a train for every repository and base branch that has none running
+
+        Never blocks: trains run on their own threads. Returns the outcome of the
+        trains that finished since the last call.
+        """
+        outcome = self._collect_merge_trains()
+        with self._trains_lock:
+            running = set(self.running_trains)
+        for key, prs in self._plan_merge_trains().items():
+            if key in running:
+                continue
+            if len(running) >= self.max_parallel_trains:
+                break
+            running.add(key)
+            with self._trains_lock:
+                self.running_trains[key] = time.time()
+            threading.Thread(target=self._run_merge_train, args=(key, prs), daemon=True,
+                             name=f"merge-train-{key[0]}-{key[1]}").start()
+        return outcome
+    
+    def _run_merge_train(self, key: Tuple[str, str], prs: List[PullRequest]):
+        result = None
+        try:
+            result = MergeTrain(self, key[0], key[1], check_command=self.train_check_command).run(prs)
+        except Exception as e:
+            logger.error(f"Merge train for {key[0]}:{key[1]} failed: {e}")
+        finally:
+            with self._trains_lock:
+                started = self.running_trains.pop(key, time.time())
+                self.finished_trains.append((key, started, result))
+    
+    def _collect_merge_trains(self) -> Dict[str, List[str]]:
+        """Fold finished trains into one outcome and back off PRs they deferred"""
+        outcome = {'merged': [], 'ejected': [], 'deferred': []}
+        with self._trains_lock:
+            finished, self.finished_trains = self.finished_trains, []
+        for (repo, base), started, result in finished:
+            if result is None:
+                continue
+            for key in outcome:
+                outcome[key].extend(result[key])
+            for pr_id in result['merged'] + result['ejected']:
+                self.train_deferrals.pop(pr_id, None)
+                self.train_retry_at.pop(pr_id, None)
+            for pr_id in result['deferred']:
+                self._defer_train_pr(pr_id)
+            logger.info(f"Merge train {repo}:{base} finished after {time.time() - started:.0f}s: "
+                        f"{len(result['merged'])} merged, {len(result['ejected'])} ejected, "
+                        f"{len(result['deferred'])} deferred")
+        return outcome
+    
+    def _defer_train_pr(self, pr_id: str):
+        deferrals = self.train_deferrals.get(pr_id, 0) + 1
+        pr = self.active_prs.get(pr_id)
+        if deferrals >= self.max_train_deferrals and pr:
+            self.train_deferrals.pop(pr_id, None)
+            self.train_retry_at.pop(pr_id, None)
+            MergeTrain(self, pr.repository, pr.base_branch)._eject(
+                pr, f"required checks did not report on {deferrals} merge trains in a row")
+            return
+        self.train_deferrals[pr_id] = deferrals
+        self.train_retry_at[pr_id] = time.time() + self.train_retry_delay * 2 ** (deferrals - 1)
+    
+    def refresh_prs(self) -> int:
+        """Refresh all active PRs and run handlers for the ones that changed"""
+        tracked = defaultdict(list)
+        pr_ids = {}
+        for pr_id, pr in self.active_prs.items():
+            if pr.state not in [PRState.MERGED, PRState.CLOSED]:
+                tracked[pr.repository].append(pr.number)
+                pr_ids[(pr.repository, pr.number)] = pr_id
+        
+        changed = self.refresh_engine.refresh(dict(tracked))
+        for key, node in changed.items():
+            pr_id = pr_ids[key]
+            updated_pr = self._pr_from_graphql(key[0], node)
+            updated_pr.pr_id = pr_id
+            self._handle_pr_update(self.active_prs[pr_id], updated_pr)
+        
+        if changed:
+            logger.info(f"Refreshed {len(pr_ids)} PRs, {len(changed)} changed")
+        return len(changed)
+    
+    def _handle_pr_update(self, pr: PullRequest, updated_pr: PullRequest):
+        """React to a PR whose GitHub state changed since the last refresh"""
+        self.active_prs[pr.pr_id] = updated_pr
+        
+        if updated_pr.state in [PRState.MERGED, PRState.CLOSED]:
+            if pr.pr_id in self.merge_queue:
+                self.merge_queue.remove(pr.pr_id)
+            self.refresh_engine.forget(updated_pr.repository, updated_pr.number)
+            logger.info(f"PR {pr.pr_id} was {updated_pr.state.value} outside the orchestrator")
+            return
+        
+        # Check for state changes
+        strategy = self._get_merge_strategy(updated_pr)
+        if len(updated_pr.approvals) >= strategy.require_approvals:
+            if pr.pr_id in self.merge_queue:
+                updated_pr.state = PRState.MERGING
+            else:
+                updated_pr.state = PRState.APPROVED
+                if strategy.auto_merge:
+                    self._queue_for_merge(updated_pr)
+    
     def start_monitoring(self):
         """Start the monitoring thread"""
         if not self.monitor_thread or not self.monitor_thread.is_alive():
@@ -854,6 +1361,8 @@ class PROrchestrator:
             'active_prs': len(self.active_prs),
             'review_queue': len(self.review_queue),
             'merge_queue': len(self.merge_queue),
+            'running_trains': {f"{repo}:{base}": time.time() - started
+                               for (repo, base), started in list(self.running_trains.items())},
             'prs_by_state': self._count_by_state(),
             'metrics': self.metrics
         }
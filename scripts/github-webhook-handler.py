@@ -10,21 +10,292 @@ import hmac
 import json
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import sqlite3
+import sys
+import threading
+import time
+import uuid
 from datetime import datetime
+from pathlib import Path
 import logging
 
+sys.path.append(str(Path(__file__).resolve().parent.parent / 'src' / 'agents'))
+from issue_routing import IssueRoutingEngine
+
 app = Flask(__name__)
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+WEBHOOK_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    delivery_id TEXT PRIMARY KEY,
+    event_type TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    received_at REAL NOT NULL,
+    retry_at REAL NOT NULL DEFAULT 0,
+    lease_expires REAL,
+    completed_at REAL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_status ON events (status, received_at);
+"""
+
+
+class WebhookEventQueue:
+    """Durable SQLite queue of received webhook deliveries, deduplicated by X-GitHub-Delivery"""
+
+    def __init__(self, db_path='webhook_events.db', lease_seconds=300, max_attempts=5, retry_backoff_seconds=2):
+        self.db_path = Path(db_path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._local = threading.local()
+        self._available = threading.Event()
+        self._connect().executescript(WEBHOOK_QUEUE_SCHEMA)
+
+    def _connect(self):
+        """Per-thread connection (sqlite3 connections can't be shared across threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, delivery_id, event_type, payload_body):
+        """Store a delivery; returns False if this delivery id was already received"""
+        cursor = self._connect().execute(
+            "INSERT OR IGNORE INTO events (delivery_id, event_type, payload, received_at) VALUES (?, ?, ?, ?)",
+            (delivery_id, event_type, payload_body, time.time())
+        )
+        if cursor.rowcount == 1:
+            self._available.set()
+            return True
+        return False
+
+    def claim(self):
+        """Atomically claim the oldest pending delivery (or one whose lease expired)"""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # A lease that expired on its last attempt (e.g. the worker crashed) is parked, not retried
+            conn.execute(
+                "UPDATE events SET status = 'failed', error = COALESCE(error, 'lease expired') "
+                "WHERE status = 'processing' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT delivery_id, event_type, payload, attempts FROM events "
+                "WHERE (status = 'pending' AND retry_at <= ?) "
+                "OR (status = 'processing' AND lease_expires < ? AND attempts < ?) "
+                "ORDER BY received_at LIMIT 1",
+                (now, now, self.max_attempts)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE events SET status = 'processing', attempts = attempts + 1, lease_expires = ? "
+                    "WHERE delivery_id = ?",
+                    (now + self.lease_seconds, row['delivery_id'])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return dict(row) if row else None
+
+    def complete(self, delivery_id, result=None):
+        self._connect().execute(
+            "UPDATE events SET status = 'done', completed_at = ?, result = ? WHERE delivery_id = ?",
+            (time.time(), json.dumps(result), delivery_id)
+        )
+
+    def fail(self, delivery_id, attempts, error):
+        """Return a delivery to the queue with exponential backoff, or park it as failed after max_attempts"""
+        status = 'failed' if attempts >= self.max_attempts else 'pending'
+        retry_at = time.time() + self.retry_backoff_seconds * (2 ** (attempts - 1))
+        self._connect().execute(
+            "UPDATE events SET status = ?, error = ?, retry_at = ? WHERE delivery_id = ?",
+            (status, error, retry_at, delivery_id)
+        )
+
+    def wait(self, timeout):
+        """Block until new work may be available"""
+        self._available.wait(timeout)
+        self._available.clear()
+
+    def get_status(self, delivery_id):
+        row = self._connect().execute(
+            "SELECT delivery_id, event_type, status, attempts, received_at, completed_at, result, error "
+            "FROM events WHERE delivery_id = ?",
+            (delivery_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        status = dict(row)
+        status['result'] = json.loads(status['result']) if status['result'] else None
+        return status
+
+    def counts(self):
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM events GROUP BY status").fetchall()
+        counts = {'pending': 0, 'processing': 0, 'done': 0, 'failed': 0}
+        counts.update({status: n for status, n in rows})
+        return counts
+
+
+WORKLOAD_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workload (
+    agent TEXT PRIMARY KEY,
+    open_issues INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS assignments (
+    issue_key TEXT PRIMARY KEY,
+    agent TEXT NOT NULL,
+    assigned_at REAL NOT NULL
+);
+"""
+
+
+class AgentWorkloadLedger:
+    """Open-issue count per agent, shared through SQLite by every webhook worker
+
+    Assignments are recorded per issue so redelivered or repeated events
+    can't double count. Reads are served from a per-thread in-memory snapshot
+    that is reloaded only when another connection has committed (PRAGMA
+    data_version, which is per connection too).
+    """
+
+    def __init__(self, db_path='webhook_events.db', agents=()):
+        self.db_path = Path(db_path)
+        self._local = threading.local()
+        
+        conn = self._connect()
+        conn.executescript(WORKLOAD_SCHEMA)
+        conn.executemany("INSERT OR IGNORE INTO workload (agent) VALUES (?)", [(agent,) for agent in agents])
+        self._reload(conn)
+
+    def _connect(self):
+        """Per-thread connection (sqlite3 connections can't be shared across threads)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            # The snapshot and the data_version it was read at belong to this connection
+            self._local.version = None
+            self._local.snapshot = {}
+        return conn
+
+    def _reload(self, conn):
+        # One read transaction, so the rows are exactly those of the version recorded
+        conn.execute("BEGIN")
+        try:
+            version = conn.execute("PRAGMA data_version").fetchone()[0]
+            snapshot = dict(conn.execute("SELECT agent, open_issues FROM workload").fetchall())
+        finally:
+            conn.execute("COMMIT")
+        self._local.version, self._local.snapshot = version, snapshot
+
+    def snapshot(self):
+        """Current workload by agent; reloads only if another connection changed it"""
+        conn = self._connect()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._local.version != version:
+            self._reload(conn)
+        return self._local.snapshot
+
+    def get(self, agent):
+        return self.snapshot().get(agent, 0)
+
+    def assign(self, issue_key, agent):
+        """Record an assignment and bump the agent's load; False if the issue was already assigned"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO assignments (issue_key, agent, assigned_at) VALUES (?, ?, ?)",
+                (issue_key, agent, time.time())
+            )
+            recorded = cursor.rowcount == 1
+            if recorded:
+                conn.execute(
+                    "INSERT INTO workload (agent, open_issues) VALUES (?, 1) "
+                    "ON CONFLICT(agent) DO UPDATE SET open_issues = open_issues + 1",
+                    (agent,)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._reload(conn)
+        return recorded
+
+    def assigned_agent(self, issue_key):
+        row = self._connect().execute(
+            "SELECT agent FROM assignments WHERE issue_key = ?", (issue_key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def complete(self, issue_key, fallback_agent=None):
+        """Release an issue's assignment and decrement its agent's load; returns the agent"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT agent FROM assignments WHERE issue_key = ?", (issue_key,)).fetchone()
+            agent = row[0] if row else fallback_agent
+            if row:
+                conn.execute("DELETE FROM assignments WHERE issue_key = ?", (issue_key,))
+            if agent:
+                conn.execute(
+                    "UPDATE workload SET open_issues = MAX(0, open_issues - 1) WHERE agent = ?",
+                    (agent,)
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._reload(conn)
+        return agent
+
+
+def create_http_session(retries=3, backoff_factor=0.5, pool_maxsize=10):
+    """Pooled HTTP session that retries transient failures with exponential backoff"""
+    session = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(['GET', 'POST'])
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
 class GitHubWebhookHandler:
     def __init__(self):
         self.webhook_secret = os.getenv('GITHUB_WEBHOOK_SECRET')
         self.agent_api_url = os.getenv('AGENT_API_URL', 'http://localhost:5003/api')
         self.pm_notification_url = os.getenv('PM_NOTIFICATION_URL')
         
+        # Deliveries are queued durably and processed off the request thread
+        self.event_queue = WebhookEventQueue(os.getenv('WEBHOOK_QUEUE_DB', 'webhook_events.db'))
+        self.worker_count = int(os.getenv('WEBHOOK_WORKERS', '4'))
+        self.workers = []
+        self._workers_lock = threading.Lock()
+        self.http = create_http_session()
+        
         # Agent skill mapping for intelligent assignment
         self.agent_skills = {
             'pm-agent': ['epic', 'planning', 'coordination', 'management', 'oversight'],
@@ -36,18 +307,22 @@ class GitHubWebhookHandler:
             'integration-agent': ['webhook', 'api', 'integration', 'third-party', 'automation'],
             'analytics-agent': ['metrics', 'monitoring', 'analytics', 'reporting', 'data']
         }
+        self.routing_engine = IssueRoutingEngine({'skills': self.agent_skills})
         
-        # Current agent workload (in production, this would be from database)
-        self.agent_workload = {
-            'pm-agent': 3,
-            'frontend-agent': 2,
-            'backend-agent': 4,
-            'devops-agent': 1,
-            'qa-agent': 2,
-            'security-agent': 1,
-            'integration-agent': 2,
-            'analytics-agent': 1
-        }
+        # Live agent workload, shared by all webhook workers
+        self.workload = AgentWorkloadLedger(
+            os.getenv('WEBHOOK_QUEUE_DB', 'webhook_events.db'), agents=self.agent_skills
+        )
+
+    @property
+    def agent_workload(self):
+        """Open issues per agent"""
+        return self.workload.snapshot()
+
+    @staticmethod
+    def issue_key(issue_data):
+        repository = '/'.join(issue_data['html_url'].split('/')[-4:-2])
+        return f"{repository}#{issue_data['number']}"
 
     def verify_signature(self, payload_body, signature_header):
         """Verify GitHub webhook signature"""
@@ -74,16 +349,15 @@ class GitHubWebhookHandler:
         
         content = f"{title} {body} {' '.join(labels)}"
         
-        # Score each agent based on skill match
+        # Score each agent based on skill match (single pass over the content)
+        skill_scores = self.routing_engine.analyze(content).table_scores('skills')
+        workload = self.agent_workload
         agent_scores = {}
-        for agent, skills in self.agent_skills.items():
-            score = 0
-            for skill in skills:
-                if skill in content:
-                    score += 1
+        for agent in self.agent_skills:
+            score = skill_scores.get(agent, 0)
             
             # Adjust score based on current workload (prefer less busy agents)
-            workload_penalty = self.agent_workload.get(agent, 0) * 0.1
+            workload_penalty = workload.get(agent, 0) * 0.1
             final_score = score - workload_penalty
             
             agent_scores[agent] = final_score
@@ -154,7 +428,7 @@ class GitHubWebhookHandler:
                 'data': data
             }
             
-            response = requests.post(
+            response = self.http.post(
                 f"{self.agent_api_url}/webhook/github",
                 json=payload,
                 timeout=10
@@ -177,7 +451,7 @@ class GitHubWebhookHandler:
                 'timestamp': datetime.now().isoformat()
             }
             
-            requests.post(self.pm_notification_url, json=payload, timeout=5)
+            self.http.post(self.pm_notification_url, json=payload, timeout=5)
             logger.info(f"PM notified: {event_type}")
             
         except Exception as e:
@@ -186,14 +460,19 @@ class GitHubWebhookHandler:
     def process_issue_opened(self, issue_data):
         """Process new issue creation"""
         logger.info(f"Processing new issue: #{issue_data['number']} - {issue_data['title']}")
+        issue_key = self.issue_key(issue_data)
         
-        # Get best agent assignment
-        assigned_agent, assignment_reason = self.get_best_agent_for_issue(issue_data)
+        # Get best agent assignment (keep an existing one, e.g. on reopen)
+        assigned_agent = self.workload.assigned_agent(issue_key)
+        if assigned_agent:
+            assignment_reason = 'Existing assignment'
+        else:
+            assigned_agent, assignment_reason = self.get_best_agent_for_issue(issue_data)
         priority = self.calculate_priority(issue_data)
         estimated_days = self.estimate_completion_days(issue_data, assigned_agent)
         
         # Update agent workload
-        self.agent_workload[assigned_agent] = self.agent_workload.get(assigned_agent, 0) + 1
+        self.workload.assign(issue_key, assigned_agent)
         
         assignment_data = {
             'issue_number': issue_data['number'],
@@ -218,16 +497,17 @@ class GitHubWebhookHandler:
         """Process issue completion"""
         logger.info(f"Processing issue closure: #{issue_data['number']}")
         
-        # Extract agent from labels (in production, use custom fields)
-        assigned_agent = None
+        # Fall back to the agent label for issues assigned before the ledger existed
+        label_agent = None
         for label in issue_data.get('labels', []):
             if label['name'].startswith('assigned:'):
-                assigned_agent = label['name'].split(':')[1]
+                label_agent = label['name'].split(':')[1]
                 break
         
+        # Update agent workload
+        assigned_agent = self.workload.complete(self.issue_key(issue_data), fallback_agent=label_agent)
+        
         if assigned_agent:
-            # Update agent workload
-            self.agent_workload[assigned_agent] = max(0, self.agent_workload.get(assigned_agent, 0) - 1)
             
             completion_data = {
                 'issue_number': issue_data['number'],
@@ -243,66 +523,117 @@ class GitHubWebhookHandler:
         
         return None
 
-# Initialize webhook handler
-webhook_handler = GitHubWebhookHandler()
-
-@app.route('/webhook/github', methods=['POST'])
-def handle_github_webhook():
-    """Main webhook endpoint for GitHub events"""
-    
-    # Verify signature
-    signature = request.headers.get('X-Hub-Signature-256')
-    if not webhook_handler.verify_signature(request.data, signature):
-        logger.warning("Invalid webhook signature")
-        return jsonify({'error': 'Invalid signature'}), 401
-    
-    # Parse event
-    event_type = request.headers.get('X-GitHub-Event')
-    payload = request.json
-    
-    logger.info(f"Received GitHub event: {event_type}")
-    
-    try:
+    def process_event(self, event_type, payload):
+        """Process a single GitHub event; returns a result summary"""
         if event_type == 'issues':
             action = payload.get('action')
             issue_data = payload.get('issue')
             
-            if action == 'opened':
-                result = webhook_handler.process_issue_opened(issue_data)
-                return jsonify({
-                    'status': 'success',
-                    'action': 'issue_assigned',
-                    'assignment': result
-                })
-                
+            if action in ('opened', 'reopened'):
+                return {'action': 'issue_assigned', 'assignment': self.process_issue_opened(issue_data)}
             elif action == 'closed':
-                result = webhook_handler.process_issue_closed(issue_data)
-                return jsonify({
-                    'status': 'success',
-                    'action': 'issue_completed',
-                    'completion': result
-                })
+                return {'action': 'issue_completed', 'completion': self.process_issue_closed(issue_data)}
         
         elif event_type == 'issue_comment':
             # Handle issue comments for agent communication
             comment_data = payload.get('comment')
             issue_data = payload.get('issue')
             
-            webhook_handler.notify_agent_system('issue_comment', {
+            self.notify_agent_system('issue_comment', {
                 'issue_number': issue_data['number'],
                 'comment_author': comment_data['user']['login'],
                 'comment_body': comment_data['body']
             })
         
-        return jsonify({'status': 'success', 'message': 'Event processed'})
-        
-    except Exception as e:
-        logger.error(f"Error processing webhook: {e}")
-        return jsonify({'error': 'Processing failed'}), 500
+        return {'action': 'event_processed'}
+
+    def start_workers(self):
+        """Start the background worker pool that drains the event queue (once per process)"""
+        with self._workers_lock:
+            if self.workers:
+                return
+            for index in range(self.worker_count):
+                worker = threading.Thread(target=self._worker_loop, name=f"webhook-worker-{index}", daemon=True)
+                worker.start()
+                self.workers.append(worker)
+        logger.info(f"Started {self.worker_count} webhook workers")
+
+    def _worker_loop(self):
+        backoff = 1
+        while True:
+            # Queue errors (e.g. a locked database) must not kill the worker
+            try:
+                event = self.event_queue.claim()
+                if event is None:
+                    self.event_queue.wait(timeout=5)
+                    continue
+                
+                delivery_id = event['delivery_id']
+                try:
+                    result = self.process_event(event['event_type'], json.loads(event['payload']))
+                    self.event_queue.complete(delivery_id, result)
+                except Exception as e:
+                    logger.error(f"Error processing delivery {delivery_id}: {e}")
+                    self.event_queue.fail(delivery_id, event['attempts'] + 1, str(e))
+                backoff = 1
+            except Exception as e:
+                logger.error(f"Webhook worker error, retrying in {backoff}s: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+
+# Initialize webhook handler
+webhook_handler = GitHubWebhookHandler()
+
+@app.before_request
+def ensure_workers():
+    """Start the workers on the first request of each WSGI process, draining deliveries left by a restart"""
+    webhook_handler.start_workers()
+
+@app.route('/webhook/github', methods=['POST'])
+def handle_github_webhook():
+    """Main webhook endpoint: verify, queue durably and acknowledge immediately"""
+    
+    # Verify signature
+    signature = request.headers.get('X-Hub-Signature-256')
+    if not webhook_handler.verify_signature(request.data, signature):
+        logger.warning("Invalid webhook signature")
+        return jsonify({'error': 'Invalid signature'}), 401
+    
+    event_type = request.headers.get('X-GitHub-Event')
+    delivery_id = request.headers.get('X-GitHub-Delivery') or str(uuid.uuid4())
+    
+    logger.info(f"Received GitHub event: {event_type} ({delivery_id})")
+    
+    try:
+        if not webhook_handler.event_queue.enqueue(delivery_id, event_type, request.get_data(as_text=True)):
+            # GitHub redelivery of an event we already have
+            return jsonify({'status': 'duplicate', 'delivery_id': delivery_id}), 200
+    except sqlite3.Error as e:
+        logger.error(f"Error queueing webhook: {e}")
+        return jsonify({'error': 'Queueing failed'}), 500
+    
+    return jsonify({'status': 'accepted', 'delivery_id': delivery_id}), 202
+
+@app.route('/api/webhook/deliveries/<delivery_id>', methods=['GET'])
+def get_delivery_status(delivery_id):
+    """Get processing status and result of a queued delivery"""
+    status = webhook_handler.event_queue.get_status(delivery_id)
+    if status is None:
+        return jsonify({'error': 'Unknown delivery'}), 404
+    return jsonify(status)
+
+@app.route('/api/webhook/queue', methods=['GET'])
+def get_webhook_queue():
+    """Get webhook queue counts by status"""
+    return jsonify({
+        'queue': webhook_handler.event_queue.counts(),
+        'workers': len(webhook_handler.workers),
+        'timestamp': datetime.now().isoformat()
+    })
 
 @app.route('/api/agents/workload', methods=['GET'])
 def get_agent_workload():
-    """Get current agent workload status"""
+    """Get current agent workload status (in-memory snapshot of the shared ledger)"""
     return jsonify({
         'workload': webhook_handler.agent_workload,
         'timestamp': datetime.now().isoformat()
@@ -330,10 +661,12 @@ if __name__ == '__main__':
     print("🔗 GitHub Webhook Handler for PM and Agent System")
     print("=" * 50)
     print(f"🎯 Webhook endpoint: /webhook/github")
+    print(f"📥 Webhook queue API: /api/webhook/queue")
     print(f"📊 Agent workload API: /api/agents/workload")
     print(f"🛠️ Agent skills API: /api/agents/skills")
     print(f"❤️ Health check: /health")
     print(f"🤖 Managing {len(webhook_handler.agent_skills)} specialized agents")
     print("=" * 50)
     
+    webhook_handler.start_workers()
     app.run(host='0.0.0.0', port=5004, debug=False)
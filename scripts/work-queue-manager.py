@@ -117,8 +117,9 @@ class AgentWorkload:
         return None
 
 class WorkQueueManager:
-    def __init__(self):
-        self.work_queue = []  # Priority queue
+    def __init__(self, idle_wakeup_seconds: float = 60.0):
+        self.work_queue = []  # Priority queue of newly added items
+        self.pending_by_skill = {}  # frozenset(skills_required) -> priority queue of unplaceable items
         self.work_items = {}  # Dict for fast lookup
         self.agents = {}  # Agent workload management
         self.assignment_history = []
@@ -131,27 +132,46 @@ class WorkQueueManager:
         }
         self.running = False
         self.assignment_thread = None
+        
+        # Scheduler state: the assignment thread sleeps on the condition and is
+        # woken by enqueue, completion and agent registration events
+        self._lock = threading.RLock()
+        self._wakeup = threading.Condition(self._lock)
+        self._new_work = False
+        self._agents_with_capacity = set()  # agents whose capacity grew since the last pass
+        self.idle_wakeup_seconds = idle_wakeup_seconds
+    
+    def _notify_scheduler(self):
+        """Wake the assignment thread (caller must hold the lock)"""
+        self._wakeup.notify()
     
     def register_agent(self, agent_id: str, skills: List[str], max_capacity: int = 10):
         """Register an agent with their skills and capacity"""
         agent = AgentWorkload(agent_id, max_capacity)
         agent.skills = skills
-        self.agents[agent_id] = agent
+        with self._lock:
+            self.agents[agent_id] = agent
+            self._agents_with_capacity.add(agent_id)
+            self._notify_scheduler()
         print(f"Registered agent: {agent_id} with skills: {skills}")
     
     def add_work_item(self, work_item: WorkItem) -> bool:
         """Add a new work item to the queue"""
         try:
-            # Add to priority queue
-            heapq.heappush(self.work_queue, work_item)
-            
-            # Add to lookup dict
-            self.work_items[work_item.id] = work_item
-            
-            # Update metrics
-            self.metrics["total_items"] += 1
-            self.metrics["items_by_priority"][work_item.priority.name] += 1
-            self.metrics["items_by_type"][work_item.work_type.name] += 1
+            with self._lock:
+                # Add to priority queue
+                heapq.heappush(self.work_queue, work_item)
+                
+                # Add to lookup dict
+                self.work_items[work_item.id] = work_item
+                
+                # Update metrics
+                self.metrics["total_items"] += 1
+                self.metrics["items_by_priority"][work_item.priority.name] += 1
+                self.metrics["items_by_type"][work_item.work_type.name] += 1
+                
+                self._new_work = True
+                self._notify_scheduler()
             
             print(f"Added work item: {work_item.id} - {work_item.title} ({work_item.priority.name})")
             return True
@@ -180,34 +200,79 @@ class WorkQueueManager:
         
         return None
     
+    def _assign(self, work_item: WorkItem, agent_id: str):
+        """Record an assignment of a work item to an agent"""
+        self.agents[agent_id].assign_work(work_item)
+        self.assignment_history.append({
+            "work_item_id": work_item.id,
+            "agent_id": agent_id,
+            "assigned_at": datetime.now(),
+            "priority": work_item.priority.name
+        })
+        print(f"Assigned {work_item.id} to {agent_id}")
+    
+    def _park(self, work_item: WorkItem):
+        """Park an unplaceable work item in its skill bucket so it doesn't block the queue"""
+        key = frozenset(work_item.skills_required)
+        heapq.heappush(self.pending_by_skill.setdefault(key, []), work_item)
+    
+    def run_scheduling_pass(self) -> int:
+        """Assign as many queued items as current capacity allows, returns the number assigned
+        
+        New items and the parked buckets that agents with freed capacity can serve
+        are merged by priority (oldest first within a priority), so a parked item
+        never takes capacity ahead of a more urgent new one. Items that don't fit
+        anywhere are skipped rather than ending the pass, and parked afterwards.
+        """
+        with self._lock:
+            assigned = 0
+            self._new_work = False
+            
+            agent_ids, self._agents_with_capacity = self._agents_with_capacity, set()
+            agent_skills = [set(self.agents[a].skills) for a in agent_ids if a in self.agents]
+            queues = [self.work_queue] + [
+                bucket for key, bucket in self.pending_by_skill.items()
+                if any(key <= skills for skills in agent_skills)
+            ]
+            
+            unplaced = []
+            while True:
+                heads = [queue for queue in queues if queue]
+                if not heads:
+                    break
+                queue = min(heads, key=lambda q: (q[0].priority.value, q[0].created_at))
+                work_item = heapq.heappop(queue)
+                if work_item.status != WorkItemStatus.QUEUED:
+                    continue
+                
+                best_agent = self.find_best_agent(work_item)
+                if best_agent:
+                    self._assign(work_item, best_agent)
+                    assigned += 1
+                else:
+                    unplaced.append(work_item)
+            
+            for key in [key for key, bucket in self.pending_by_skill.items() if not bucket]:
+                del self.pending_by_skill[key]
+            for work_item in unplaced:
+                self._park(work_item)
+            
+            return assigned
+    
     def assign_work_automatically(self):
         """Automatically assign work items from queue to available agents"""
         while self.running:
             try:
-                if self.work_queue:
-                    # Get highest priority work item
-                    work_item = heapq.heappop(self.work_queue)
+                with self._wakeup:
+                    # Sleep until an enqueue, completion or registration event arrives
+                    self._wakeup.wait_for(
+                        lambda: not self.running or self._new_work or self._agents_with_capacity,
+                        timeout=self.idle_wakeup_seconds
+                    )
+                    if not self.running:
+                        break
                     
-                    if work_item.status == WorkItemStatus.QUEUED:
-                        # Find best agent
-                        best_agent = self.find_best_agent(work_item)
-                        
-                        if best_agent:
-                            # Assign work
-                            self.agents[best_agent].assign_work(work_item)
-                            self.assignment_history.append({
-                                "work_item_id": work_item.id,
-                                "agent_id": best_agent,
-                                "assigned_at": datetime.now(),
-                                "priority": work_item.priority.name
-                            })
-                            print(f"Assigned {work_item.id} to {best_agent}")
-                        else:
-                            # No available agent, put back in queue
-                            heapq.heappush(self.work_queue, work_item)
-                            print(f"No available agent for {work_item.id}, keeping in queue")
-                
-                time.sleep(5)  # Check every 5 seconds
+                    self.run_scheduling_pass()
                 
             except Exception as e:
                 print(f"Error in work assignment: {e}")
@@ -223,7 +288,9 @@ class WorkQueueManager:
     
     def stop_auto_assignment(self):
         """Stop automatic work assignment"""
-        self.running = False
+        with self._lock:
+            self.running = False
+            self._notify_scheduler()
         if self.assignment_thread:
             self.assignment_thread.join()
         print("Stopped automatic work assignment")
@@ -244,7 +311,11 @@ class WorkQueueManager:
     def complete_work_item(self, work_item_id: str, agent_id: str):
         """Mark a work item as completed"""
         if work_item_id in self.work_items and agent_id in self.agents:
-            completed_item = self.agents[agent_id].complete_work(work_item_id)
+            with self._lock:
+                completed_item = self.agents[agent_id].complete_work(work_item_id)
+                if completed_item:
+                    self._agents_with_capacity.add(agent_id)
+                    self._notify_scheduler()
             if completed_item:
                 self.metrics["completed_items"] += 1
                 
@@ -263,8 +334,19 @@ class WorkQueueManager:
     
     def get_queue_status(self) -> Dict:
         """Get current queue status"""
+        with self._lock:
+            return self._queue_status()
+    
+    def _queue_status(self) -> Dict:
+        # Buckets and agents are mutated by the scheduler thread; callers hold the lock
+        pending_items = sum(len(bucket) for bucket in self.pending_by_skill.values())
         return {
-            "queued_items": len(self.work_queue),
+            "queued_items": len(self.work_queue) + pending_items,
+            "pending_items": pending_items,
+            "pending_by_skill": {
+                ",".join(sorted(key)) or "any": len(bucket)
+                for key, bucket in self.pending_by_skill.items()
+            },
             "total_items": len(self.work_items),
             "agents": {
                 agent_id: {
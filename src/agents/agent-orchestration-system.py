@@ -8,8 +8,10 @@ import json
 import logging
 import asyncio
 import time
+import itertools
+from collections import Counter, OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Set, Tuple, Callable, FrozenSet
 from dataclasses import dataclass, asdict
 from enum import Enum
 import sys
@@ -85,12 +87,346 @@ class WorkItem:
             'priority': self.priority.value
         }
 
+class WorkItemStore:
+    """Indexed work item storage for the orchestrator
+    
+    Pending items live in one FIFO deque per priority, every live item is indexed
+    by id, assignments are indexed per agent and status counts are maintained
+    incrementally. Completed and permanently failed items are moved to a bounded
+    archive so the live set only holds work that still matters.
+    """
+    
+    PRIORITY_ORDER = [Priority.CRITICAL, Priority.HIGH, Priority.MEDIUM, Priority.LOW, Priority.BACKLOG]
+    
+    def __init__(self, archive_size: int = 1000):
+        self._pending: Dict[Priority, deque] = {priority: deque() for priority in self.PRIORITY_ORDER}
+        self._items: Dict[str, WorkItem] = {}
+        self._by_agent: Dict[str, Set[str]] = {}
+        self._status_counts: Counter = Counter()
+        self._archive: "OrderedDict[str, WorkItem]" = OrderedDict()
+        self.archive_size = archive_size
+        self.archived_total = 0
+    
+    def __len__(self) -> int:
+        return len(self._items)
+    
+    def __iter__(self) -> Iterator[WorkItem]:
+        return iter(list(self._items.values()))
+    
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._items
+    
+    def add(self, work_item: WorkItem):
+        """Add a new pending work item"""
+        self._items[work_item.item_id] = work_item
+        self._status_counts[work_item.status] += 1
+        if work_item.status == "pending":
+            self._pending[work_item.priority].append(work_item)
+    
+    def get(self, item_id: str) -> Optional[WorkItem]:
+        """Look up a live or archived work item by id"""
+        return self._items.get(item_id) or self._archive.get(item_id)
+    
+    def set_status(self, work_item: WorkItem, status: str):
+        """Change an item's status, keeping the counters in sync"""
+        self._status_counts[work_item.status] -= 1
+        self._status_counts[status] += 1
+        work_item.status = status
+        work_item.updated_at = datetime.now()
+    
+    def assign(self, work_item: WorkItem, agent_id: str):
+        """Assign a pending item to an agent (the item must already be off the pending deque)"""
+        work_item.assigned_agent = agent_id
+        self._by_agent.setdefault(agent_id, set()).add(work_item.item_id)
+        self.set_status(work_item, "assigned")
+    
+    def release(self, work_item: WorkItem):
+        """Drop an item from its agent's assignment set"""
+        if work_item.assigned_agent:
+            assigned = self._by_agent.get(work_item.assigned_agent)
+            if assigned:
+                assigned.discard(work_item.item_id)
+    
+    def requeue(self, work_item: WorkItem):
+        """Return an item to the front of its priority deque for retry"""
+        self.release(work_item)
+        work_item.assigned_agent = None
+        self.set_status(work_item, "pending")
+        self._pending[work_item.priority].appendleft(work_item)
+    
+    def archive(self, work_item: WorkItem):
+        """Move a finished item out of the live set"""
+        self.release(work_item)
+        self._items.pop(work_item.item_id, None)
+        self._archive[work_item.item_id] = work_item
+        self.archived_total += 1
+        while len(self._archive) > self.archive_size:
+            self._archive.popitem(last=False)
+    
+    def has_pending(self) -> bool:
+        return self._status_counts["pending"] > 0
+    
+    def pop_pending(self) -> Iterator[WorkItem]:
+        """Yield pending items in priority order, removing each from its deque
+        
+        Callers must either assign a yielded item or hand it back with
+        ``restore_pending`` once iteration stops.
+        """
+        for priority in self.PRIORITY_ORDER:
+            queue = self._pending[priority]
+            while queue:
+                yield queue.popleft()
+    
+    def restore_pending(self, items: List[WorkItem]):
+        """Put unassigned items back at the front of their deques, preserving order"""
+        for work_item in reversed(items):
+            self._pending[work_item.priority].appendleft(work_item)
+    
+    def items_for_agent(self, agent_id: str, status: Optional[str] = None) -> List[WorkItem]:
+        """Get the live items assigned to an agent, optionally filtered by status"""
+        items = (self._items[item_id] for item_id in self._by_agent.get(agent_id, ()) if item_id in self._items)
+        return [item for item in items if status is None or item.status == status]
+    
+    def count(self, status: str) -> int:
+        return self._status_counts[status]
+    
+    def load(self, agent_id: str) -> int:
+        """Number of items currently assigned to an agent"""
+        return len(self._by_agent.get(agent_id, ()))
+
+
+def work_item_keywords(work_item: WorkItem) -> FrozenSet[str]:
+    """Keyword set used for capability matching, computed once per item"""
+    return frozenset(work_item.description.lower().split())
+
+
+def skill_match_score(work_item: WorkItem, keywords: FrozenSet[str], agent: AgentInfo) -> int:
+    """Score agent type and capability overlap with a work item"""
+    score = 0
+    
+    # Check if agent type matches work item type
+    if work_item.item_type in agent.agent_type:
+        score += 10
+    
+    # Check capability overlap
+    for capability in agent.capabilities:
+        if capability.lower() in keywords:
+            score += 5
+    
+    return score
+
+
+def success_rate(agent: AgentInfo) -> float:
+    """Smoothed success rate so agents without history start neutral"""
+    return (agent.tasks_completed + 1) / (agent.tasks_completed + agent.tasks_failed + 2)
+
+
+# Cost terms take (work_item, keywords, agent, current_load) and return a cost to minimize
+CostTerm = Callable[[WorkItem, FrozenSet[str], AgentInfo, int], float]
+
+
+def skill_match_cost(work_item: WorkItem, keywords: FrozenSet[str], agent: AgentInfo, load: int) -> float:
+    return -skill_match_score(work_item, keywords, agent)
+
+
+def current_load_cost(work_item: WorkItem, keywords: FrozenSet[str], agent: AgentInfo, load: int) -> float:
+    return load
+
+
+def success_rate_cost(work_item: WorkItem, keywords: FrozenSet[str], agent: AgentInfo, load: int) -> float:
+    return 1.0 - success_rate(agent)
+
+
+class AssignmentCostModel:
+    """Weighted sum of pluggable cost terms for an (item, agent) pair"""
+    
+    def __init__(self, terms: Optional[List[Tuple[str, float, CostTerm]]] = None):
+        if terms is None:
+            terms = [
+                ("skill_match", 1.0, skill_match_cost),
+                ("current_load", 3.0, current_load_cost),
+                ("success_rate", 10.0, success_rate_cost)
+            ]
+        self.terms = list(terms)
+    
+    def add_term(self, name: str, weight: float, term: CostTerm):
+        """Register an additional cost term"""
+        self.terms.append((name, weight, term))
+    
+    def is_eligible(self, work_item: WorkItem, keywords: FrozenSet[str], agent: AgentInfo) -> bool:
+        """An agent may only take work it has some type or capability match for"""
+        return skill_match_score(work_item, keywords, agent) > 0
+    
+    def cost(self, work_item: WorkItem, keywords: FrozenSet[str], agent: AgentInfo, load: int) -> float:
+        return sum(weight * term(work_item, keywords, agent, load) for _, weight, term in self.terms)
+
+
+def solve_min_cost_assignment(cost: List[List[float]]) -> List[Tuple[int, int]]:
+    """Solve a rectangular min-cost assignment with the Hungarian algorithm
+    
+    Returns (row, column) pairs covering min(rows, columns) entries. Runs in
+    O(n^2 * m) for n = min(rows, columns) and m = max(rows, columns).
+    """
+    rows = len(cost)
+    cols = len(cost[0]) if rows else 0
+    if not rows or not cols:
+        return []
+    
+    transposed = rows > cols
+    if transposed:
+        cost = [list(column) for column in zip(*cost)]
+        rows, cols = cols, rows
+    
+    inf = float('inf')
+    u = [0.0] * (rows + 1)
+    v = [0.0] * (cols + 1)
+    match = [0] * (cols + 1)  # match[j] = row matched to column j (1-based, 0 = free)
+    way = [0] * (cols + 1)
+    
+    for i in range(1, rows + 1):
+        match[0] = i
+        j0 = 0
+        min_slack = [inf] * (cols + 1)
+        used = [False] * (cols + 1)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row = cost[i0 - 1]
+            delta = inf
+            j1 = 0
+            for j in range(1, cols + 1):
+                if not used[j]:
+                    slack = row[j - 1] - u[i0] - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = j0
+                    if min_slack[j] < delta:
+                        delta = min_slack[j]
+                        j1 = j
+            for j in range(cols + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        # Augment along the alternating path
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    
+    pairs = [(match[j] - 1, j - 1) for j in range(1, cols + 1) if match[j]]
+    if transposed:
+        pairs = [(col, row) for row, col in pairs]
+    return sorted(pairs)
+
+
+class BatchAssignmentSolver:
+    """Assigns a window of pending items to available agents in one optimal matching
+    
+    Each scheduling round builds a cost matrix over the highest-priority pending
+    items and the available agents, then solves it as a min-cost matching.
+    Priority is folded into the cost so higher-priority items win contested agents.
+    """
+    
+    FORBIDDEN = 1e9
+    PRIORITY_RANK = {priority: rank for rank, priority in enumerate(WorkItemStore.PRIORITY_ORDER)}
+    
+    def __init__(self, cost_model: Optional[AssignmentCostModel] = None,
+                 window_factor: int = 4, priority_weight: float = 100.0):
+        self.cost_model = cost_model or AssignmentCostModel()
+        self.window_factor = window_factor
+        self.priority_weight = priority_weight
+    
+    def build_cost_matrix(self, items: List[WorkItem], agents: List[AgentInfo],
+                          keywords_for: Callable[[WorkItem], FrozenSet[str]],
+                          load_for: Callable[[str], int]) -> List[List[float]]:
+        """Rows are items, columns are agents"""
+        loads = [load_for(agent.agent_id) for agent in agents]
+        matrix = []
+        for work_item in items:
+            keywords = keywords_for(work_item)
+            priority_cost = self.PRIORITY_RANK[work_item.priority] * self.priority_weight
+            matrix.append([
+                priority_cost + self.cost_model.cost(work_item, keywords, agent, load)
+                if self.cost_model.is_eligible(work_item, keywords, agent) else self.FORBIDDEN
+                for agent, load in zip(agents, loads)
+            ])
+        return matrix
+    
+    def solve(self, items: List[WorkItem], agents: List[AgentInfo],
+              keywords_for: Callable[[WorkItem], FrozenSet[str]],
+              load_for: Callable[[str], int]) -> List[Tuple[WorkItem, AgentInfo]]:
+        """Return the (item, agent) pairs of the optimal matching, skipping ineligible pairs"""
+        matrix = self.build_cost_matrix(items, agents, keywords_for, load_for)
+        return [
+            (items[row], agents[col])
+            for row, col in solve_min_cost_assignment(matrix)
+            if matrix[row][col] < self.FORBIDDEN
+        ]
+
+
+class DeliveryQueue(asyncio.Queue):
+    """Queue of pushed work item payloads that knows which items are still waiting in it"""
+    
+    def _init(self, maxsize):
+        self._queue = deque()
+        self._waiting: Counter = Counter()
+    
+    def _put(self, item):
+        self._queue.append(item)
+        self._waiting[item["item_id"]] += 1
+    
+    def _get(self):
+        item = self._queue.popleft()
+        self._waiting[item["item_id"]] -= 1
+        if not self._waiting[item["item_id"]]:
+            del self._waiting[item["item_id"]]
+        return item
+    
+    def contains(self, item_id: str) -> bool:
+        return item_id in self._waiting
+    
+    def discard(self, item_id: str) -> int:
+        """Drop every waiting copy of an item (call from the queue's event loop)"""
+        removed = self._waiting.pop(item_id, 0)
+        if removed:
+            self._queue = deque(item for item in self._queue if item["item_id"] != item_id)
+            for _ in range(removed):
+                self.task_done()
+        return removed
+
+
+class WorkSubscription:
+    """Push channel delivering an agent's assignments to its asyncio queue"""
+    
+    def __init__(self, agent_id: str, loop: asyncio.AbstractEventLoop):
+        self.agent_id = agent_id
+        self.loop = loop
+        self.queue: DeliveryQueue = DeliveryQueue()
+        self.unacknowledged: Dict[str, int] = {}  # item_id -> delivery attempt
+
+
 class AgentOrchestrator:
     """Master coordinator for all AI agents"""
     
-    def __init__(self):
+    def __init__(self, assignment_strategy: str = "batch", assignment_solver: Optional[BatchAssignmentSolver] = None):
         self.agents: Dict[str, AgentInfo] = {}
-        self.work_queue: List[WorkItem] = []
+        self.work_queue = WorkItemStore()
+        self._item_sequence = itertools.count()
+        self._item_keywords: Dict[str, FrozenSet[str]] = {}
+        
+        # "batch" solves each scheduling round as a min-cost matching, "greedy" assigns in queue order
+        self.assignment_strategy = assignment_strategy
+        self.assignment_solver = assignment_solver or BatchAssignmentSolver()
+        
+        # Push delivery: assignments go straight to subscribed agents and must be acknowledged
+        self.subscriptions: Dict[str, WorkSubscription] = {}
+        self.ack_timeout_seconds = 30
+        self.max_delivery_attempts = 3
         self.agent_capabilities: Dict[str, List[str]] = {
             # Development Team
             "ai-architect": ["system_architecture", "api_design", "database_design", "technology_selection"],
@@ -167,18 +503,24 @@ class AgentOrchestrator:
     def update_agent_status(self, agent_id: str, status: AgentStatus, current_task: Optional[str] = None):
         """Update agent status and current task"""
         if agent_id in self.agents:
+            previous_status = self.agents[agent_id].status
             self.agents[agent_id].status = status
             self.agents[agent_id].last_heartbeat = datetime.now()
             if current_task:
                 self.agents[agent_id].current_task = current_task
             logger.info(f"📊 Agent {agent_id} status: {status.value}")
+            
+            # An agent with free capacity again can take pending work right away
+            available = [AgentStatus.ACTIVE, AgentStatus.IDLE]
+            if status in available and previous_status not in available:
+                self._auto_assign_work()
         else:
             logger.warning(f"Unknown agent {agent_id} trying to update status")
     
     def add_work_item(self, title: str, description: str, item_type: str, 
                      priority: Priority = Priority.MEDIUM, metadata: Dict[str, Any] = None) -> str:
         """Add a new work item to the queue"""
-        item_id = f"work-{int(time.time())}-{len(self.work_queue)}"
+        item_id = f"work-{int(time.time())}-{next(self._item_sequence)}"
         
         work_item = WorkItem(
             item_id=item_id,
@@ -191,7 +533,8 @@ class AgentOrchestrator:
         )
         
         # Insert based on priority
-        self._insert_by_priority(work_item)
+        self.work_queue.add(work_item)
+        self._item_keywords[item_id] = work_item_keywords(work_item)
         
         logger.info(f"📋 Work item added: {title} ({priority.value})")
         
@@ -200,42 +543,81 @@ class AgentOrchestrator:
         
         return item_id
     
-    def _insert_by_priority(self, work_item: WorkItem):
-        """Insert work item in queue based on priority"""
-        priority_order = [Priority.CRITICAL, Priority.HIGH, Priority.MEDIUM, Priority.LOW, Priority.BACKLOG]
-        
-        for i, existing_item in enumerate(self.work_queue):
-            if priority_order.index(work_item.priority) < priority_order.index(existing_item.priority):
-                self.work_queue.insert(i, work_item)
-                return
-        
-        # If not inserted, append to end
-        self.work_queue.append(work_item)
-    
     def _auto_assign_work(self):
         """Automatically assign work to available agents"""
         available_agents = {
             agent_id: agent for agent_id, agent in self.agents.items()
             if agent.status in [AgentStatus.ACTIVE, AgentStatus.IDLE]
         }
+        if not available_agents or not self.work_queue.has_pending():
+            return
         
-        for work_item in self.work_queue:
-            if work_item.assigned_agent is None:
-                # Find best agent for this work
-                best_agent = self._find_best_agent(work_item, available_agents)
-                if best_agent:
-                    work_item.assigned_agent = best_agent.agent_id
-                    work_item.status = "assigned"
-                    work_item.updated_at = datetime.now()
-                    
-                    # Update agent status
-                    best_agent.status = AgentStatus.BUSY
-                    best_agent.current_task = work_item.title
-                    
-                    # Remove from available agents
-                    available_agents.pop(best_agent.agent_id)
-                    
-                    logger.info(f"🎯 Assigned '{work_item.title}' to {best_agent.agent_id}")
+        if self.assignment_strategy == "greedy":
+            self._auto_assign_greedy(available_agents)
+        else:
+            self._auto_assign_batch(available_agents)
+    
+    def _auto_assign_batch(self, available_agents: Dict[str, AgentInfo]):
+        """Assign the top of the queue to available agents as one optimal matching"""
+        window_size = len(available_agents) * self.assignment_solver.window_factor
+        window = list(itertools.islice(self.work_queue.pop_pending(), window_size))
+        
+        assignments = self.assignment_solver.solve(
+            window, list(available_agents.values()), self._keywords_for, self.work_queue.load
+        )
+        
+        assigned_ids = set()
+        for work_item, agent in assignments:
+            self._assign_to_agent(work_item, agent)
+            assigned_ids.add(work_item.item_id)
+            available_agents.pop(agent.agent_id, None)
+        
+        self.work_queue.restore_pending([item for item in window if item.item_id not in assigned_ids])
+        
+        # Agents left free had nothing eligible in the window; the rest of the queue may
+        # still hold work only they can take (e.g. a low-priority item for a new agent type)
+        if available_agents and self.work_queue.has_pending():
+            self._auto_assign_greedy(available_agents)
+    
+    def _auto_assign_greedy(self, available_agents: Dict[str, AgentInfo]):
+        """Assign pending items in queue order, each to its best-scoring agent"""
+        unassigned = []
+        for work_item in self.work_queue.pop_pending():
+            # Find best agent for this work
+            best_agent = self._find_best_agent(work_item, available_agents)
+            if not best_agent:
+                unassigned.append(work_item)
+                if not available_agents:
+                    break
+                continue
+            
+            self._assign_to_agent(work_item, best_agent)
+            
+            # Remove from available agents
+            available_agents.pop(best_agent.agent_id)
+            
+            if not available_agents:
+                break
+        
+        self.work_queue.restore_pending(unassigned)
+    
+    def _assign_to_agent(self, work_item: WorkItem, agent: AgentInfo):
+        """Record an assignment and mark the agent busy"""
+        self.work_queue.assign(work_item, agent.agent_id)
+        
+        # Update agent status
+        agent.status = AgentStatus.BUSY
+        agent.current_task = work_item.title
+        
+        logger.info(f"🎯 Assigned '{work_item.title}' to {agent.agent_id}")
+        
+        self._deliver(work_item)
+    
+    def _keywords_for(self, work_item: WorkItem) -> FrozenSet[str]:
+        keywords = self._item_keywords.get(work_item.item_id)
+        if keywords is None:
+            keywords = self._item_keywords[work_item.item_id] = work_item_keywords(work_item)
+        return keywords
     
     def _find_best_agent(self, work_item: WorkItem, available_agents: Dict[str, AgentInfo]) -> Optional[AgentInfo]:
         """Find the best agent for a work item based on capabilities"""
@@ -252,20 +634,10 @@ class AgentOrchestrator:
     
     def _calculate_agent_score(self, work_item: WorkItem, agent: AgentInfo) -> int:
         """Calculate how well an agent matches a work item"""
-        score = 0
-        
-        # Check if agent type matches work item type
-        if work_item.item_type in agent.agent_type:
-            score += 10
-        
-        # Check capability overlap
-        work_keywords = work_item.description.lower().split()
-        for capability in agent.capabilities:
-            if capability.lower() in work_keywords:
-                score += 5
+        score = skill_match_score(work_item, self._keywords_for(work_item), agent)
         
         # Prefer agents with fewer current tasks
-        score -= agent.tasks_completed  # Load balancing
+        score -= self.work_queue.load(agent.agent_id)  # Load balancing
         
         # Boost score for agents with good track record
         if agent.tasks_completed > 0:
@@ -276,52 +648,54 @@ class AgentOrchestrator:
     
     def complete_work_item(self, item_id: str, agent_id: str, result: Dict[str, Any] = None):
         """Mark a work item as completed"""
-        for work_item in self.work_queue:
-            if work_item.item_id == item_id and work_item.assigned_agent == agent_id:
-                work_item.status = "completed"
-                work_item.updated_at = datetime.now()
-                if result:
-                    work_item.metadata.update({"result": result})
-                
-                # Update agent stats
-                if agent_id in self.agents:
-                    self.agents[agent_id].tasks_completed += 1
-                    self.agents[agent_id].status = AgentStatus.IDLE
-                    self.agents[agent_id].current_task = None
-                
-                logger.info(f"✅ Work item completed: {work_item.title} by {agent_id}")
-                
-                # Try to assign more work
-                self._auto_assign_work()
-                return True
+        work_item = self.work_queue.get(item_id)
+        if work_item and item_id in self.work_queue and work_item.assigned_agent == agent_id:
+            self.work_queue.set_status(work_item, "completed")
+            if result:
+                work_item.metadata.update({"result": result})
+            self.work_queue.archive(work_item)
+            self._item_keywords.pop(item_id, None)
+            
+            # Update agent stats
+            if agent_id in self.agents:
+                self.agents[agent_id].tasks_completed += 1
+                self.agents[agent_id].status = AgentStatus.IDLE
+                self.agents[agent_id].current_task = None
+            
+            logger.info(f"✅ Work item completed: {work_item.title} by {agent_id}")
+            
+            # Try to assign more work
+            self._auto_assign_work()
+            return True
         
         logger.warning(f"Work item {item_id} not found or not assigned to {agent_id}")
         return False
     
-    def fail_work_item(self, item_id: str, agent_id: str, error: str):
-        """Mark a work item as failed"""
-        for work_item in self.work_queue:
-            if work_item.item_id == item_id and work_item.assigned_agent == agent_id:
-                work_item.status = "failed"
-                work_item.updated_at = datetime.now()
-                work_item.metadata.update({"error": error})
-                
-                # Update agent stats
-                if agent_id in self.agents:
-                    self.agents[agent_id].tasks_failed += 1
-                    self.agents[agent_id].status = AgentStatus.IDLE
-                    self.agents[agent_id].current_task = None
-                
-                logger.error(f"❌ Work item failed: {work_item.title} by {agent_id} - {error}")
-                
-                # Re-queue for retry if appropriate
-                if work_item.priority in [Priority.CRITICAL, Priority.HIGH]:
-                    work_item.assigned_agent = None
-                    work_item.status = "pending"
-                    logger.info(f"🔄 Re-queuing failed high-priority item: {work_item.title}")
-                
-                self._auto_assign_work()
-                return True
+    def fail_work_item(self, item_id: str, agent_id: str, error: str, requeue: bool = True):
+        """Mark a work item as failed (high-priority items are retried unless requeue is False)"""
+        work_item = self.work_queue.get(item_id)
+        if work_item and item_id in self.work_queue and work_item.assigned_agent == agent_id:
+            self.work_queue.set_status(work_item, "failed")
+            work_item.metadata.update({"error": error})
+            
+            # Update agent stats
+            if agent_id in self.agents:
+                self.agents[agent_id].tasks_failed += 1
+                self.agents[agent_id].status = AgentStatus.IDLE
+                self.agents[agent_id].current_task = None
+            
+            logger.error(f"❌ Work item failed: {work_item.title} by {agent_id} - {error}")
+            
+            # Re-queue for retry if appropriate
+            if requeue and work_item.priority in [Priority.CRITICAL, Priority.HIGH]:
+                self.work_queue.requeue(work_item)
+                logger.info(f"🔄 Re-queuing failed high-priority item: {work_item.title}")
+            else:
+                self.work_queue.archive(work_item)
+                self._item_keywords.pop(item_id, None)
+            
+            self._auto_assign_work()
+            return True
         
         logger.warning(f"Work item {item_id} not found or not assigned to {agent_id}")
         return False
@@ -336,16 +710,106 @@ class AgentOrchestrator:
             "agents": {agent_id: agent.to_dict() for agent_id, agent in self.agents.items()}
         }
     
-    def get_work_queue_status(self) -> Dict[str, Any]:
-        """Get status of work queue"""
-        return {
-            "total_items": len(self.work_queue),
-            "pending_items": len([w for w in self.work_queue if w.status == "pending"]),
-            "assigned_items": len([w for w in self.work_queue if w.status == "assigned"]),
-            "completed_items": len([w for w in self.work_queue if w.status == "completed"]),
-            "failed_items": len([w for w in self.work_queue if w.status == "failed"]),
-            "work_items": [item.to_dict() for item in self.work_queue]
+    def get_work_queue_status(self, include_items: bool = False) -> Dict[str, Any]:
+        """Get status of work queue; include_items adds every live item (finished ones are archived)"""
+        status = {
+            "total_items": len(self.work_queue) + self.work_queue.archived_total,
+            "pending_items": self.work_queue.count("pending"),
+            "assigned_items": self.work_queue.count("assigned"),
+            "completed_items": self.work_queue.count("completed"),
+            "failed_items": self.work_queue.count("failed")
         }
+        if include_items:
+            status["work_items"] = [item.to_dict() for item in self.work_queue]
+        return status
+    
+    def get_agent_work_items(self, agent_id: str, status: Optional[str] = "assigned") -> List[Dict[str, Any]]:
+        """Get the work items assigned to a single agent"""
+        return [item.to_dict() for item in self.work_queue.items_for_agent(agent_id, status)]
+    
+    def subscribe(self, agent_id: str) -> asyncio.Queue:
+        """Subscribe an agent to push delivery of its assignments
+        
+        Must be called from the agent's running event loop. Work already assigned
+        to the agent is delivered immediately. Every delivered item has to be
+        acknowledged within ``ack_timeout_seconds`` or it is redelivered.
+        """
+        subscription = WorkSubscription(agent_id, asyncio.get_running_loop())
+        self.subscriptions[agent_id] = subscription
+        logger.info(f"📡 Agent {agent_id} subscribed to work delivery")
+        
+        for work_item in self.work_queue.items_for_agent(agent_id, "assigned"):
+            self._deliver(work_item)
+        
+        return subscription.queue
+    
+    def unsubscribe(self, agent_id: str):
+        """Stop push delivery to an agent"""
+        self.subscriptions.pop(agent_id, None)
+    
+    def acknowledge_work_item(self, item_id: str, agent_id: str) -> bool:
+        """Acknowledge receipt of a pushed work item
+        
+        False means the copy is stale (already acknowledged, or the item was
+        taken back) and the agent must not process it.
+        """
+        subscription = self.subscriptions.get(agent_id)
+        if subscription and subscription.unacknowledged.pop(item_id, None) is not None:
+            return True
+        return False
+    
+    def _deliver(self, work_item: WorkItem, attempt: int = 1):
+        """Push an assignment to its agent's subscription queue, if any"""
+        subscription = self.subscriptions.get(work_item.assigned_agent)
+        if not subscription:
+            return
+        
+        subscription.unacknowledged[work_item.item_id] = attempt
+        # Thread-safe hand-off: the queue and timer belong to the agent's event loop
+        subscription.loop.call_soon_threadsafe(
+            self._enqueue_delivery, subscription, work_item.to_dict(), attempt
+        )
+    
+    def _enqueue_delivery(self, subscription: WorkSubscription, payload: Dict[str, Any], attempt: int):
+        subscription.queue.put_nowait(payload)
+        subscription.loop.call_later(
+            self.ack_timeout_seconds, self._check_delivery, subscription, payload["item_id"], attempt
+        )
+    
+    def _check_delivery(self, subscription: WorkSubscription, item_id: str, attempt: int):
+        """Redeliver an unacknowledged item, or requeue it once the agent stops responding"""
+        if subscription.unacknowledged.get(item_id) != attempt:
+            return
+        
+        work_item = self.work_queue.get(item_id)
+        if (self.subscriptions.get(subscription.agent_id) is not subscription or not work_item
+                or work_item.status != "assigned" or work_item.assigned_agent != subscription.agent_id):
+            subscription.unacknowledged.pop(item_id, None)
+            subscription.queue.discard(item_id)
+            return
+        
+        if attempt < self.max_delivery_attempts:
+            if subscription.queue.contains(item_id):
+                # Not lost, just not picked up yet: count the attempt without a second copy
+                subscription.unacknowledged[item_id] = attempt + 1
+                subscription.loop.call_later(
+                    self.ack_timeout_seconds, self._check_delivery, subscription, item_id, attempt + 1
+                )
+                return
+            logger.warning(f"⏱️ No ack for '{work_item.title}' from {subscription.agent_id}, redelivering")
+            self._deliver(work_item, attempt + 1)
+            return
+        
+        subscription.unacknowledged.pop(item_id, None)
+        # Copies still waiting locally must not run once the item belongs to another agent
+        subscription.queue.discard(item_id)
+        logger.warning(f"🔄 Re-queuing unacknowledged work from {subscription.agent_id}: {work_item.title}")
+        agent = self.agents.get(subscription.agent_id)
+        if agent:
+            agent.status = AgentStatus.ERROR
+            agent.current_task = None
+        self.work_queue.requeue(work_item)
+        self._auto_assign_work()
     
     def health_check(self):
         """Perform health check on all agents"""
@@ -359,11 +823,9 @@ class AgentOrchestrator:
                     agent.status = AgentStatus.OFFLINE
                     
                     # Reassign any work items
-                    for work_item in self.work_queue:
-                        if work_item.assigned_agent == agent_id and work_item.status == "assigned":
-                            work_item.assigned_agent = None
-                            work_item.status = "pending"
-                            logger.info(f"🔄 Re-queuing work from offline agent: {work_item.title}")
+                    for work_item in self.work_queue.items_for_agent(agent_id, "assigned"):
+                        self.work_queue.requeue(work_item)
+                        logger.info(f"🔄 Re-queuing work from offline agent: {work_item.title}")
         
         # Try to assign any unassigned work
         self._auto_assign_work()
@@ -379,7 +841,7 @@ class AgentOrchestrator:
                 "total_tasks_completed": sum(agent.tasks_completed for agent in self.agents.values()),
                 "total_tasks_failed": sum(agent.tasks_failed for agent in self.agents.values()),
                 "average_success_rate": self._calculate_average_success_rate(),
-                "queue_depth": len([w for w in self.work_queue if w.status == "pending"]),
+                "queue_depth": self.work_queue.count("pending"),
                 "agents_online": len([a for a in self.agents.values() if a.status != AgentStatus.OFFLINE])
             }
         }
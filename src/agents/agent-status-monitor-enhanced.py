@@ -15,6 +15,14 @@ from typing import Dict, List, Any, Optional
 from pathlib import Path
 import psutil
 import os
+import sys
+
+try:
+    sys.path.append(str(Path(__file__).parent))
+    from agent_work_queue import queue_counts
+    AGENT_QUEUES_AVAILABLE = True
+except ImportError:
+    AGENT_QUEUES_AVAILABLE = False
 
 # Setup logging
 logging.basicConfig(
@@ -31,6 +39,7 @@ class AgentStatusMonitor:
     def __init__(self):
         self.status_file = "agent_status_tracker.json"
         self.work_queue_dir = Path("work_queue")
+        self.agent_queue_dir = Path("work_queues")
         self.communication_dir = Path("communication_messages")
         self.agents = {}
         self.stuck_threshold = 300  # 5 minutes without progress
@@ -140,9 +149,14 @@ class AgentStatusMonitor:
             "critical_items": 0,
             "assigned_items": 0,
             "stuck_items": 0,
-            "items": []
+            "items": [],
+            "agent_queues": {}
         }
         
+        # Per-agent durable queues: counts come from counters, no payloads are parsed
+        if AGENT_QUEUES_AVAILABLE and self.agent_queue_dir.exists():
+            queue_status["agent_queues"] = queue_counts(self.agent_queue_dir)
+        
         if self.work_queue_dir.exists():
             for queue_file in self.work_queue_dir.glob("*.json"):
                 try:
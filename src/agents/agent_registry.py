@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""
+Agent Registry - manifest-driven, lazily imported agent modules
+Maps each agent type (and its aliases) to a module path and class name, so
+callers never guess file locations or class names. Modules are imported on
+first use and memoized, and every import is profiled (self and cumulative
+time per nested module, like ``python -X importtime``) so agent cold-start
+cost can be reported and cut.
+"""
+
+import builtins
+import importlib.util
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger('AgentRegistry')
+
+AGENTS_DIR = Path(__file__).resolve().parent
+
+# agent type -> module path (relative to the registry's base directory) and class
+AGENT_MANIFEST = {
+    'developer': {'module': 'ai-developer-agent.py', 'class': 'AIDeveloperAgent', 'aliases': ['development']},
+    'architect': {'module': 'ai-architect-agent.py', 'class': 'AIArchitectAgent', 'aliases': ['architecture']},
+    'qa': {'module': 'ai-qa-agent.py', 'class': 'AIQAAgent', 'aliases': ['quality_assurance']},
+    'devops': {'module': 'ai-devops-agent.py', 'class': 'AIDevOpsAgent'},
+    'manager': {'module': 'ai-manager-agent.py', 'class': 'AIManagerAgent', 'aliases': ['management']},
+    'project_manager': {'module': 'ai-project-manager-agent.py', 'class': 'AIProjectManagerAgent'},
+    'support': {'module': 'ai-support-agent.py', 'class': 'AiSupportAgent'},
+    'security': {'module': 'ai-security-agent.py', 'class': 'AiSecurityAgent'},
+    'analytics': {'module': 'ai-analytics-agent.py', 'class': 'AiAnalyticsAgent'},
+    'finance': {'module': 'ai-finance-agent.py', 'class': 'AiFinanceAgent'},
+    'operations': {'module': 'ai-operations-agent.py', 'class': 'AiOperationsAgent'},
+    'marketing': {'module': 'ai-marketing-agent.py', 'class': 'AiMarketingAgent'},
+    'sales': {'module': 'ai-sales-agent.py', 'class': 'AiSalesAgent'},
+    'customer_success': {'module': 'ai-customer-success-agent.py', 'class': 'AiCustomerSuccessAgent',
+                         'aliases': ['customer-success']}
+}
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+# builtins.__import__ is process-wide, so only one profiled load runs at a time
+_PROFILE_LOCK = threading.RLock()
+
+
+@dataclass
+class AgentSpec:
+    """Where an agent type lives"""
+    agent_type: str
+    module_path: Path
+    class_name: Optional[str]
+    aliases: List[str] = field(default_factory=list)
+
+    @property
+    def module_name(self) -> str:
+        return f"agent_module_{self.module_path.stem.replace('-', '_')}"
+
+
+@dataclass
+class ImportProfile:
+    """Cost of loading one agent module"""
+    agent_type: str
+    total_seconds: float
+    module_seconds: float  # executing the agent file itself, excluding nested first-time imports
+    imports: List[Dict[str, Any]]  # first-time imports: module, self_us, cumulative_us, depth
+
+    def slowest(self, limit: int = 10) -> List[Dict[str, Any]]:
+        return sorted(self.imports, key=lambda entry: entry['self_us'], reverse=True)[:limit]
+
+
+class _ImportTimer:
+    """Times first-time imports made by one thread while installed"""
+
+    def __init__(self):
+        self.thread_id = threading.get_ident()
+        self.entries: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._original_import = builtins.__import__
+
+    def __enter__(self):
+        builtins.__import__ = self._import
+        return self
+
+    def __exit__(self, *exc):
+        builtins.__import__ = self._original_import
+        return False
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if (threading.get_ident() != self.thread_id or level or name in sys.modules):
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        entry = {'module': name, 'depth': len(self._stack), 'children_us': 0}
+        self._stack.append(entry)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            cumulative_us = int((time.perf_counter() - started) * 1e6)
+            self._stack.pop()
+            entry['cumulative_us'] = cumulative_us
+            entry['self_us'] = max(0, cumulative_us - entry.pop('children_us'))
+            if self._stack:
+                self._stack[-1]['children_us'] += cumulative_us
+            self.entries.append(entry)
+
+
+class AgentRegistry:
+    """Resolves agent types through a manifest and imports them lazily, once"""
+
+    def __init__(self, manifest: Dict[str, Dict[str, Any]] = None, base_dir: Path = AGENTS_DIR):
+        self.base_dir = Path(base_dir)
+        self.specs: Dict[str, AgentSpec] = {}
+        self.aliases: Dict[str, str] = {}
+        for agent_type, entry in (AGENT_MANIFEST if manifest is None else manifest).items():
+            spec = AgentSpec(
+                agent_type=agent_type,
+                module_path=(self.base_dir / entry['module']).resolve(),
+                class_name=entry.get('class'),
+                aliases=list(entry.get('aliases', []))
+            )
+            self.specs[agent_type] = spec
+            self.aliases[agent_type] = agent_type
+            for alias in spec.aliases:
+                self.aliases[alias] = agent_type
+
+        self._lock = threading.RLock()
+        self._modules: Dict[str, Any] = {}
+        self._classes: Dict[str, type] = {}
+        self._instances: Dict[str, Any] = {}
+        self.profiles: Dict[str, ImportProfile] = {}
+
+    @classmethod
+    def from_file(cls, path: Path, base_dir: Path = None) -> "AgentRegistry":
+        """Registry from a JSON manifest; module paths are relative to the manifest's directory"""
+        path = Path(path)
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        return cls(manifest, base_dir or path.parent)
+
+    def has(self, agent_type: str) -> bool:
+        return agent_type in self.aliases
+
+    def resolve(self, agent_type: str) -> AgentSpec:
+        if agent_type not in self.aliases:
+            raise KeyError(f"Unknown agent type: {agent_type}")
+        return self.specs[self.aliases[agent_type]]
+
+    def agent_types(self) -> List[str]:
+        return list(self.specs)
+
+    def load_module(self, agent_type: str):
+        """Import an agent's module on first use (profiled), then return the memoized module"""
+        spec = self.resolve(agent_type)
+        module = self._modules.get(spec.agent_type)
+        if module is not None:
+            return module
+
+        with self._lock:
+            module = self._modules.get(spec.agent_type)
+            if module is not None:
+                return module
+            if not spec.module_path.exists():
+                raise FileNotFoundError(f"Agent module not found: {spec.module_path}")
+
+            import_spec = importlib.util.spec_from_file_location(spec.module_name, spec.module_path)
+            module = importlib.util.module_from_spec(import_spec)
+            sys.modules[spec.module_name] = module
+            try:
+                with _PROFILE_LOCK, _ImportTimer() as timer:
+                    started = time.perf_counter()
+                    import_spec.loader.exec_module(module)
+                    total = time.perf_counter() - started
+            except BaseException:
+                sys.modules.pop(spec.module_name, None)
+                raise
+
+            nested_us = sum(entry['cumulative_us'] for entry in timer.entries if entry['depth'] == 0)
+            self.profiles[spec.agent_type] = ImportProfile(
+                agent_type=spec.agent_type,
+                total_seconds=total,
+                module_seconds=max(0.0, total - nested_us / 1e6),
+                imports=timer.entries
+            )
+            self._modules[spec.agent_type] = module
+            logger.info(f"Loaded {spec.agent_type} agent from {spec.module_path.name} in {total * 1000:.1f} ms")
+            return module
+
+    def get_class(self, agent_type: str) -> type:
+        spec = self.resolve(agent_type)
+        agent_class = self._classes.get(spec.agent_type)
+        if agent_class is None:
+            module = self.load_module(agent_type)
+            if not spec.class_name or not hasattr(module, spec.class_name):
+                raise AttributeError(f"{spec.module_path.name} has no class {spec.class_name}")
+            agent_class = getattr(module, spec.class_name)
+            self._classes[spec.agent_type] = agent_class
+        return agent_class
+
+    def create(self, agent_type: str, *args, **kwargs):
+        """New agent instance (the module and class are memoized)"""
+        return self.get_class(agent_type)(*args, **kwargs)
+
+    def instance(self, agent_type: str):
+        """Shared agent instance, created on first use"""
+        spec = self.resolve(agent_type)
+        with self._lock:
+            if spec.agent_type not in self._instances:
+                self._instances[spec.agent_type] = self.create(agent_type)
+            return self._instances[spec.agent_type]
+
+    def import_report(self) -> List[Dict[str, Any]]:
+        """Per-agent load cost, slowest first"""
+        report = []
+        for profile in sorted(self.profiles.values(), key=lambda p: p.total_seconds, reverse=True):
+            report.append({
+                'agent_type': profile.agent_type,
+                'total_ms': round(profile.total_seconds * 1000, 1),
+                'module_ms': round(profile.module_seconds * 1000, 1),
+                'first_time_imports': len(profile.imports),
+                'slowest_imports': [
+                    {'module': entry['module'], 'self_ms': round(entry['self_us'] / 1000, 1),
+                     'cumulative_ms': round(entry['cumulative_us'] / 1000, 1)}
+                    for entry in profile.slowest(5)
+                ]
+            })
+        return report
+
+    def format_import_report(self) -> str:
+        lines = [f"{'agent':<20} {'total ms':>10} {'own ms':>10} {'imports':>8}  slowest imports"]
+        for row in self.import_report():
+            slowest = ", ".join(f"{entry['module']} {entry['self_ms']}ms" for entry in row['slowest_imports'][:3])
+            lines.append(f"{row['agent_type']:<20} {row['total_ms']:>10} {row['module_ms']:>10} "
+                         f"{row['first_time_imports']:>8}  {slowest}")
+        return "\n".join(lines)
+
+    def cold_start_profile(self, agent_type: str, python: str = sys.executable,
+                           timeout: int = 120) -> List[Dict[str, Any]]:
+        """Load one agent in a fresh interpreter under ``-X importtime``
+
+        The in-process profile only sees modules not yet imported by this
+        process; this measures what a new batch container or Lambda pays.
+        Returns entries sorted by self time.
+        """
+        spec = self.resolve(agent_type)
+        code = (
+            "import importlib.util, sys; "
+            f"sys.path.insert(0, {str(spec.module_path.parent)!r}); "
+            f"s = importlib.util.spec_from_file_location({spec.module_name!r}, {str(spec.module_path)!r}); "
+            "m = importlib.util.module_from_spec(s); s.loader.exec_module(m)"
+        )
+        result = subprocess.run([python, '-X', 'importtime', '-c', code],
+                                capture_output=True, text=True, timeout=timeout,
+                                cwd=str(spec.module_path.parent), env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'})
+        entries = []
+        for line in result.stderr.splitlines():
+            match = IMPORTTIME_LINE.match(line)
+            if match:
+                entries.append({
+                    'module': match.group(4),
+                    'self_us': int(match.group(1)),
+                    'cumulative_us': int(match.group(2)),
+                    'depth': len(match.group(3)) // 2
+                })
+        if result.returncode != 0:
+            logger.warning(f"Cold start of {agent_type} failed: {result.stderr.strip().splitlines()[-1:]}")
+        return sorted(entries, key=lambda entry: entry['self_us'], reverse=True)
+
+
+_default_registry: Optional[AgentRegistry] = None
+_default_lock = threading.Lock()
+
+
+def get_registry() -> AgentRegistry:
+    """Process-wide registry, built once from AGENT_REGISTRY_MANIFEST or the built-in manifest"""
+    global _default_registry
+    if _default_registry is None:
+        with _default_lock:
+            if _default_registry is None:
+                manifest_path = os.environ.get('AGENT_REGISTRY_MANIFEST')
+                _default_registry = AgentRegistry.from_file(Path(manifest_path)) if manifest_path else AgentRegistry()
+    return _default_registry
+
+
+def main():
+    """Profile agent imports: agent_registry.py [agent types...] [--cold]"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    registry = get_registry()
+    agent_types = args or registry.agent_types()
+
+    if '--cold' in sys.argv:
+        for agent_type in agent_types:
+            entries = registry.cold_start_profile(agent_type)
+            print(f"\n{agent_type}: {sum(e['self_us'] for e in entries) / 1000:.1f} ms across {len(entries)} imports")
+            for entry in entries[:10]:
+                print(f"  {entry['self_us'] / 1000:>8.1f} ms  {entry['module']}")
+        return
+
+    for agent_type in agent_types:
+        try:
+            registry.load_module(agent_type)
+        except Exception as e:
+            print(f"❌ {agent_type}: {e}")
+    print(registry.format_import_report())
+
+
+if __name__ == "__main__":
+    main()
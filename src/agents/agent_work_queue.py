@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Agent Work Queue - durable per-agent work queues
+SQLite (WAL mode) backed queue with O(1) appends, atomic claim/ack for
+consumers and priority ordering at read time. Safe to share between
+processes: SQLite's file locks serialize writers and BEGIN IMMEDIATE makes
+claims atomic.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+logger = logging.getLogger('AgentWorkQueue')
+
+PRIORITY_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3, 'trivial': 4}
+QUEUE_DIR = Path("work_queues")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ticket_id TEXT,
+    priority INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    enqueued_at REAL NOT NULL,
+    claimed_by TEXT,
+    claimed_at REAL,
+    lease_expires REAL,
+    completed_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_queue_status_priority ON queue (status, priority, id);
+
+-- Status counters maintained by triggers so readers never scan the queue
+CREATE TABLE IF NOT EXISTS counts (
+    status TEXT PRIMARY KEY,
+    n INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS trg_queue_insert AFTER INSERT ON queue BEGIN
+    INSERT INTO counts (status, n) VALUES (NEW.status, 1)
+        ON CONFLICT(status) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_queue_update AFTER UPDATE OF status ON queue
+WHEN OLD.status != NEW.status BEGIN
+    UPDATE counts SET n = n - 1 WHERE status = OLD.status;
+    INSERT INTO counts (status, n) VALUES (NEW.status, 1)
+        ON CONFLICT(status) DO UPDATE SET n = n + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS trg_queue_delete AFTER DELETE ON queue BEGIN
+    UPDATE counts SET n = n - 1 WHERE status = OLD.status;
+END;
+"""
+
+
+class AgentWorkQueue:
+    """Durable work queue for a single agent"""
+
+    def __init__(self, agent_name: str, queue_dir: Path = QUEUE_DIR, lease_seconds: int = 900):
+        self.agent_name = agent_name
+        self.queue_dir = Path(queue_dir)
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.queue_dir / f"{agent_name}_queue.db"
+        self.lease_seconds = lease_seconds
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+        self._migrate_legacy_json()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections can't be shared across threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=30000")
+            self._local.conn = conn
+        return conn
+
+    def _migrate_legacy_json(self):
+        """Import a legacy {agent}_queue.json file once, then set it aside"""
+        legacy_file = self.queue_dir / f"{self.agent_name}_queue.json"
+        if not legacy_file.exists():
+            return
+        try:
+            with open(legacy_file, 'r') as f:
+                packages = json.load(f)
+            for package in packages:
+                self.enqueue(package)
+            os.replace(legacy_file, legacy_file.with_suffix(".json.migrated"))
+            logger.info(f"Migrated {len(packages)} items from {legacy_file}")
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy queue {legacy_file}: {e}")
+
+    def enqueue(self, package: Dict[str, Any]) -> int:
+        """Append a work package (O(1)); returns its queue id"""
+        conn = self._connect()
+        cursor = conn.execute(
+            "INSERT INTO queue (ticket_id, priority, payload, enqueued_at) VALUES (?, ?, ?, ?)",
+            (
+                package.get('ticket_id'),
+                PRIORITY_ORDER.get(package.get('priority'), len(PRIORITY_ORDER)),
+                json.dumps(package),
+                time.time()
+            )
+        )
+        return cursor.lastrowid
+
+    def claim(self, consumer: str) -> Optional[Dict[str, Any]]:
+        """Atomically claim the highest-priority pending package
+
+        The claim is a lease: if it isn't acked within lease_seconds the
+        package becomes claimable again. Returns the package with its
+        ``queue_id`` added, or None when the queue is empty.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "UPDATE queue SET status = 'pending', claimed_by = NULL "
+                "WHERE status = 'claimed' AND lease_expires < ?",
+                (now,)
+            )
+            row = conn.execute(
+                "SELECT id, payload FROM queue WHERE status = 'pending' ORDER BY priority, id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE queue SET status = 'claimed', claimed_by = ?, claimed_at = ?, lease_expires = ? "
+                "WHERE id = ?",
+                (consumer, now, now + self.lease_seconds, row['id'])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        package = json.loads(row['payload'])
+        package['queue_id'] = row['id']
+        return package
+
+    def ack(self, queue_id: int) -> bool:
+        """Mark a claimed package as done"""
+        cursor = self._connect().execute(
+            "UPDATE queue SET status = 'done', completed_at = ? WHERE id = ? AND status = 'claimed'",
+            (time.time(), queue_id)
+        )
+        return cursor.rowcount == 1
+
+    def release(self, queue_id: int) -> bool:
+        """Return a claimed package to the queue (e.g. after a failure)"""
+        cursor = self._connect().execute(
+            "UPDATE queue SET status = 'pending', claimed_by = NULL WHERE id = ? AND status = 'claimed'",
+            (queue_id,)
+        )
+        return cursor.rowcount == 1
+
+    def peek(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Pending packages in priority order, without claiming them"""
+        rows = self._connect().execute(
+            "SELECT payload FROM queue WHERE status = 'pending' ORDER BY priority, id LIMIT ?",
+            (limit,)
+        ).fetchall()
+        return [json.loads(row['payload']) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        """Item counts by status, read from the trigger-maintained counters"""
+        return read_counts(self.db_path)
+
+    def purge_done(self, older_than_seconds: int = 7 * 24 * 3600) -> int:
+        """Delete completed packages older than the cutoff"""
+        cursor = self._connect().execute(
+            "DELETE FROM queue WHERE status = 'done' AND completed_at < ?",
+            (time.time() - older_than_seconds,)
+        )
+        return cursor.rowcount
+
+
+def read_counts(db_path: Path) -> Dict[str, int]:
+    """Read status counts from a queue database without touching the queue table"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=30)
+    try:
+        rows = conn.execute("SELECT status, n FROM counts").fetchall()
+    finally:
+        conn.close()
+    counts = {'pending': 0, 'claimed': 0, 'done': 0}
+    counts.update({status: n for status, n in rows})
+    return counts
+
+
+def queue_counts(queue_dir: Path = QUEUE_DIR) -> Dict[str, Dict[str, int]]:
+    """Counts for every agent queue in a directory, keyed by agent name"""
+    results = {}
+    for db_path in sorted(Path(queue_dir).glob("*_queue.db")):
+        agent_name = db_path.name[:-len("_queue.db")]
+        try:
+            results[agent_name] = read_counts(db_path)
+        except sqlite3.Error as e:
+            logger.error(f"Error reading queue {db_path}: {e}")
+    return results
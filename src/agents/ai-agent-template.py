@@ -8,6 +8,8 @@ import json
 import logging
 import time
 import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
@@ -20,10 +22,27 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
+def _run_cpu_task(agent_class, work_item: Dict[str, Any]) -> Dict[str, Any]:
+    """Process-pool entry point; runs the agent class's picklable CPU-bound handler"""
+    return agent_class.handle_cpu_task(work_item)
+
+
 class BaseAIAgent:
-    """Base class for all AI agents"""
+    """Base class for all AI agents
     
-    def __init__(self, agent_type: str, capabilities: List[str]):
+    Work items run concurrently up to ``max_concurrency``. ``execution_mode``
+    selects how handlers execute:
+      - "async":   ``handle_specific_task`` is a coroutine awaited on the event loop (I/O-bound work)
+      - "thread":  ``handle_specific_task`` runs in a thread pool (blocking I/O, default)
+      - "process": the ``handle_cpu_task`` staticmethod runs in a process pool (CPU-bound work)
+    Subclasses set these as class attributes or pass them to ``__init__``.
+    """
+    
+    execution_mode = "thread"
+    max_concurrency = 1
+    
+    def __init__(self, agent_type: str, capabilities: List[str],
+                 execution_mode: Optional[str] = None, max_concurrency: Optional[int] = None):
         # Core agent properties
         self.agent_id = f"ai-{agent_type}-{int(time.time())}"
         self.agent_type = agent_type
@@ -57,6 +76,17 @@ class BaseAIAgent:
         # Initialize integrations
         self.orchestrator = None
         self.work_queue = []
+        self.heartbeat_interval = 10
+        
+        # Concurrent execution
+        if execution_mode:
+            self.execution_mode = execution_mode
+        if max_concurrency:
+            self.max_concurrency = max_concurrency
+        self.active_tasks: Dict[str, asyncio.Task] = {}
+        self._task_titles: Dict[str, str] = {}
+        self._cancel_events: Dict[str, threading.Event] = {}
+        self._executor: Optional[Executor] = None
         
         # Initialize the agent
         self.initialize()
@@ -110,13 +140,22 @@ class BaseAIAgent:
         if not self.orchestrator:
             return []
         
-        work_status = self.orchestrator.get_work_queue_status()
-        assigned_work = [
-            item for item in work_status["work_items"]
-            if item.get("assigned_agent") == self.agent_id and item.get("status") == "assigned"
-        ]
+        return self.orchestrator.get_agent_work_items(self.agent_id, status="assigned")
+    
+    def subscribe_to_work(self) -> Optional[asyncio.Queue]:
+        """Subscribe to pushed assignments (must be called from the running event loop)"""
+        if self.orchestrator and hasattr(self.orchestrator, "subscribe"):
+            return self.orchestrator.subscribe(self.agent_id)
+        return None
+    
+    def acknowledge_work(self, item_id: str) -> bool:
+        """Acknowledge a pushed work item so the orchestrator doesn't redeliver it
         
-        return assigned_work
+        Returns False for stale copies (redeliveries or items taken back), which must be skipped.
+        """
+        if self.orchestrator:
+            return bool(self.orchestrator.acknowledge_work_item(item_id, self.agent_id))
+        return False
     
     def complete_task(self, item_id: str, result: Dict[str, Any] = None):
         """Mark a task as completed"""
@@ -127,10 +166,10 @@ class BaseAIAgent:
             self.status = "idle"
             logging.info(f"✅ Task completed: {item_id}")
     
-    def fail_task(self, item_id: str, error: str):
-        """Mark a task as failed"""
+    def fail_task(self, item_id: str, error: str, requeue: bool = True):
+        """Mark a task as failed (requeue=False keeps the orchestrator from retrying it)"""
         if self.orchestrator:
-            self.orchestrator.fail_work_item(item_id, self.agent_id, error)
+            self.orchestrator.fail_work_item(item_id, self.agent_id, error, requeue=requeue)
             self.tasks_failed += 1
             self.current_task = None
             self.status = "idle"
@@ -165,6 +204,123 @@ class BaseAIAgent:
         """Handle agent-specific task processing - MUST BE OVERRIDDEN"""
         raise NotImplementedError("Subclasses must implement handle_specific_task method")
     
+    @staticmethod
+    def handle_cpu_task(work_item: Dict[str, Any]) -> Dict[str, Any]:
+        """CPU-bound handler for execution_mode "process" - override as a staticmethod
+        
+        Runs in a worker process, so it only receives the work item and must
+        not rely on agent state.
+        """
+        raise NotImplementedError("Agents using process execution must implement handle_cpu_task")
+    
+    def is_cancelled(self, item_id: str) -> bool:
+        """Cooperative cancellation check for handlers running in threads"""
+        event = self._cancel_events.get(item_id)
+        return bool(event and event.is_set())
+    
+    def cancel_work_item(self, item_id: str) -> bool:
+        """Request cancellation of a running work item"""
+        task = self.active_tasks.get(item_id)
+        if not task:
+            return False
+        if not self._cancel_events[item_id].is_set():
+            self._cancel_events[item_id].set()
+            task.cancel()
+        return True
+    
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.execution_mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_concurrency)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix=self.agent_id
+                )
+        return self._executor
+    
+    async def _execute_handler(self, work_item: Dict[str, Any]) -> Dict[str, Any]:
+        """Run the task handler according to the agent's execution mode"""
+        loop = asyncio.get_running_loop()
+        if self.execution_mode == "async" and asyncio.iscoroutinefunction(self.handle_specific_task):
+            return await self.handle_specific_task(work_item)
+        if self.execution_mode == "process":
+            future = loop.run_in_executor(self._get_executor(), _run_cpu_task, type(self), work_item)
+        else:
+            future = loop.run_in_executor(self._get_executor(), self.handle_specific_task, work_item)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # A running thread or process can't be interrupted: keep the slot until it returns
+            await asyncio.wait({future})
+            raise
+    
+    def _refresh_status(self):
+        """Report busy only when every execution slot is taken"""
+        if self.status == "error":
+            return
+        self.status = "busy" if len(self.active_tasks) >= self.max_concurrency else "active"
+        self.current_task = ", ".join(self._task_titles.values()) or None
+    
+    async def process_work_item_async(self, work_item: Dict[str, Any], slots: asyncio.Semaphore) -> bool:
+        """Process a work item without blocking the event loop, releasing its slot when done"""
+        item_id = work_item["item_id"]
+        title = work_item["title"]
+        
+        logging.info(f"🔄 Processing: {title}")
+        self._task_titles[item_id] = title
+        self._refresh_status()
+        if self.status == "active":
+            # Free slots left - let the orchestrator know straight away
+            self.send_heartbeat()
+        
+        try:
+            result = await self._execute_handler(work_item)
+            self.complete_task(item_id, result)
+            logging.info(f"✅ Successfully processed: {title}")
+            return True
+        except asyncio.CancelledError:
+            # Cancelled on request: report it, but don't have the orchestrator run it again
+            self.fail_task(item_id, "cancelled", requeue=False)
+            return False
+        except Exception as e:
+            self.fail_task(item_id, str(e))
+            logging.error(f"❌ Failed to process: {title}")
+            return False
+        finally:
+            self.active_tasks.pop(item_id, None)
+            self._cancel_events.pop(item_id, None)
+            self._task_titles.pop(item_id, None)
+            slots.release()
+            self._refresh_status()
+    
+    async def _heartbeat_loop(self):
+        """Keep heartbeats flowing independently of running tasks"""
+        while True:
+            try:
+                self.send_heartbeat()
+            except Exception as e:
+                logging.error(f"Heartbeat failed for {self.agent_id}: {e}")
+            await asyncio.sleep(self.heartbeat_interval)
+    
+    async def _receive_loop(self, work_queue: asyncio.Queue, accepted: asyncio.Queue):
+        """Acknowledge pushed items as soon as they arrive, whether or not a slot is free
+        
+        Acking only when a slot opens would let items queued behind a long task
+        miss their ack deadline and be taken away from a healthy agent.
+        """
+        while True:
+            try:
+                work_item = await work_queue.get()
+                item_id = work_item["item_id"]
+                if not self.acknowledge_work(item_id) or item_id in self.active_tasks:
+                    continue  # Stale copy: redelivered, already running or taken back
+                accepted.put_nowait(work_item)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"Error receiving work for {self.agent_id}: {e}")
+                await asyncio.sleep(1)
+    
     def get_status(self) -> Dict[str, Any]:
         """Get current agent status"""
         uptime = datetime.now() - self.start_time
@@ -190,6 +346,48 @@ class BaseAIAgent:
         """Main agent loop"""
         logging.info(f"🚀 {self.agent_type} Agent starting main loop...")
         
+        work_queue = self.subscribe_to_work()
+        if work_queue is None:
+            await self.run_polling()
+            return
+        
+        slots = asyncio.Semaphore(self.max_concurrency)
+        # Acknowledged items waiting for an execution slot
+        accepted: asyncio.Queue = asyncio.Queue()
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        receiver = asyncio.create_task(self._receive_loop(work_queue, accepted))
+        try:
+            while True:
+                try:
+                    work_item = await accepted.get()
+                    item_id = work_item["item_id"]
+                    
+                    # Wait for a free execution slot; heartbeats and acks keep flowing meanwhile
+                    await slots.acquire()
+                    self._cancel_events[item_id] = threading.Event()
+                    self.active_tasks[item_id] = asyncio.create_task(
+                        self.process_work_item_async(work_item, slots)
+                    )
+                    
+                except KeyboardInterrupt:
+                    logging.info(f"🛑 {self.agent_type} Agent stopping...")
+                    break
+                except Exception as e:
+                    logging.error(f"Error in {self.agent_type} agent loop: {e}")
+                    self.status = "error"
+                    await asyncio.sleep(5)
+        finally:
+            heartbeat.cancel()
+            receiver.cancel()
+            for item_id in list(self.active_tasks):
+                self.cancel_work_item(item_id)
+            if self._executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            self.orchestrator.unsubscribe(self.agent_id)
+    
+    async def run_polling(self):
+        """Polling loop for orchestrators without push delivery"""
         while True:
             try:
                 # Send heartbeat
@@ -32,6 +32,9 @@ logger = logging.getLogger('AIArchitectAgent')
 
 # Import existing infrastructure
 sys.path.append(str(Path(__file__).parent))
+from requirement_extraction import (
+    RequirementTextAnalyzer, TextFeatures, DOMAIN_KEYWORDS, SCALE_KEYWORDS, TECH_KEYWORDS, determine_priority
+)
 
 try:
     from team_communication_protocol import CommunicationHub
@@ -73,6 +76,9 @@ class TechnicalSpecification:
     risks: List[Dict[str, str]]
 
 class AIArchitectAgent:
+    # Requirement patterns and keyword vocabulary, compiled once for every issue
+    text_analyzer = RequirementTextAnalyzer()
+    
     def __init__(self):
         self.agent_id = "ai-architect-001"
         self.agent_type = "architect"
@@ -237,11 +243,14 @@ class AIArchitectAgent:
         issue_body = issue_data.get('body', '')
         labels = issue_data.get('labels', [])
         
+        # One pass over the issue text, shared by requirement extraction and context analysis
+        features = self.text_analyzer.analyze(issue_title, issue_body)
+        
         # Extract technical requirements
-        requirements = self.extract_requirements(issue_title, issue_body)
+        requirements = self.extract_requirements(issue_title, issue_body, features)
         
         # Analyze context and constraints
-        context = self.analyze_context(issue_data)
+        context = self.analyze_context(issue_data, features)
         
         # Determine technical approach
         tech_approach = self.determine_technical_approach(requirements, labels, context)
@@ -275,68 +284,35 @@ class AIArchitectAgent:
             'dependencies': dependencies
         }
     
-    def extract_requirements(self, title: str, body: str) -> List[Dict[str, Any]]:
+    def extract_requirements(self, title: str, body: str,
+                             features: Optional[TextFeatures] = None) -> List[Dict[str, Any]]:
         """Extract structured requirements from issue text"""
         requirements = []
         
-        # Functional requirements patterns
-        functional_patterns = [
-            (r"user should be able to (.+)", 'functional', 'user_capability'),
-            (r"system must (.+)", 'functional', 'system_requirement'),
-            (r"application needs to (.+)", 'functional', 'application_requirement'),
-            (r"feature requires (.+)", 'functional', 'feature_requirement'),
-            (r"support for (.+)", 'functional', 'support_requirement'),
-            (r"enable (.+)", 'functional', 'enablement')
-        ]
+        if features is None:
+            features = self.text_analyzer.analyze(title, body)
         
-        # Non-functional requirements patterns  
-        nonfunctional_patterns = [
-            (r"performance[:\s]+(.+)", 'performance', 'metric'),
-            (r"should handle (\d+) requests?", 'performance', 'throughput'),
-            (r"response time[:\s]+(.+)", 'performance', 'latency'),
-            (r"security[:\s]+(.+)", 'security', 'requirement'),
-            (r"scalability[:\s]+(.+)", 'scalability', 'requirement'),
-            (r"availability[:\s]+(.+)", 'availability', 'requirement'),
-            (r"must be (.+compatible)", 'compatibility', 'requirement'),
-            (r"integrate with (.+)", 'integration', 'external_system')
-        ]
-        
-        # Extract from combined text
-        text = f"{title} {body}".lower()
-        
-        # Extract functional requirements
-        for pattern, req_type, category in functional_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                requirements.append({
-                    'type': req_type,
-                    'category': category,
-                    'description': match.strip(),
-                    'priority': self._determine_priority(match)
-                })
-        
-        # Extract non-functional requirements
-        for pattern, req_type, category in nonfunctional_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                requirements.append({
-                    'type': req_type,
-                    'category': category,
-                    'description': match.strip(),
-                    'priority': 'high' if req_type in ['security', 'performance'] else 'medium'
-                })
+        # Functional and non-functional requirements, in pattern order
+        for rule, match in features.matches:
+            if rule.req_type == 'functional':
+                priority = self._determine_priority(match)
+            else:
+                priority = 'high' if rule.req_type in ['security', 'performance'] else 'medium'
+            requirements.append({
+                'type': rule.req_type,
+                'category': rule.category,
+                'description': match.strip(),
+                'priority': priority
+            })
         
         # Extract acceptance criteria
-        if "acceptance criteria" in text or "definition of done" in text:
-            criteria_section = text.split("acceptance criteria")[-1] if "acceptance criteria" in text else text.split("definition of done")[-1]
-            criteria_items = re.findall(r"[-*]\s*(.+)", criteria_section)
-            for item in criteria_items[:5]:  # Limit to first 5 items
-                requirements.append({
-                    'type': 'acceptance',
-                    'category': 'validation',
-                    'description': item.strip(),
-                    'priority': 'high'
-                })
+        for item in features.acceptance_criteria[:5]:  # Limit to first 5 items
+            requirements.append({
+                'type': 'acceptance',
+                'category': 'validation',
+                'description': item.strip(),
+                'priority': 'high'
+            })
         
         # If no requirements found, create default ones based on title
         if not requirements:
@@ -351,55 +327,36 @@ class AIArchitectAgent:
     
     def _determine_priority(self, text: str) -> str:
         """Determine requirement priority based on keywords"""
-        high_priority_words = ['critical', 'urgent', 'must', 'required', 'essential']
-        low_priority_words = ['nice to have', 'optional', 'future', 'consider']
-        
-        text_lower = text.lower()
-        
-        if any(word in text_lower for word in high_priority_words):
-            return 'high'
-        elif any(word in text_lower for word in low_priority_words):
-            return 'low'
-        else:
-            return 'medium'
+        return determine_priority(text)
     
-    def analyze_context(self, issue_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_context(self, issue_data: Dict[str, Any],
+                        features: Optional[TextFeatures] = None) -> Dict[str, Any]:
         """Analyze the context and constraints of the issue"""
+        if features is None:
+            features = self.text_analyzer.analyze(issue_data.get('title', ''), issue_data.get('body', ''))
+        
         context = {
-            'domain': self._determine_domain(issue_data),
-            'scale': self._determine_scale(issue_data),
+            'domain': self._determine_domain(features),
+            'scale': self._determine_scale(features),
             'timeline': self._determine_timeline(issue_data),
             'team_size': self._estimate_team_size(issue_data),
-            'existing_stack': self._detect_existing_stack(issue_data)
+            'existing_stack': self._detect_existing_stack(features)
         }
         return context
     
-    def _determine_domain(self, issue_data: Dict[str, Any]) -> str:
+    def _determine_domain(self, features: TextFeatures) -> str:
         """Determine the application domain"""
-        title_body = f"{issue_data.get('title', '')} {issue_data.get('body', '')}".lower()
-        
-        domains = {
-            'ecommerce': ['cart', 'payment', 'checkout', 'product', 'order'],
-            'analytics': ['dashboard', 'metrics', 'report', 'analytics', 'visualization'],
-            'social': ['user', 'profile', 'feed', 'comment', 'share'],
-            'enterprise': ['workflow', 'approval', 'permission', 'role', 'audit'],
-            'iot': ['sensor', 'device', 'telemetry', 'mqtt', 'real-time'],
-            'ml': ['model', 'training', 'prediction', 'dataset', 'algorithm']
-        }
-        
-        for domain, keywords in domains.items():
-            if any(keyword in title_body for keyword in keywords):
+        for domain, keywords in DOMAIN_KEYWORDS.items():
+            if features.has_any(keywords):
                 return domain
         
         return 'general'
     
-    def _determine_scale(self, issue_data: Dict[str, Any]) -> str:
+    def _determine_scale(self, features: TextFeatures) -> str:
         """Determine the expected scale of the application"""
-        text = f"{issue_data.get('title', '')} {issue_data.get('body', '')}".lower()
-        
-        if any(word in text for word in ['million', 'high traffic', 'large scale', 'enterprise']):
+        if features.has_any(SCALE_KEYWORDS['large']):
             return 'large'
-        elif any(word in text for word in ['thousand', 'medium scale', 'moderate']):
+        elif features.has_any(SCALE_KEYWORDS['medium']):
             return 'medium'
         else:
             return 'small'
@@ -426,34 +383,9 @@ class AIArchitectAgent:
         else:
             return 'small'
     
-    def _detect_existing_stack(self, issue_data: Dict[str, Any]) -> List[str]:
+    def _detect_existing_stack(self, features: TextFeatures) -> List[str]:
         """Detect mentions of existing technology stack"""
-        text = f"{issue_data.get('title', '')} {issue_data.get('body', '')}".lower()
-        
-        detected_stack = []
-        tech_keywords = {
-            'react': 'React',
-            'angular': 'Angular',
-            'vue': 'Vue.js',
-            'node': 'Node.js',
-            'python': 'Python',
-            'django': 'Django',
-            'flask': 'Flask',
-            'postgres': 'PostgreSQL',
-            'mongodb': 'MongoDB',
-            'redis': 'Redis',
-            'docker': 'Docker',
-            'kubernetes': 'Kubernetes',
-            'aws': 'AWS',
-            'azure': 'Azure',
-            'gcp': 'Google Cloud'
-        }
-        
-        for keyword, tech in tech_keywords.items():
-            if keyword in text:
-                detected_stack.append(tech)
-        
-        return detected_stack
+        return [tech for keyword, tech in TECH_KEYWORDS.items() if keyword in features.keywords]
     
     def determine_technical_approach(self, requirements: List[Dict], labels: List[str], context: Dict[str, Any]) -> Dict[str, Any]:
         """Determine the best technical approach based on requirements and context"""
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Board Metrics - event-sourced project board metrics
+Card events (added, moved, removed) are folded into running totals as they
+happen: per-column counts, throughput and sprint burndown are kept as
+compact one-value-per-day series and cycle times as a sorted list, so board
+and sprint reports are read off the totals instead of recomputed from every
+card.
+"""
+
+import bisect
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional
+
+DONE_COLUMN = "Done"
+DEFAULT_STORY_POINTS = 3
+SERIES_RETENTION_DAYS = 400
+
+
+def day_of(ts: float) -> int:
+    """Local calendar day of an epoch timestamp, as a date ordinal"""
+    return date.fromtimestamp(ts).toordinal()
+
+
+class DailySeries:
+    """One value per calendar day, trimmed to a retention window"""
+
+    def __init__(self, retention_days: int = SERIES_RETENTION_DAYS):
+        self.retention_days = retention_days
+        self.values: Dict[int, float] = {}
+        self.last_day = 0
+
+    def _trim(self, day: int):
+        if day > self.last_day:
+            self.last_day = day
+            if len(self.values) > self.retention_days:
+                cutoff = day - self.retention_days
+                for old in [d for d in self.values if d <= cutoff]:
+                    del self.values[old]
+
+    def add(self, day: int, delta: float):
+        """Add to a day's value (counters); days that fall back to zero are dropped"""
+        value = self.values.get(day, 0) + delta
+        if value:
+            self.values[day] = value
+        else:
+            self.values.pop(day, None)
+        self._trim(day)
+
+    def set(self, day: int, value: float):
+        """Overwrite a day's value (levels such as remaining points)"""
+        self.values[day] = value
+        self._trim(day)
+
+    def get(self, day: int, default: float = 0) -> float:
+        return self.values.get(day, default)
+
+    def window(self, last_day: int, days: int) -> float:
+        """Sum over the `days` days ending at last_day"""
+        return sum(self.values.get(day, 0) for day in range(last_day - days + 1, last_day + 1))
+
+    def to_dict(self) -> Dict[str, float]:
+        return {date.fromordinal(day).isoformat(): value for day, value in sorted(self.values.items())}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, float], retention_days: int = SERIES_RETENTION_DAYS) -> "DailySeries":
+        series = cls(retention_days)
+        for day, value in (data or {}).items():
+            series.values[date.fromisoformat(day).toordinal()] = value
+        series.last_day = max(series.values, default=0)
+        return series
+
+
+class BoardMetrics:
+    """Running board and sprint metrics maintained from card events
+
+    Events are dicts with a ``type`` of ``card_added``, ``card_moved`` or
+    ``card_removed`` plus ``card_id``, ``column_id``/``column_name``
+    (``from_*`` as well for moves), ``issue_number``, ``created_ts`` and
+    ``ts``. Every report method reads running totals and is O(1) in the
+    number of cards. Card and column ids are kept as strings (GitHub's are
+    ints), so the totals look the same before and after a JSON snapshot.
+    """
+
+    def __init__(self, done_column: str = DONE_COLUMN):
+        self.done_column = done_column
+        self.column_counts: Dict[str, int] = defaultdict(int)  # column_name -> cards
+        self.throughput = DailySeries()  # cards reaching done per day, all boards
+        self.column_throughput: Dict[str, DailySeries] = defaultdict(DailySeries)  # done column_id -> series
+        self.done_cards: Dict[str, Dict[str, Any]] = {}  # card_id -> {'column_id', 'day', 'cycle_time', 'issue_number'}
+        self.done_issues: set = set()
+
+        self._cycle_times: List[float] = []  # sorted, hours
+        self._cycle_time_sum = 0.0
+
+        self.sprints: Dict[str, Dict[str, Any]] = {}
+        self.issue_sprints: Dict[int, set] = defaultdict(set)
+        self.events_applied = 0
+
+    # Event folding
+
+    def apply(self, event: Dict[str, Any]):
+        """Fold one card event into the running totals"""
+        kind = event['type']
+        if kind == 'card_added':
+            self._enter(event, event['column_id'], event['column_name'])
+        elif kind == 'card_moved':
+            self._leave(event, event['from_column_id'], event['from_column_name'])
+            self._enter(event, event['column_id'], event['column_name'])
+        elif kind == 'card_removed':
+            self._leave(event, event['column_id'], event['column_name'])
+        else:
+            raise ValueError(f"Unknown board event type: {kind}")
+        self.events_applied += 1
+
+    def replay(self, events: Iterable[Dict[str, Any]]):
+        for event in events:
+            self.apply(event)
+
+    def _enter(self, event: Dict[str, Any], column_id: str, column_name: str):
+        column_id = str(column_id)
+        self.column_counts[column_name] += 1
+        if column_name != self.done_column:
+            return
+
+        day = day_of(event['ts'])
+        cycle_time = max(0.0, (event['ts'] - event['created_ts']) / 3600)  # hours
+        self.throughput.add(day, 1)
+        self.column_throughput[column_id].add(day, 1)
+        issue_number = event.get('issue_number')
+        self.done_cards[str(event['card_id'])] = {'column_id': column_id, 'day': day,
+                                             'cycle_time': cycle_time, 'issue_number': issue_number}
+        bisect.insort(self._cycle_times, cycle_time)
+        self._cycle_time_sum += cycle_time
+
+        if issue_number is not None:
+            self.done_issues.add(issue_number)
+            for sprint_id in self.issue_sprints.get(issue_number, ()):
+                self._burn(sprint_id, issue_number, done=True, day=day)
+
+    def _leave(self, event: Dict[str, Any], column_id: str, column_name: str):
+        self.column_counts[column_name] -= 1
+        done = self.done_cards.pop(str(event['card_id']), None)
+        if done is None:
+            return
+
+        # Reopened or removed: the card no longer counts towards the day it was done
+        self.throughput.add(done['day'], -1)
+        self.column_throughput[done['column_id']].add(done['day'], -1)
+        index = bisect.bisect_left(self._cycle_times, done['cycle_time'])
+        if index < len(self._cycle_times) and self._cycle_times[index] == done['cycle_time']:
+            del self._cycle_times[index]
+            self._cycle_time_sum -= done['cycle_time']
+
+        issue_number = event.get('issue_number')
+        if issue_number is not None:
+            self.done_issues.discard(issue_number)
+            for sprint_id in self.issue_sprints.get(issue_number, ()):
+                self._burn(sprint_id, issue_number, done=False, day=day_of(event['ts']))
+
+    # Sprints
+
+    def plan_sprint(self, sprint_id: str, issue_points: Dict[int, int], start_ts: float, end_ts: float):
+        """Track a sprint's burndown; issue_points maps issue number -> story points"""
+        self._unlink_sprint(sprint_id)
+        completed = {issue for issue in issue_points if issue in self.done_issues}
+        planned = sum(issue_points.values())
+        remaining = planned - sum(issue_points[issue] for issue in completed)
+        burndown = DailySeries()
+        burndown.set(day_of(time.time()), remaining)
+        self.sprints[sprint_id] = {
+            'points': dict(issue_points),
+            'planned': planned,
+            'remaining': remaining,
+            'completed_issues': completed,
+            'start_ts': start_ts,
+            'end_ts': end_ts,
+            'burndown': burndown,
+            'closed': False
+        }
+        for issue in issue_points:
+            self.issue_sprints[issue].add(sprint_id)
+
+    def start_sprint(self, sprint_id: str, start_ts: float, end_ts: float):
+        sprint = self.sprints.get(sprint_id)
+        if sprint:
+            sprint['start_ts'] = start_ts
+            sprint['end_ts'] = end_ts
+            sprint['burndown'].set(day_of(start_ts), sprint['remaining'])
+
+    def close_sprint(self, sprint_id: str) -> Dict[str, Any]:
+        """Freeze a sprint's figures; later card moves no longer affect it"""
+        self._unlink_sprint(sprint_id)
+        if sprint_id in self.sprints:
+            self.sprints[sprint_id]['closed'] = True
+        return self.sprint_report(sprint_id, include_burndown=True)
+
+    def _unlink_sprint(self, sprint_id: str):
+        sprint = self.sprints.get(sprint_id)
+        if not sprint:
+            return
+        for issue in sprint['points']:
+            sprints = self.issue_sprints.get(issue)
+            if sprints:
+                sprints.discard(sprint_id)
+                if not sprints:
+                    del self.issue_sprints[issue]
+
+    def _burn(self, sprint_id: str, issue_number: int, done: bool, day: int):
+        sprint = self.sprints[sprint_id]
+        points = sprint['points'][issue_number]
+        if done and issue_number not in sprint['completed_issues']:
+            sprint['completed_issues'].add(issue_number)
+            sprint['remaining'] -= points
+        elif not done and issue_number in sprint['completed_issues']:
+            sprint['completed_issues'].discard(issue_number)
+            sprint['remaining'] += points
+        else:
+            return
+        sprint['burndown'].set(day, sprint['remaining'])
+
+    # Reports
+
+    def sprint_report(self, sprint_id: str, now: Optional[float] = None,
+                      include_burndown: bool = False) -> Dict[str, Any]:
+        sprint = self.sprints.get(sprint_id)
+        if not sprint:
+            return {}
+        now = time.time() if now is None else now
+        duration = sprint['end_ts'] - sprint['start_ts']
+        elapsed = min(max(now - sprint['start_ts'], 0), duration) if duration > 0 else 0
+        ideal = sprint['planned'] * (1 - elapsed / duration) if duration > 0 else 0
+        completed = sprint['planned'] - sprint['remaining']
+        report = {
+            'sprint_id': sprint_id,
+            'planned_points': sprint['planned'],
+            'remaining_points': sprint['remaining'],
+            'completed_points': completed,
+            'ideal_points': max(0, ideal),
+            'completion_rate': completed / sprint['planned'] * 100 if sprint['planned'] > 0 else 0,
+            'completed_issues': len(sprint['completed_issues']),
+            'total_issues': len(sprint['points']),
+            'closed': sprint['closed']
+        }
+        if include_burndown:
+            report['burndown'] = sprint['burndown'].to_dict()
+        return report
+
+    def sprint_reports(self, sprint_ids: Optional[Iterable[str]] = None,
+                       now: Optional[float] = None) -> Dict[str, Dict[str, Any]]:
+        now = time.time() if now is None else now
+        ids = self.sprints if sprint_ids is None else sprint_ids
+        return {sprint_id: self.sprint_report(sprint_id, now) for sprint_id in ids if sprint_id in self.sprints}
+
+    def completed_issues(self, sprint_id: str) -> set:
+        sprint = self.sprints.get(sprint_id)
+        return set(sprint['completed_issues']) if sprint else set()
+
+    def done_on(self, ts: Optional[float] = None) -> int:
+        return int(self.throughput.get(day_of(time.time() if ts is None else ts)))
+
+    def weekly_throughput(self, done_column_id: Optional[str] = None, now: Optional[float] = None) -> int:
+        """Cards done in the last 7 days, on one done column or all boards"""
+        series = self.throughput if done_column_id is None else self.column_throughput.get(str(done_column_id))
+        if series is None:
+            return 0
+        return int(series.window(day_of(time.time() if now is None else now), 7))
+
+    def throughput_trend(self, days: int = 30, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        last_day = day_of(time.time() if now is None else now)
+        return [{'date': date.fromordinal(day).isoformat(), 'count': int(self.throughput.get(day))}
+                for day in range(last_day - days + 1, last_day + 1) if self.throughput.get(day)]
+
+    def cycle_time_summary(self) -> Dict[str, float]:
+        times = self._cycle_times
+        if not times:
+            return {}
+        return {
+            'count': len(times),
+            'min': times[0],
+            'max': times[-1],
+            'avg': self._cycle_time_sum / len(times),
+            'median': times[len(times) // 2]
+        }
+
+    def avg_cycle_time(self) -> float:
+        return self._cycle_time_sum / len(self._cycle_times) if self._cycle_times else 0
+
+    # Snapshots
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'column_counts': dict(self.column_counts),
+            'throughput': self.throughput.to_dict(),
+            'column_throughput': {column_id: series.to_dict()
+                                  for column_id, series in self.column_throughput.items()},
+            'done_cards': self.done_cards,
+            'sprints': {
+                sprint_id: {
+                    **sprint,
+                    'points': {str(issue): points for issue, points in sprint['points'].items()},
+                    'completed_issues': sorted(sprint['completed_issues']),
+                    'burndown': sprint['burndown'].to_dict()
+                }
+                for sprint_id, sprint in self.sprints.items()
+            },
+            'events_applied': self.events_applied
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], done_column: str = DONE_COLUMN) -> "BoardMetrics":
+        metrics = cls(done_column)
+        metrics.column_counts.update(data.get('column_counts', {}))
+        metrics.throughput = DailySeries.from_dict(data.get('throughput'))
+        for column_id, series in data.get('column_throughput', {}).items():
+            metrics.column_throughput[str(column_id)] = DailySeries.from_dict(series)
+        # Snapshots written before ids were normalised hold int column ids in done_cards
+        metrics.done_cards = {str(card_id): {**done, 'column_id': str(done['column_id'])}
+                              for card_id, done in data.get('done_cards', {}).items()}
+        metrics._cycle_times = sorted(done['cycle_time'] for done in metrics.done_cards.values())
+        metrics._cycle_time_sum = sum(metrics._cycle_times)
+        metrics.done_issues = {done['issue_number'] for done in metrics.done_cards.values()
+                               if done.get('issue_number') is not None}
+        for sprint_id, sprint in data.get('sprints', {}).items():
+            sprint = dict(sprint)
+            sprint['points'] = {int(issue): points for issue, points in sprint['points'].items()}
+            sprint['completed_issues'] = set(sprint['completed_issues'])
+            sprint['burndown'] = DailySeries.from_dict(sprint['burndown'])
+            metrics.sprints[sprint_id] = sprint
+            if not sprint['closed']:
+                for issue in sprint['points']:
+                    metrics.issue_sprints[issue].add(sprint_id)
+        metrics.events_applied = data.get('events_applied', 0)
+        return metrics
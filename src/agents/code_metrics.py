@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Code Metrics - per-function cyclomatic complexity, nesting depth and length
+One NodeVisitor pass over a module's AST measures every function: McCabe
+complexity (1 + decision points, nested functions measured on their own),
+deepest nesting of control blocks and lines of code. Large projects are
+spread over a process pool; results are plain JSON-able values so the QA
+results cache can store them per file.
+"""
+
+import ast
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger('CodeMetrics')
+
+# Bump when the per-file result changes (QA cache entries are keyed on it)
+METRICS_VERSION = 'code-metrics-1'
+
+# Statements that open a nested block (match needs 3.10, except* 3.11)
+_BLOCKS = tuple(getattr(ast, name) for name in ('For', 'AsyncFor', 'While', 'With', 'AsyncWith', 'Try',
+                                                'TryStar', 'Match') if hasattr(ast, name))
+
+# Nodes that add one path each
+_DECISIONS = tuple(getattr(ast, name) for name in ('IfExp', 'For', 'AsyncFor', 'While', 'ExceptHandler',
+                                                   'match_case') if hasattr(ast, name))
+
+
+class FunctionMetrics(NamedTuple):
+    name: str  # qualified, e.g. Class.method.inner
+    line: int
+    complexity: int
+    nesting: int
+    loc: int
+
+
+class ComplexityVisitor(ast.NodeVisitor):
+    """Measures every function and counts classes in one traversal"""
+
+    def __init__(self):
+        self.functions: List[FunctionMetrics] = []
+        self.classes = 0
+        self._scope: List[str] = []
+        # [complexity, current depth, max depth] of the functions being visited
+        self._frames: List[List[int]] = []
+
+    def visit_FunctionDef(self, node):
+        self._scope.append(node.name)
+        self._frames.append([1, 0, 0])
+        self.generic_visit(node)
+        complexity, _, nesting = self._frames.pop()
+        loc = (node.end_lineno or node.lineno) - node.lineno + 1
+        self.functions.append(FunctionMetrics('.'.join(self._scope), node.lineno, complexity, nesting, loc))
+        self._scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.classes += 1
+        self._scope.append(node.name)
+        self.generic_visit(node)
+        self._scope.pop()
+
+    def visit_If(self, node):
+        self._add(1)
+        self._enter()
+        self.visit(node.test)
+        for child in node.body:
+            self.visit(child)
+        self._leave()
+        # elif chains stay at the depth of their if
+        if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+            self.visit(node.orelse[0])
+        else:
+            self._enter()
+            for child in node.orelse:
+                self.visit(child)
+            self._leave()
+
+    def visit_BoolOp(self, node):
+        self._add(len(node.values) - 1)
+        self.generic_visit(node)
+
+    def visit_comprehension(self, node):
+        self._add(1 + len(node.ifs))
+        self.generic_visit(node)
+
+    def generic_visit(self, node):
+        if isinstance(node, _DECISIONS):
+            self._add(1)
+        if isinstance(node, _BLOCKS):
+            self._enter()
+            super().generic_visit(node)
+            self._leave()
+        else:
+            super().generic_visit(node)
+
+    def _add(self, paths: int):
+        # Decisions at module or class level belong to no function
+        if self._frames:
+            self._frames[-1][0] += paths
+
+    def _enter(self):
+        if self._frames:
+            frame = self._frames[-1]
+            frame[1] += 1
+            frame[2] = max(frame[2], frame[1])
+
+    def _leave(self):
+        if self._frames:
+            self._frames[-1][1] -= 1
+
+
+def analyze_source(data: bytes, filename: str = '<unknown>') -> Optional[Dict[str, Any]]:
+    """{'classes': n, 'functions': [FunctionMetrics fields, ...]}, or None if it does not parse"""
+    try:
+        tree = ast.parse(data, filename=filename)
+    except (SyntaxError, ValueError) as e:
+        logger.warning(f"Error parsing {filename}: {e}")
+        return None
+    visitor = ComplexityVisitor()
+    visitor.visit(tree)
+    return {'classes': visitor.classes, 'functions': [list(function) for function in visitor.functions]}
+
+
+def functions_of(result: Optional[Dict[str, Any]]) -> List[FunctionMetrics]:
+    return [FunctionMetrics(*row) for row in result['functions']] if result else []
+
+
+def _analyze_chunk(root: str, rel_paths: List[str]) -> List[tuple]:
+    results = []
+    for rel_path in rel_paths:
+        try:
+            with open(os.path.join(root, rel_path), 'rb') as f:
+                results.append((rel_path, analyze_source(f.read(), rel_path)))
+        except OSError as e:
+            logger.warning(f"Error reading {rel_path}: {e}")
+    return results
+
+
+class CodeMetricsEngine:
+    """Measures Python files, in parallel for large projects"""
+
+    def __init__(self, max_workers: Optional[int] = None, parallel_threshold: int = 200, chunk_size: int = 32):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = chunk_size
+
+    def analyze(self, root, rel_paths: List[str],
+                read: Optional[Callable[[str], bytes]] = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Result of analyze_source by relative path; unreadable files are left out
+
+        ``read`` supplies contents for the serial path (pool workers read from disk).
+        """
+        root = str(root)
+        if len(rel_paths) >= self.parallel_threshold and self.max_workers >= 2:
+            chunks = [rel_paths[i:i + self.chunk_size] for i in range(0, len(rel_paths), self.chunk_size)]
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+                    futures = [pool.submit(_analyze_chunk, root, chunk) for chunk in chunks]
+                    return dict(result for future in futures for result in future.result())
+            except (OSError, NotImplementedError, ImportError) as e:
+                # No working multiprocessing (e.g. Lambda has no /dev/shm)
+                logger.warning(f"Process pool unavailable, analyzing serially: {e}")
+
+        if read is None:
+            return dict(_analyze_chunk(root, rel_paths))
+        results = {}
+        for rel_path in rel_paths:
+            try:
+                results[rel_path] = analyze_source(read(rel_path), rel_path)
+            except OSError as e:
+                logger.warning(f"Error reading {rel_path}: {e}")
+        return results
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Compute Placement - cost- and latency-aware compute targets for dispatched agents
+Records how long each agent run took and how much memory it used, bucketed by
+agent type and issue features, in a SQLite stats store. The batch processors
+write it and the dispatcher reads it, so PLACEMENT_STATS_DB has to be on
+storage both mount (e.g. EFS, with PLACEMENT_STATS_JOURNAL_MODE=DELETE since
+WAL needs every connection on one host). From that
+history it predicts runtime and peak memory for a new issue, prices every
+target (Lambda, Fargate, Batch on Fargate Spot) with the unit prices kept next
+to the cost monitors' thresholds, and picks the cheapest one that finishes
+within the priority's latency SLO, right-sizing memory, CPU and timeout.
+"""
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger('ComputePlacement')
+
+STATS_DB = Path("placement_stats.db")
+STATS_JOURNAL_MODE = os.environ.get('PLACEMENT_STATS_JOURNAL_MODE', 'WAL')
+PRICING_CONFIG = Path(__file__).resolve().parents[2] / "config" / "environment-cost-config.json"
+
+# us-east-1 list prices; overridden by the "compute_pricing" section of the cost config
+DEFAULT_PRICING = {
+    'lambda': {
+        'gb_second': 0.0000166667,
+        'request': 0.0000002,
+        'startup_seconds': 2,
+        'max_seconds': 900,
+        'min_memory_mb': 128,
+        'max_memory_mb': 10240
+    },
+    'fargate': {
+        'vcpu_hour': 0.04048,
+        'gb_hour': 0.004445,
+        'startup_seconds': 45,
+        'min_billed_seconds': 60
+    },
+    'batch': {
+        # The Batch compute environment runs on Fargate; spot capacity is ~70% cheaper
+        'vcpu_hour': 0.01214,
+        'gb_hour': 0.00133,
+        'startup_seconds': 150,
+        'min_billed_seconds': 60,
+        'interruptions_per_hour': 0.05
+    }
+}
+
+# Completion-time SLO (queueing + startup + runtime) by assignment priority
+DEFAULT_LATENCY_SLO_SECONDS = {0: 600, 1: 1800, 2: 3600, 3: 4 * 3600}
+
+# Valid Fargate task sizes: cpu units -> (min, max, step) memory in MB
+FARGATE_SIZES = {
+    256: (512, 2048, None),
+    512: (1024, 4096, 1024),
+    1024: (2048, 8192, 1024),
+    2048: (4096, 16384, 1024),
+    4096: (8192, 30720, 1024)
+}
+
+WORK_LABELS = ['bug', 'feature', 'enhancement', 'documentation', 'testing', 'security',
+               'performance', 'infrastructure', 'deployment', 'analytics', 'reporting']
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    agent_type TEXT NOT NULL,
+    features TEXT NOT NULL,
+    compute_type TEXT,
+    duration_seconds REAL NOT NULL,
+    peak_memory_mb REAL,
+    cpu_seconds REAL,
+    cpu_units INTEGER,
+    succeeded INTEGER NOT NULL DEFAULT 1,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_key ON runs (agent_type, features, id);
+"""
+
+
+def issue_features(title: str, body: str, labels: List[str]) -> str:
+    """Coarse feature bucket for an issue: body size plus its work-type label"""
+    size = len(title or '') + len(body or '')
+    size_bucket = 's' if size < 500 else 'm' if size < 3000 else 'l'
+    lowered = {label.lower() for label in labels or []}
+    kind = next((label for label in WORK_LABELS if label in lowered), 'other')
+    return f"{size_bucket}:{kind}"
+
+
+def quantile(values: List[float], q: float) -> float:
+    """Nearest-rank quantile of a non-empty list"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+def fargate_size(memory_mb: float, min_cpu_units: int = 256) -> Tuple[int, int]:
+    """Smallest valid Fargate (cpu units, memory MB) with at least the requested resources"""
+    for cpu, (low, high, step) in FARGATE_SIZES.items():
+        if cpu < min_cpu_units or memory_mb > high:
+            continue
+        if step is None:
+            options = [512, 1024, 2048]
+            return cpu, next(option for option in options if option >= max(memory_mb, low))
+        memory = max(low, int(math.ceil(memory_mb / step) * step))
+        return cpu, memory
+    return 4096, 30720
+
+
+def load_pricing(config_file: Optional[Path] = None) -> Dict[str, Dict[str, float]]:
+    """DEFAULT_PRICING merged with the cost config's "compute_pricing" section, if any"""
+    pricing = {target: dict(values) for target, values in DEFAULT_PRICING.items()}
+    path = Path(config_file or os.environ.get('COMPUTE_PRICING_CONFIG', PRICING_CONFIG))
+    try:
+        with open(path, 'r') as f:
+            overrides = json.load(f).get('compute_pricing', {})
+        for target, values in overrides.items():
+            if isinstance(values, dict):
+                pricing.setdefault(target, {}).update(values)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Could not read compute pricing from {path}: {e}")
+    return pricing
+
+
+@dataclass
+class RuntimePrediction:
+    """Predicted resource use for one (agent type, feature bucket)"""
+    duration_seconds: float
+    duration_max_seconds: float
+    peak_memory_mb: Optional[float]
+    vcpus: Optional[float]
+    samples: int
+    basis: str  # "features", "agent_type"
+
+
+@dataclass
+class PlacementDecision:
+    """Chosen target and sizing, with the estimates it was chosen on"""
+    compute_type: str
+    memory_mb: int
+    cpu_units: int
+    timeout_minutes: int
+    estimated_cost: float
+    estimated_latency_seconds: float
+    slo_seconds: float
+    meets_slo: bool
+    prediction: Optional[RuntimePrediction] = None
+    candidates: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class PlacementStatsStore:
+    """Historical run durations and memory per (agent_type, feature bucket)"""
+
+    def __init__(self, db_path: Path = STATS_DB, window: int = 200, journal_mode: str = STATS_JOURNAL_MODE):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.window = window
+        self.journal_mode = journal_mode
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections can't be shared across threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def record(self, agent_type: str, features: str, duration_seconds: float,
+               peak_memory_mb: Optional[float] = None, cpu_seconds: Optional[float] = None,
+               compute_type: Optional[str] = None, cpu_units: Optional[int] = None,
+               succeeded: bool = True) -> int:
+        cursor = self._connect().execute(
+            "INSERT INTO runs (agent_type, features, compute_type, duration_seconds, peak_memory_mb, "
+            "cpu_seconds, cpu_units, succeeded, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (agent_type, features, compute_type, float(duration_seconds), peak_memory_mb,
+             cpu_seconds, cpu_units, int(bool(succeeded)), time.time())
+        )
+        return cursor.lastrowid
+
+    def recent(self, agent_type: str, features: Optional[str] = None) -> List[Tuple]:
+        """Latest successful runs (duration, peak memory, cpu seconds), newest first"""
+        query = ("SELECT duration_seconds, peak_memory_mb, cpu_seconds FROM runs "
+                 "WHERE agent_type = ? AND succeeded = 1")
+        params: List[Any] = [agent_type]
+        if features is not None:
+            query += " AND features = ?"
+            params.append(features)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(self.window)
+        return self._connect().execute(query, params).fetchall()
+
+    def summary(self) -> List[Dict[str, Any]]:
+        rows = self._connect().execute(
+            "SELECT agent_type, features, COUNT(*), AVG(duration_seconds), MAX(peak_memory_mb) "
+            "FROM runs WHERE succeeded = 1 GROUP BY agent_type, features ORDER BY agent_type, features"
+        ).fetchall()
+        return [{'agent_type': row[0], 'features': row[1], 'runs': row[2],
+                 'avg_duration_seconds': row[3], 'max_peak_memory_mb': row[4]} for row in rows]
+
+    def prune(self, older_than_days: int = 90) -> int:
+        cursor = self._connect().execute(
+            "DELETE FROM runs WHERE recorded_at < ?", (time.time() - older_than_days * 86400,)
+        )
+        return cursor.rowcount
+
+
+class PlacementEngine:
+    """Predicts runtime from history and picks the cheapest target that meets the SLO"""
+
+    def __init__(self, store: Optional[PlacementStatsStore] = None, pricing: Optional[Dict] = None,
+                 slo_seconds: Optional[Dict[int, float]] = None, min_samples: int = 5,
+                 duration_quantile: float = 0.9, memory_headroom: float = 1.25,
+                 timeout_factor: float = 2.0, cache_ttl: float = 60.0, prune_interval: float = 86400.0):
+        self.store = store or PlacementStatsStore(Path(os.environ.get('PLACEMENT_STATS_DB', STATS_DB)))
+        self.pricing = pricing or load_pricing()
+        self.slo_seconds = dict(DEFAULT_LATENCY_SLO_SECONDS)
+        configured_slo = self.pricing.get('latency_slo_seconds', {})
+        self.slo_seconds.update({int(priority): seconds for priority, seconds in configured_slo.items()})
+        if slo_seconds:
+            self.slo_seconds.update(slo_seconds)
+        self.min_samples = min_samples
+        self.duration_quantile = duration_quantile
+        self.memory_headroom = memory_headroom
+        self.timeout_factor = timeout_factor
+        self.cache_ttl = cache_ttl
+        self.prune_interval = prune_interval
+        self._cache: Dict[Tuple[str, str], Tuple[float, Optional[RuntimePrediction]]] = {}
+        self._last_prune = 0.0
+        self._lock = threading.Lock()
+
+    def record_run(self, agent_type: str, features: str, duration_seconds: float, **details) -> int:
+        """Store one finished run and drop the cached prediction for its bucket"""
+        with self._lock:
+            self._cache.pop((agent_type, features), None)
+        return self.store.record(agent_type, features, duration_seconds, **details)
+
+    def prune_history(self):
+        """Drop old run history from the store, at most once per prune_interval"""
+        now = time.time()
+        with self._lock:
+            if now - self._last_prune < self.prune_interval:
+                return
+            self._last_prune = now
+        try:
+            removed = self.store.prune()
+            if removed:
+                logger.info(f"Pruned {removed} old placement runs")
+        except sqlite3.Error as e:
+            logger.warning(f"Could not prune placement history: {e}")
+
+    def predict(self, agent_type: str, features: str) -> Optional[RuntimePrediction]:
+        """Runtime and memory prediction from the feature bucket, else the whole agent type"""
+        key = (agent_type, features)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and time.time() - cached[0] < self.cache_ttl:
+                return cached[1]
+
+        prediction = None
+        for basis, bucket in (('features', features), ('agent_type', None)):
+            rows = self.store.recent(agent_type, bucket)
+            if len(rows) >= self.min_samples:
+                durations = [row[0] for row in rows]
+                memory = [row[1] for row in rows if row[1]]
+                cpu = [row[2] / row[0] for row in rows if row[2] and row[0] > 0]
+                prediction = RuntimePrediction(
+                    duration_seconds=quantile(durations, self.duration_quantile),
+                    duration_max_seconds=max(durations),
+                    peak_memory_mb=quantile(memory, 0.95) if memory else None,
+                    vcpus=quantile(cpu, 0.9) if cpu else None,
+                    samples=len(rows),
+                    basis=basis
+                )
+                break
+
+        with self._lock:
+            self._cache[key] = (time.time(), prediction)
+        return prediction
+
+    def _estimate(self, target: str, duration: float, memory_mb: int, cpu_units: int) -> Tuple[float, float]:
+        """(cost in USD, completion latency in seconds) of one run on a target"""
+        prices = self.pricing[target]
+        latency = prices.get('startup_seconds', 0) + duration
+        if target == 'lambda':
+            cost = memory_mb / 1024 * duration * prices['gb_second'] + prices.get('request', 0)
+            return cost, latency
+        billed = max(prices.get('min_billed_seconds', 60), prices.get('startup_seconds', 0) + duration)
+        hourly = cpu_units / 1024 * prices['vcpu_hour'] + memory_mb / 1024 * prices['gb_hour']
+        cost = hourly * billed / 3600
+        interruptions = prices.get('interruptions_per_hour', 0) * billed / 3600
+        # An interrupted spot run is retried from the start
+        return cost * (1 + interruptions), latency * (1 + interruptions)
+
+    def place(self, agent_type: str, features: str, priority: int, current: Dict[str, Any]) -> Optional[PlacementDecision]:
+        """Cheapest target meeting the priority's SLO, or None without enough history
+
+        ``current`` is the static assignment (compute_type, memory_mb, cpu_units,
+        timeout_minutes); when no target meets the SLO the fastest one is chosen.
+        """
+        self.prune_history()
+        prediction = self.predict(agent_type, features)
+        if prediction is None:
+            return None
+
+        duration = prediction.duration_seconds
+        memory_needed = (prediction.peak_memory_mb or current['memory_mb'] / self.memory_headroom) * self.memory_headroom
+        min_cpu = 256
+        if prediction.vcpus:
+            min_cpu = max(256, min((cpu for cpu in FARGATE_SIZES if cpu / 1024 >= prediction.vcpus * 1.1),
+                                   default=4096))
+        slo = self.slo_seconds.get(priority, max(self.slo_seconds.values()))
+        timeout_seconds = max(60.0, prediction.duration_max_seconds * self.timeout_factor)
+
+        candidates = {}
+        for target in ('lambda', 'fargate', 'batch'):
+            if target not in self.pricing:
+                continue
+            prices = self.pricing[target]
+            if target == 'lambda':
+                # Lambda CPU scales with memory: 1769 MB buys one vCPU
+                memory = max(memory_needed, (prediction.vcpus or 0) * 1769, prices.get('min_memory_mb', 128))
+                memory = int(math.ceil(memory / 64) * 64)
+                # Skip Lambda unless the slowest observed run fits its hard limit with some margin
+                if (memory > prices.get('max_memory_mb', 10240) or
+                        prediction.duration_max_seconds * 1.2 > prices.get('max_seconds', 900)):
+                    continue
+                cpu = current['cpu_units']
+            else:
+                cpu, memory = fargate_size(memory_needed, min_cpu)
+            cost, latency = self._estimate(target, duration, memory, cpu)
+            candidates[target] = {'cost': cost, 'latency_seconds': latency, 'memory_mb': memory, 'cpu_units': cpu}
+
+        if not candidates:
+            return None
+        within_slo = {target: c for target, c in candidates.items() if c['latency_seconds'] <= slo}
+        if within_slo:
+            target = min(within_slo, key=lambda t: (within_slo[t]['cost'], within_slo[t]['latency_seconds']))
+        else:
+            target = min(candidates, key=lambda t: candidates[t]['latency_seconds'])
+        chosen = candidates[target]
+
+        timeout_minutes = int(math.ceil(timeout_seconds / 60))
+        if target == 'lambda':
+            timeout_minutes = min(timeout_minutes, int(self.pricing['lambda'].get('max_seconds', 900) // 60))
+
+        return PlacementDecision(
+            compute_type=target,
+            memory_mb=int(chosen['memory_mb']),
+            cpu_units=int(chosen['cpu_units']),
+            timeout_minutes=timeout_minutes,
+            estimated_cost=chosen['cost'],
+            estimated_latency_seconds=chosen['latency_seconds'],
+            slo_seconds=slo,
+            meets_slo=bool(within_slo),
+            prediction=prediction,
+            candidates=candidates
+        )
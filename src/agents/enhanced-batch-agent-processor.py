@@ -4,6 +4,10 @@ Enhanced AWS Batch Agent Processor
 ==================================
 Improved version that integrates with the manually edited agents
 Runs in Docker container on AWS Batch/Fargate
+
+Single-issue mode (default) processes the issue named by the environment.
+Worker mode (--worker or WORKER_MODE=1) stays up, loads each agent once and
+processes issues claimed from a local SQLite work queue.
 """
 
 import os
@@ -14,12 +18,39 @@ import requests
 import subprocess
 import importlib.util
 import time
+import signal
+import socket
+import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, List, Tuple
 import traceback
 import logging
 
+sys.path.append(str(Path(__file__).parent))
+try:
+    from agent_work_queue import AgentWorkQueue
+    WORK_QUEUE_AVAILABLE = True
+except ImportError:
+    WORK_QUEUE_AVAILABLE = False
+
+try:
+    from agent_registry import get_registry
+    REGISTRY_AVAILABLE = True
+except ImportError:
+    REGISTRY_AVAILABLE = False
+
+try:
+    from compute_placement import PlacementStatsStore, issue_features
+    PLACEMENT_AVAILABLE = True
+except ImportError:
+    PLACEMENT_AVAILABLE = False
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -35,22 +66,122 @@ AGENT_TYPE = os.environ.get('AGENT_TYPE')
 AGENT_NAME = os.environ.get('AGENT_NAME')
 AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
 
+# Batch array jobs from the dispatcher list all their issues in ISSUE_BATCH;
+# each child processes the entry at its array index
+ISSUE_BATCH = os.environ.get('ISSUE_BATCH')
+ARRAY_INDEX = os.environ.get('AWS_BATCH_JOB_ARRAY_INDEX')
+if ISSUE_BATCH and ARRAY_INDEX is not None:
+    GITHUB_REPO, _batch_issue_number = json.loads(ISSUE_BATCH)[int(ARRAY_INDEX)]
+    ISSUE_NUMBER = str(_batch_issue_number)
+
+# Worker mode settings
+WORKER_QUEUE = os.environ.get('WORKER_QUEUE', 'batch_issues')
+WORKER_QUEUE_DIR = os.environ.get('WORKER_QUEUE_DIR', 'work_queues')
+WORKER_RESULTS_FILE = os.environ.get('WORKER_RESULTS_FILE', '/tmp/agent-results.jsonl')
+
+# Run durations and memory feed the dispatcher's compute placement when set (the dispatcher
+# passes its own PLACEMENT_STATS_DB, a path on storage it shares with the compute targets)
+PLACEMENT_STATS_DB = os.environ.get('PLACEMENT_STATS_DB')
+COMPUTE_TYPE = os.environ.get('COMPUTE_TYPE')
+_placement_store = None
+
+
+def resource_usage() -> Dict[str, float]:
+    """CPU seconds used and peak RSS of this process so far (the peak never goes down)"""
+    if resource is None:
+        return {}
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    peak_kb = usage.ru_maxrss / 1024 if sys.platform == 'darwin' else usage.ru_maxrss  # bytes on macOS
+    return {'cpu_seconds': usage.ru_utime + usage.ru_stime, 'peak_memory_mb': peak_kb / 1024}
+
+
+def record_placement_stats(agent_type: str, issue_data: Optional[Dict[str, Any]], result: Dict[str, Any]):
+    """Add a finished run to the placement stats store (when PLACEMENT_STATS_DB is set)"""
+    global _placement_store
+    if not PLACEMENT_STATS_DB or not PLACEMENT_AVAILABLE or not issue_data:
+        return
+    try:
+        if _placement_store is None:
+            _placement_store = PlacementStatsStore(Path(PLACEMENT_STATS_DB))
+        features = issue_features(issue_data.get('title', ''), issue_data.get('body') or '',
+                                  [label['name'] for label in issue_data.get('labels', [])])
+        _placement_store.record(
+            agent_type, features, result.get('processing_time', 0),
+            peak_memory_mb=result.get('peak_memory_mb'),
+            cpu_seconds=result.get('cpu_seconds'),
+            compute_type=COMPUTE_TYPE,
+            succeeded=result.get('status') in ['success', 'fallback_success']
+        )
+    except Exception as e:
+        logger.warning(f"Could not record placement stats: {e}")
+
+# Agent mapping - matches the manually edited agents
+AGENT_SCRIPTS = {
+    'developer': 'ai-developer-agent.py',
+    'development': 'ai-developer-agent.py',
+    'architect': 'ai-architect-agent.py',
+    'architecture': 'ai-architect-agent.py',
+    'qa': 'ai-qa-agent.py',
+    'quality_assurance': 'ai-qa-agent.py',
+    'devops': 'ai-devops-agent.py',
+    'manager': 'ai-manager-agent.py',
+    'management': 'ai-manager-agent.py',
+    'support': 'ai-support-agent.py',
+    'security': 'ai-security-agent.py',
+    'analytics': 'ai-analytics-agent.py',
+    'finance': 'ai-finance-agent.py',
+    'operations': 'ai-operations-agent.py',
+    'marketing': 'ai-marketing-agent.py',
+    'sales': 'ai-sales-agent.py',
+    'customer_success': 'ai-customer-success-agent.py',
+    'customer-success': 'ai-customer-success-agent.py'
+}
+
+# Exact class names from the manually edited agent files
+SPECIFIC_AGENT_CLASSES = {
+    'developer': 'AIDeveloperAgent',
+    'development': 'AIDeveloperAgent',
+    'architect': 'AIArchitectAgent',
+    'architecture': 'AIArchitectAgent',
+    'qa': 'AIQAAgent',
+    'quality_assurance': 'AIQAAgent',
+    'devops': 'AIDevOpsAgent',
+    'manager': 'AIManagerAgent',
+    'management': 'AIManagerAgent'
+}
+
 class EnhancedBatchAgentProcessor:
-    """Enhanced processor for running agents in containers"""
+    """Enhanced processor for running agents in containers
     
-    def __init__(self):
-        # Validate required environment variables
-        required_vars = ['GITHUB_TOKEN', 'GITHUB_REPO', 'ISSUE_NUMBER', 'AGENT_TYPE']
-        missing_vars = [var for var in required_vars if not os.environ.get(var)]
+    Without arguments the issue comes from the environment (one issue per
+    container run). Worker mode passes the issue explicitly together with a
+    shared AgentCache and HTTP session.
+    """
+    
+    def __init__(self, repo: str = None, issue_number: int = None, agent_type: str = None,
+                 agent_name: str = None, agent_cache: 'AgentCache' = None, http=None,
+                 measure_peak_memory: bool = True):
+        # Validate required settings (explicit arguments override the environment)
+        settings = {
+            'GITHUB_TOKEN': GITHUB_TOKEN,
+            'GITHUB_REPO': repo or GITHUB_REPO,
+            'ISSUE_NUMBER': issue_number or ISSUE_NUMBER,
+            'AGENT_TYPE': agent_type or AGENT_TYPE
+        }
+        missing_vars = [var for var, value in settings.items() if not value]
         
         if missing_vars:
             raise ValueError(f"Missing required environment variables: {missing_vars}")
         
         self.github_token = GITHUB_TOKEN
-        self.repo = GITHUB_REPO
-        self.issue_number = int(ISSUE_NUMBER)
-        self.agent_type = AGENT_TYPE
-        self.agent_name = AGENT_NAME or f"ai-{AGENT_TYPE}-agent"
+        self.repo = settings['GITHUB_REPO']
+        self.issue_number = int(settings['ISSUE_NUMBER'])
+        self.agent_type = settings['AGENT_TYPE']
+        self.agent_name = agent_name or (None if agent_type else AGENT_NAME) or f"ai-{self.agent_type}-agent"
+        self.agent_cache = agent_cache
+        self.http = http or requests
+        # The process-wide peak RSS is only this run's peak when the process runs one issue
+        self.measure_peak_memory = measure_peak_memory
         
         # GitHub API setup
         self.github_headers = {
@@ -59,29 +190,11 @@ class EnhancedBatchAgentProcessor:
             'Content-Type': 'application/json'
         }
         
-        # Agent mapping - matches the manually edited agents
-        self.agent_scripts = {
-            'developer': 'ai-developer-agent.py',
-            'development': 'ai-developer-agent.py',
-            'architect': 'ai-architect-agent.py',
-            'architecture': 'ai-architect-agent.py',
-            'qa': 'ai-qa-agent.py',
-            'quality_assurance': 'ai-qa-agent.py',
-            'devops': 'ai-devops-agent.py',
-            'manager': 'ai-manager-agent.py',
-            'management': 'ai-manager-agent.py',
-            'support': 'ai-support-agent.py',
-            'security': 'ai-security-agent.py',
-            'analytics': 'ai-analytics-agent.py',
-            'finance': 'ai-finance-agent.py',
-            'operations': 'ai-operations-agent.py',
-            'marketing': 'ai-marketing-agent.py',
-            'sales': 'ai-sales-agent.py',
-            'customer_success': 'ai-customer-success-agent.py',
-            'customer-success': 'ai-customer-success-agent.py'
-        }
+        self.agent_scripts = AGENT_SCRIPTS
         
         self.start_time = datetime.now()
+        self.start_usage = resource_usage()
+        self.issue_data = None
         
         logger.info(f"Enhanced Batch Agent Processor initialized")
         logger.info(f"Issue: #{self.issue_number} in {self.repo}")
@@ -91,7 +204,7 @@ class EnhancedBatchAgentProcessor:
         """Fetch issue data from GitHub API"""
         try:
             url = f"https://api.github.com/repos/{self.repo}/issues/{self.issue_number}"
-            response = requests.get(url, headers=self.github_headers)
+            response = self.http.get(url, headers=self.github_headers)
             
             if response.status_code == 200:
                 issue_data = response.json()
@@ -124,7 +237,7 @@ class EnhancedBatchAgentProcessor:
             
             # Post comment
             url = f"https://api.github.com/repos/{self.repo}/issues/{self.issue_number}/comments"
-            response = requests.post(
+            response = self.http.post(
                 url,
                 headers=self.github_headers,
                 json={'body': comment_body}
@@ -149,7 +262,7 @@ class EnhancedBatchAgentProcessor:
         """Add labels to the issue"""
         try:
             url = f"https://api.github.com/repos/{self.repo}/issues/{self.issue_number}/labels"
-            response = requests.post(
+            response = self.http.post(
                 url,
                 headers=self.github_headers,
                 json={'labels': labels}
@@ -168,7 +281,7 @@ class EnhancedBatchAgentProcessor:
         try:
             for label in labels:
                 url = f"https://api.github.com/repos/{self.repo}/issues/{self.issue_number}/labels/{label}"
-                response = requests.delete(url, headers=self.github_headers)
+                response = self.http.delete(url, headers=self.github_headers)
                 
                 if response.status_code == 200:
                     logger.info(f"Removed label: {label}")
@@ -178,7 +291,8 @@ class EnhancedBatchAgentProcessor:
         except Exception as e:
             logger.warning(f"Error removing labels: {e}")
     
-    def load_agent_module(self, agent_script: str):
+    @staticmethod
+    def load_agent_module(agent_script: str):
         """Dynamically load the agent module"""
         try:
             agent_path = Path(agent_script)
@@ -194,7 +308,8 @@ class EnhancedBatchAgentProcessor:
                     raise FileNotFoundError(f"Agent script not found: {agent_script}")
             
             # Load the module dynamically
-            spec = importlib.util.spec_from_file_location("agent_module", agent_path)
+            module_name = f"agent_module_{agent_path.stem.replace('-', '_')}"
+            spec = importlib.util.spec_from_file_location(module_name, agent_path)
             if spec is None:
                 raise ImportError(f"Could not load spec for {agent_path}")
             
@@ -208,33 +323,22 @@ class EnhancedBatchAgentProcessor:
             logger.error(f"Error loading agent module {agent_script}: {e}")
             raise
     
-    def find_agent_class(self, agent_module):
+    @staticmethod
+    def find_agent_class(agent_module, agent_type: str):
         """Find the main agent class in the module"""
         try:
             # Common agent class name patterns
             class_patterns = [
-                f"AI{self.agent_type.title()}Agent",
-                f"AI{self.agent_type.title().replace('_', '')}Agent",
-                f"{self.agent_type.title()}Agent",
+                f"AI{agent_type.title()}Agent",
+                f"AI{agent_type.title().replace('_', '')}Agent",
+                f"{agent_type.title()}Agent",
                 "AIAgent",
                 "Agent"
             ]
             
             # Also try the exact class names from the manually edited files
-            specific_classes = {
-                'developer': 'AIDeveloperAgent',
-                'development': 'AIDeveloperAgent',
-                'architect': 'AIArchitectAgent',
-                'architecture': 'AIArchitectAgent',
-                'qa': 'AIQAAgent',
-                'quality_assurance': 'AIQAAgent',
-                'devops': 'AIDevOpsAgent',
-                'manager': 'AIManagerAgent',
-                'management': 'AIManagerAgent'
-            }
-            
-            if self.agent_type in specific_classes:
-                class_patterns.insert(0, specific_classes[self.agent_type])
+            if agent_type in SPECIFIC_AGENT_CLASSES:
+                class_patterns.insert(0, SPECIFIC_AGENT_CLASSES[agent_type])
             
             # Search for the agent class
             for class_name in class_patterns:
@@ -261,19 +365,9 @@ class EnhancedBatchAgentProcessor:
     def process_with_agent(self, issue_data: Dict[str, Any]) -> Dict[str, Any]:
         """Process the issue using the appropriate agent"""
         try:
-            # Get the agent script path
-            agent_script = self.agent_scripts.get(self.agent_type)
-            if not agent_script:
-                raise ValueError(f"No agent script found for type: {self.agent_type}")
-            
-            logger.info(f"Processing with agent script: {agent_script}")
-            
-            # Load the agent module
-            agent_module = self.load_agent_module(agent_script)
-            
-            # Find and instantiate the agent class
-            agent_class = self.find_agent_class(agent_module)
-            agent_instance = agent_class()
+            # Load, find and instantiate the agent (cached across issues in worker mode)
+            cache = self.agent_cache or AgentCache(reuse_instances=False)
+            agent_module, agent_instance = cache.get(self.agent_type)
             
             # Prepare work item for the agent (matching the format from orchestrator)
             work_item = {
@@ -411,6 +505,17 @@ class EnhancedBatchAgentProcessor:
         }
     
     def run(self) -> Dict[str, Any]:
+        """Process the issue; the result carries the run's CPU time and (single-issue mode) peak memory"""
+        result = self._process()
+        usage = resource_usage()
+        if usage:
+            result['cpu_seconds'] = usage['cpu_seconds'] - self.start_usage.get('cpu_seconds', 0)
+            if self.measure_peak_memory:
+                result['peak_memory_mb'] = usage['peak_memory_mb']
+        record_placement_stats(self.agent_type, self.issue_data, result)
+        return result
+    
+    def _process(self) -> Dict[str, Any]:
         """Main processing function"""
         try:
             # Update status to processing
@@ -422,7 +527,7 @@ class EnhancedBatchAgentProcessor:
             )
             
             # Get issue data
-            issue_data = self.get_issue_data()
+            issue_data = self.issue_data = self.get_issue_data()
             
             try:
                 # Try to process with the specific agent
@@ -485,8 +590,209 @@ class EnhancedBatchAgentProcessor:
                 'processing_time': (datetime.now() - self.start_time).total_seconds()
             }
 
+class AgentCache:
+    """Agent modules, classes and instances loaded once per agent type
+    
+    In worker mode the cold start (exec'ing the agent script and running its
+    constructor, which may build hubs, queues and API clients) is paid on the
+    first issue for each agent type and reused for every issue after it.
+    Agent types in the agent registry's manifest are loaded through it; the
+    search-path and class-name guessing is only a fallback for the rest.
+    """
+    
+    def __init__(self, reuse_instances: bool = True, registry=None):
+        self.reuse_instances = reuse_instances
+        self.registry = registry or (get_registry() if REGISTRY_AVAILABLE else None)
+        self.modules = {}  # agent script (or type) -> module
+        self.classes = {}  # agent type -> class
+        self.instances = {}  # agent type -> instance
+        self.load_times = {}  # agent type -> seconds spent loading and instantiating
+    
+    def get(self, agent_type: str) -> Tuple[Any, Any]:
+        """(module, instance) for an agent type, loading it on first use"""
+        agent_script = AGENT_SCRIPTS.get(agent_type)
+        in_registry = self.registry is not None and self.registry.has(agent_type)
+        if not agent_script and not in_registry:
+            raise ValueError(f"No agent script found for type: {agent_type}")
+        
+        module_key = agent_script or agent_type
+        if agent_type in self.instances:
+            return self.modules[module_key], self.instances[agent_type]
+        
+        started = time.time()
+        module = self.modules.get(module_key)
+        if module is None and in_registry:
+            module = self.registry.load_module(agent_type)
+            self.classes[agent_type] = self.registry.get_class(agent_type)
+        elif module is None:
+            logger.info(f"Processing with agent script: {agent_script}")
+            module = EnhancedBatchAgentProcessor.load_agent_module(agent_script)
+        self.modules[module_key] = module
+        
+        if agent_type not in self.classes:
+            self.classes[agent_type] = EnhancedBatchAgentProcessor.find_agent_class(module, agent_type)
+        instance = self.classes[agent_type]()
+        
+        if self.reuse_instances:
+            self.instances[agent_type] = instance
+        self.load_times[agent_type] = self.load_times.get(agent_type, 0) + time.time() - started
+        return module, instance
+    
+    def preload(self, agent_types: List[str]) -> Dict[str, str]:
+        """Warm the cache; returns per-type errors (a failed type is retried on first use)"""
+        errors = {}
+        for agent_type in agent_types:
+            try:
+                self.get(agent_type)
+                logger.info(f"Preloaded {agent_type} agent in {self.load_times[agent_type]:.2f}s")
+            except Exception as e:
+                errors[agent_type] = str(e)
+                logger.warning(f"Could not preload {agent_type} agent: {e}")
+        return errors
+
+
+def enqueue_issue(queue: 'AgentWorkQueue', repo: str, issue_number: int, agent_type: str,
+                  agent_name: str = None, priority: str = 'medium') -> int:
+    """Add an issue to a worker queue; returns its queue id"""
+    return queue.enqueue({
+        'ticket_id': f"{repo}#{issue_number}",
+        'repo': repo,
+        'issue_number': int(issue_number),
+        'agent_type': agent_type,
+        'agent_name': agent_name,
+        'priority': priority
+    })
+
+
+class BatchAgentWorker:
+    """Long-lived worker that processes many issues with warm agents"""
+    
+    def __init__(self, queue: 'AgentWorkQueue', max_items: int = None,
+                 idle_exit_seconds: float = None, poll_interval: float = 5,
+                 results_file: str = WORKER_RESULTS_FILE):
+        self.queue = queue
+        self.max_items = max_items
+        self.idle_exit_seconds = idle_exit_seconds
+        self.poll_interval = poll_interval
+        self.results_file = results_file
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self.agent_cache = AgentCache()
+        self.http = requests.Session()  # keep-alive across issues
+        self.running = True
+        self.stats = {'processed': 0, 'succeeded': 0, 'failed': 0, 'processing_time': 0.0}
+    
+    def stop(self, *_):
+        logger.info("Worker stopping after the current issue")
+        self.running = False
+    
+    def process_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Process one queued issue with the shared agent cache"""
+        processor = EnhancedBatchAgentProcessor(
+            repo=item['repo'],
+            issue_number=item['issue_number'],
+            agent_type=item['agent_type'],
+            agent_name=item.get('agent_name'),
+            agent_cache=self.agent_cache,
+            http=self.http,
+            measure_peak_memory=False  # earlier issues and warm agents inflate the process peak
+        )
+        return processor.run()
+    
+    def run(self) -> Dict[str, Any]:
+        """Claim and process issues until stopped, max_items is reached or the queue stays idle"""
+        idle_since = time.time()
+        
+        while self.running and (self.max_items is None or self.stats['processed'] < self.max_items):
+            item = self.queue.claim(self.consumer)
+            if item is None:
+                if self.idle_exit_seconds is not None and time.time() - idle_since >= self.idle_exit_seconds:
+                    logger.info("Queue idle, worker exiting")
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            
+            try:
+                result = self.process_item(item)
+            except Exception as e:
+                # Processor.run reports its own failures; this is a bad queue item
+                logger.error(f"Error processing queue item {item.get('ticket_id')}: {e}")
+                result = {'status': 'error', 'error': str(e), 'processing_time': 0}
+            
+            # Failed issues were already reported on GitHub, so they aren't retried
+            self.queue.ack(item['queue_id'])
+            self._record(item, result)
+            idle_since = time.time()
+        
+        self.stats['agent_load_times'] = dict(self.agent_cache.load_times)
+        return self.stats
+    
+    def _record(self, item: Dict[str, Any], result: Dict[str, Any]):
+        self.stats['processed'] += 1
+        if result.get('status') in ['success', 'fallback_success']:
+            self.stats['succeeded'] += 1
+        else:
+            self.stats['failed'] += 1
+        self.stats['processing_time'] += result.get('processing_time', 0)
+        
+        logger.info(f"Processed {item['ticket_id']}: {result.get('status')} "
+                    f"({self.stats['processed']} issues this run)")
+        try:
+            with open(self.results_file, 'a') as f:
+                f.write(json.dumps({'ticket_id': item['ticket_id'], **result}, default=str) + '\n')
+        except OSError as e:
+            logger.warning(f"Could not write result for {item['ticket_id']}: {e}")
+
+
+def run_worker(args) -> int:
+    """Worker mode entry point"""
+    if not WORK_QUEUE_AVAILABLE:
+        logger.error("Worker mode needs agent_work_queue.py next to this script")
+        return 1
+    
+    queue = AgentWorkQueue(args.queue, queue_dir=Path(args.queue_dir))
+    worker = BatchAgentWorker(queue, max_items=args.max_items, idle_exit_seconds=args.idle_exit)
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    
+    if args.preload:
+        worker.agent_cache.preload(args.preload)
+        if worker.agent_cache.registry is not None:
+            logger.info("Agent import cost:\n" + worker.agent_cache.registry.format_import_report())
+    
+    stats = worker.run()
+    logger.info(f"Worker finished: {json.dumps(stats, default=str)}")
+    return 0 if stats['failed'] == 0 else 1
+
+
 def main():
     """Main entry point for container execution"""
+    parser = argparse.ArgumentParser(description='Enhanced Batch Agent Processor')
+    parser.add_argument('--worker', action='store_true', default=os.environ.get('WORKER_MODE') == '1',
+                        help='Stay up and process issues from the work queue')
+    parser.add_argument('--queue', default=WORKER_QUEUE, help='Work queue name')
+    parser.add_argument('--queue-dir', default=WORKER_QUEUE_DIR, help='Work queue directory')
+    parser.add_argument('--preload', nargs='*', default=None, metavar='AGENT_TYPE',
+                        help='Agent types to load before the first issue')
+    parser.add_argument('--max-items', type=int, default=None, help='Exit after this many issues')
+    parser.add_argument('--idle-exit', type=float, default=None,
+                        help='Exit after the queue has been empty for this many seconds')
+    parser.add_argument('--enqueue', nargs=3, metavar=('REPO', 'ISSUE_NUMBER', 'AGENT_TYPE'),
+                        help='Add an issue to the work queue and exit')
+    args = parser.parse_args()
+    
+    if args.enqueue:
+        if not WORK_QUEUE_AVAILABLE:
+            logger.error("Queueing needs agent_work_queue.py next to this script")
+            sys.exit(1)
+        repo, issue_number, agent_type = args.enqueue
+        queue_id = enqueue_issue(AgentWorkQueue(args.queue, queue_dir=Path(args.queue_dir)),
+                                 repo, int(issue_number), agent_type)
+        logger.info(f"Queued {repo}#{issue_number} for {agent_type} (queue id {queue_id})")
+        sys.exit(0)
+    
+    if args.worker:
+        sys.exit(run_worker(args))
+    
     try:
         logger.info("="*80)
         logger.info("ENHANCED BATCH AGENT PROCESSOR v2.0")
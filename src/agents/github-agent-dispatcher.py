@@ -9,6 +9,15 @@ This replaces where Opus left off and creates the complete workflow:
 2. Analyzes issue content to determine agent type
 3. Triggers AWS Batch job or Fargate task with agent container
 4. Agent processes issue and updates GitHub with results
+
+During issue storms the optional DispatchPipeline buffers routed events,
+coalesces them per compute target and submits them in bulk (Batch array
+jobs, parallel Lambda invokes and Fargate tasks) with retry and backoff.
+
+Compute placement overrides each agent's static target once there is run
+history: the cheapest of Lambda, Fargate and Batch (Fargate Spot) that
+finishes within the priority's latency SLO, with memory and CPU right-sized
+from observed usage.
 """
 
 import json
@@ -16,16 +25,32 @@ import os
 import sys
 import logging
 import asyncio
+import random
+import threading
+import time
 import boto3
 import requests
+from botocore.config import Config
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict, defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, replace
 from pathlib import Path
 import subprocess
 import tempfile
 import hashlib
 
+sys.path.append(str(Path(__file__).parent))
+from issue_routing import IssueRoutingEngine
+
+try:
+    from compute_placement import PlacementEngine, STATS_JOURNAL_MODE, issue_features
+    PLACEMENT_AVAILABLE = True
+except ImportError:
+    PLACEMENT_AVAILABLE = False
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -57,6 +82,45 @@ class AgentAssignment:
     memory_mb: int
     cpu_units: int
 
+class TransientDispatchError(Exception):
+    """A submission that AWS accepted but could not place yet (e.g. no Fargate capacity)"""
+
+class AWSClientPool:
+    """One boto3 session and one client per service, shared by every dispatch thread
+    
+    Clients are created lazily with a connection pool sized for the pipeline's
+    concurrency. AWS_ENDPOINT_URL points all clients at a local stand-in
+    (moto server, LocalStack) for testing.
+    """
+    
+    def __init__(self, region: str, max_pool_connections: int = 32,
+                 endpoint_url: str = None, session=None):
+        self.region = region
+        self.session = session or boto3.session.Session(region_name=region)
+        self.endpoint_url = endpoint_url or os.environ.get('AWS_ENDPOINT_URL')
+        self.config = Config(
+            region_name=region,
+            max_pool_connections=max_pool_connections,
+            # The only retry layer for throttling, 5xx and connection errors (jittered backoff)
+            retries={'max_attempts': 5, 'mode': 'standard'}
+        )
+        self._clients: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def client(self, service: str):
+        """Shared client for a service (boto3 clients are thread-safe, sessions are not)"""
+        client = self._clients.get(service)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(service)
+                if client is None:
+                    kwargs = {'config': self.config}
+                    if self.endpoint_url:
+                        kwargs['endpoint_url'] = self.endpoint_url
+                    client = self.session.client(service, **kwargs)
+                    self._clients[service] = client
+        return client
+
 class GitHubAgentDispatcher:
     """Main dispatcher for routing GitHub issues to AI agents"""
     
@@ -64,11 +128,14 @@ class GitHubAgentDispatcher:
         self.github_token = os.environ.get('GITHUB_TOKEN')
         self.aws_region = os.environ.get('AWS_REGION', 'us-east-1')
         
-        # AWS clients
-        self.batch_client = boto3.client('batch', region_name=self.aws_region)
-        self.ecs_client = boto3.client('ecs', region_name=self.aws_region)
-        self.lambda_client = boto3.client('lambda', region_name=self.aws_region)
-        self.ecr_client = boto3.client('ecr', region_name=self.aws_region)
+        self.dispatch_concurrency = int(os.environ.get('DISPATCH_CONCURRENCY', '8'))
+        
+        # AWS clients (pooled and shared with the dispatch pipeline)
+        self.aws = AWSClientPool(self.aws_region, max_pool_connections=self.dispatch_concurrency * 2)
+        self.batch_client = self.aws.client('batch')
+        self.ecs_client = self.aws.client('ecs')
+        self.lambda_client = self.aws.client('lambda')
+        self.ecr_client = self.aws.client('ecr')
         
         # GitHub API headers
         self.github_headers = {
@@ -77,8 +144,23 @@ class GitHubAgentDispatcher:
             'Content-Type': 'application/json'
         }
         
+        # Keep-alive GitHub session sized for concurrent dispatch
+        self.http = requests.Session()
+        self.http.mount('https://', HTTPAdapter(pool_maxsize=self.dispatch_concurrency * 2))
+        
         # Agent assignment rules
         self.agent_assignments = self._initialize_agent_assignments()
+        self._initialize_routing()
+        
+        # Cost- and latency-aware placement (COMPUTE_PLACEMENT=0 keeps the static targets). Runs are
+        # recorded by the processors themselves, so PLACEMENT_STATS_DB must be a path on storage that
+        # every compute target mounts too; it is passed on to the Batch and Fargate jobs this
+        # dispatcher starts. Lambda invocations record nothing (the Lambda payload carries no stats
+        # path), so Lambda placements are predicted from the agent's Batch and Fargate runs.
+        self.placement = None
+        self.placement_stats_db = os.environ.get('PLACEMENT_STATS_DB')
+        if PLACEMENT_AVAILABLE and self.placement_stats_db and os.environ.get('COMPUTE_PLACEMENT', '1') != '0':
+            self.placement = PlacementEngine()
         
         # AWS infrastructure configuration
         self.aws_config = {
@@ -87,11 +169,68 @@ class GitHubAgentDispatcher:
             'fargate_cluster': 'ai-agents-cluster',
             'fargate_task_definition': 'ai-agent-task',
             'lambda_function_name': 'ai-agent-processor',
-            'ecr_registry': f"{boto3.Session().get_credentials().access_key}.dkr.ecr.{self.aws_region}.amazonaws.com"
+            'ecr_registry': f"{self.aws.session.get_credentials().access_key}.dkr.ecr.{self.aws_region}.amazonaws.com"
         }
         
+        # Bulk dispatch pipeline (off by default: events are deployed one at a time)
+        self.pipeline = None
+        if os.environ.get('DISPATCH_PIPELINE') == '1':
+            self.enable_pipeline()
+        
         logger.info("GitHub Agent Dispatcher initialized")
     
+    def _initialize_routing(self):
+        """Compile the issue routing tables once"""
+        # Priority 1: Explicit labels (exact match)
+        self.label_mapping = {
+            'bug': 'developer',
+            'feature': 'developer', 
+            'enhancement': 'developer',
+            'documentation': 'developer',
+            'architecture': 'architect',
+            'design': 'architect',
+            'testing': 'qa',
+            'qa': 'qa',
+            'quality': 'qa',
+            'deployment': 'devops',
+            'infrastructure': 'devops',
+            'devops': 'devops',
+            'ci/cd': 'devops',
+            'security': 'security',
+            'vulnerability': 'security',
+            'performance': 'operations',
+            'monitoring': 'operations',
+            'support': 'support',
+            'customer': 'customer-success',
+            'analytics': 'analytics',
+            'reporting': 'analytics',
+            'finance': 'finance',
+            'cost': 'finance',
+            'marketing': 'marketing',
+            'sales': 'sales',
+            'management': 'manager',
+            'strategy': 'manager'
+        }
+        
+        # Priority 2 and 3: title patterns and body keywords (substring match, first agent wins)
+        self.routing_engine = IssueRoutingEngine({
+            'title': {
+                'developer': ['fix', 'implement', 'add', 'create', 'build', 'develop', 'code'],
+                'architect': ['design', 'architecture', 'structure', 'pattern', 'framework'],
+                'qa': ['test', 'verify', 'validate', 'check', 'quality'],
+                'devops': ['deploy', 'infrastructure', 'pipeline', 'ci/cd', 'aws'],
+                'security': ['secure', 'vulnerability', 'auth', 'permission', 'encrypt'],
+                'support': ['help', 'issue', 'problem', 'error', 'broken'],
+                'manager': ['strategy', 'plan', 'roadmap', 'priority', 'decision']
+            },
+            'body': {
+                'qa': ['test', 'testing', 'qa', 'quality'],
+                'devops': ['deploy', 'deployment', 'infrastructure'],
+                'security': ['security', 'vulnerability', 'attack'],
+                'support': ['customer', 'user', 'support']
+            }
+        })
+    
     def _initialize_agent_assignments(self) -> Dict[str, AgentAssignment]:
         """Initialize agent assignment rules"""
         
@@ -234,91 +373,107 @@ class GitHubAgentDispatcher:
         }
     
     def analyze_issue_for_agent(self, issue_event: IssueEvent) -> AgentAssignment:
-        """Analyze GitHub issue to determine which agent should handle it"""
+        """Analyze GitHub issue to determine which agent should handle it, and where"""
+        return self.place_assignment(issue_event, self.route_issue(issue_event))
+    
+    def route_issue(self, issue_event: IssueEvent) -> AgentAssignment:
+        """Static assignment for the agent type the issue routes to"""
         
         title = issue_event.issue_title.lower()
         body = issue_event.issue_body.lower()
         labels = [label.lower() for label in issue_event.issue_labels]
         
         # Priority 1: Explicit labels
-        label_mapping = {
-            'bug': 'developer',
-            'feature': 'developer', 
-            'enhancement': 'developer',
-            'documentation': 'developer',
-            'architecture': 'architect',
-            'design': 'architect',
-            'testing': 'qa',
-            'qa': 'qa',
-            'quality': 'qa',
-            'deployment': 'devops',
-            'infrastructure': 'devops',
-            'devops': 'devops',
-            'ci/cd': 'devops',
-            'security': 'security',
-            'vulnerability': 'security',
-            'performance': 'operations',
-            'monitoring': 'operations',
-            'support': 'support',
-            'customer': 'customer-success',
-            'analytics': 'analytics',
-            'reporting': 'analytics',
-            'finance': 'finance',
-            'cost': 'finance',
-            'marketing': 'marketing',
-            'sales': 'sales',
-            'management': 'manager',
-            'strategy': 'manager'
-        }
-        
-        # Check labels first
         for label in labels:
-            if label in label_mapping:
-                return self.agent_assignments[label_mapping[label]]
+            if label in self.label_mapping:
+                return self.agent_assignments[self.label_mapping[label]]
         
         # Priority 2: Title patterns
-        title_patterns = {
-            'developer': ['fix', 'implement', 'add', 'create', 'build', 'develop', 'code'],
-            'architect': ['design', 'architecture', 'structure', 'pattern', 'framework'],
-            'qa': ['test', 'verify', 'validate', 'check', 'quality'],
-            'devops': ['deploy', 'infrastructure', 'pipeline', 'ci/cd', 'aws'],
-            'security': ['secure', 'vulnerability', 'auth', 'permission', 'encrypt'],
-            'support': ['help', 'issue', 'problem', 'error', 'broken'],
-            'manager': ['strategy', 'plan', 'roadmap', 'priority', 'decision']
-        }
-        
-        for agent_type, patterns in title_patterns.items():
-            if any(pattern in title for pattern in patterns):
-                return self.agent_assignments[agent_type]
+        agent_type = self.routing_engine.analyze(title).first('title')
+        if agent_type:
+            return self.agent_assignments[agent_type]
         
         # Priority 3: Body content analysis
-        if any(keyword in body for keyword in ['test', 'testing', 'qa', 'quality']):
-            return self.agent_assignments['qa']
-        elif any(keyword in body for keyword in ['deploy', 'deployment', 'infrastructure']):
-            return self.agent_assignments['devops']
-        elif any(keyword in body for keyword in ['security', 'vulnerability', 'attack']):
-            return self.agent_assignments['security']
-        elif any(keyword in body for keyword in ['customer', 'user', 'support']):
-            return self.agent_assignments['support']
+        agent_type = self.routing_engine.analyze(body).first('body')
+        if agent_type:
+            return self.agent_assignments[agent_type]
         
         # Default: Developer agent for general issues
         return self.agent_assignments['developer']
     
+    def place_assignment(self, issue_event: IssueEvent, agent_assignment: AgentAssignment) -> AgentAssignment:
+        """Move the assignment to the cheapest compute target that meets its SLO
+        
+        Keeps the static assignment until the placement engine has enough run
+        history for the agent type.
+        """
+        if self.placement is None:
+            return agent_assignment
+        
+        try:
+            features = issue_features(issue_event.issue_title, issue_event.issue_body, issue_event.issue_labels)
+            decision = self.placement.place(agent_assignment.agent_type, features, agent_assignment.priority, {
+                'compute_type': agent_assignment.compute_type,
+                'memory_mb': agent_assignment.memory_mb,
+                'cpu_units': agent_assignment.cpu_units,
+                'timeout_minutes': agent_assignment.timeout_minutes
+            })
+        except Exception as e:
+            logger.warning(f"Compute placement failed, using static assignment: {e}")
+            return agent_assignment
+        
+        if decision is None:
+            return agent_assignment
+        
+        if not decision.meets_slo:
+            logger.warning(f"No target meets the {decision.slo_seconds:.0f}s SLO for {agent_assignment.agent_type}; "
+                           f"using the fastest ({decision.compute_type})")
+        logger.info(f"Placed #{issue_event.issue_number} ({agent_assignment.agent_type}, {features}) on "
+                    f"{decision.compute_type} {decision.cpu_units}cpu/{decision.memory_mb}MB: "
+                    f"~{decision.estimated_latency_seconds:.0f}s, ${decision.estimated_cost:.5f}")
+        return replace(
+            agent_assignment,
+            compute_type=decision.compute_type,
+            memory_mb=decision.memory_mb,
+            cpu_units=decision.cpu_units,
+            timeout_minutes=decision.timeout_minutes
+        )
+    
+    def _job_environment(self, agent_assignment: AgentAssignment) -> List[Dict[str, str]]:
+        """Environment of Batch and Fargate processors, so they can report their runs to the placement stats"""
+        environment = [{'name': 'COMPUTE_TYPE', 'value': agent_assignment.compute_type}]
+        if self.placement is not None:
+            environment.append({'name': 'PLACEMENT_STATS_DB', 'value': self.placement_stats_db})
+            environment.append({'name': 'PLACEMENT_STATS_JOURNAL_MODE', 'value': STATS_JOURNAL_MODE})
+        return environment
+    
+    def _parse_issue_event(self, webhook_payload: Dict[str, Any]) -> IssueEvent:
+        """Build an IssueEvent from a webhook payload"""
+        return IssueEvent(
+            action=webhook_payload['action'],
+            issue_number=webhook_payload['issue']['number'],
+            issue_title=webhook_payload['issue']['title'],
+            issue_body=webhook_payload['issue'].get('body') or '',
+            issue_labels=[label['name'] for label in webhook_payload['issue'].get('labels', [])],
+            repository=webhook_payload['repository']['full_name'],
+            sender=webhook_payload['sender']['login'],
+            timestamp=datetime.now().isoformat()
+        )
+    
+    def enable_pipeline(self, **options) -> 'DispatchPipeline':
+        """Buffer events from process_issue_event and dispatch them in bulk in the background"""
+        if self.pipeline is None:
+            options.setdefault('max_concurrency', self.dispatch_concurrency)
+            self.pipeline = DispatchPipeline(self, **options)
+            self.pipeline.start()
+        return self.pipeline
+    
     def process_issue_event(self, webhook_payload: Dict[str, Any]) -> Dict[str, Any]:
         """Process GitHub webhook payload"""
         
         try:
             # Parse the webhook payload
-            issue_event = IssueEvent(
-                action=webhook_payload['action'],
-                issue_number=webhook_payload['issue']['number'],
-                issue_title=webhook_payload['issue']['title'],
-                issue_body=webhook_payload['issue'].get('body', ''),
-                issue_labels=[label['name'] for label in webhook_payload['issue'].get('labels', [])],
-                repository=webhook_payload['repository']['full_name'],
-                sender=webhook_payload['sender']['login'],
-                timestamp=datetime.now().isoformat()
-            )
+            issue_event = self._parse_issue_event(webhook_payload)
             
             logger.info(f"Processing issue #{issue_event.issue_number}: {issue_event.issue_title}")
             
@@ -332,6 +487,16 @@ class GitHubAgentDispatcher:
             
             logger.info(f"Assigned to agent: {agent_assignment.agent_name} ({agent_assignment.compute_type})")
             
+            if self.pipeline is not None:
+                # Assignment comment and deployment happen on the pipeline's next flush
+                return {
+                    'status': 'queued',
+                    'issue_number': issue_event.issue_number,
+                    'agent_assigned': agent_assignment.agent_name,
+                    'compute_type': agent_assignment.compute_type,
+                    'dispatch_key': self.pipeline.submit(issue_event, agent_assignment)
+                }
+            
             # Update GitHub issue with assignment
             self.update_issue_assignment(issue_event, agent_assignment)
             
@@ -350,6 +515,37 @@ class GitHubAgentDispatcher:
             logger.error(f"Error processing issue event: {e}")
             return {'status': 'error', 'error': str(e)}
     
+    def dispatch_many(self, webhook_payloads: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Route and dispatch a burst of issue events (e.g. a bulk import) in one pass
+        
+        Uses the running pipeline if there is one, otherwise a temporary one,
+        and flushes it before returning deployment results keyed by "owner/repo#N".
+        """
+        pipeline = self.pipeline or DispatchPipeline(self, max_concurrency=self.dispatch_concurrency)
+        ignored, errors, waiters = 0, {}, {}
+        
+        for payload in webhook_payloads:
+            try:
+                issue_event = self._parse_issue_event(payload)
+                if issue_event.action not in ['opened', 'reopened', 'labeled']:
+                    ignored += 1
+                    continue
+                waiter = Future()
+                key = pipeline.submit(issue_event, self.analyze_issue_for_agent(issue_event), waiter=waiter)
+                waiters[key] = waiter
+            except Exception as e:
+                errors[str(payload.get('issue', {}).get('number'))] = str(e)
+        
+        # The background flusher may already have dispatched part of the burst; flushing
+        # waits for it, after which every submitted event's waiter holds its result
+        pipeline.flush()
+        results = {key: waiter.result() for key, waiter in waiters.items() if waiter.done()}
+        if pipeline is not self.pipeline:
+            pipeline.shutdown()
+        
+        logger.info(f"Dispatched {len(results)} issues ({ignored} ignored, {len(errors)} unparseable)")
+        return {'results': results, 'ignored': ignored, 'errors': errors, 'stats': dict(pipeline.stats)}
+    
     def update_issue_assignment(self, issue_event: IssueEvent, agent_assignment: AgentAssignment):
         """Update GitHub issue with agent assignment"""
         
@@ -369,7 +565,7 @@ The AI agent will begin processing this issue shortly. Updates will be posted as
         
         # Post comment
         url = f"https://api.github.com/repos/{issue_event.repository}/issues/{issue_event.issue_number}/comments"
-        response = requests.post(
+        response = self.http.post(
             url,
             headers=self.github_headers,
             json={'body': comment_body}
@@ -384,7 +580,7 @@ The AI agent will begin processing this issue shortly. Updates will be posted as
         ]
         
         url = f"https://api.github.com/repos/{issue_event.repository}/issues/{issue_event.issue_number}/labels"
-        requests.post(
+        self.http.post(
             url,
             headers=self.github_headers,
             json={'labels': labels_to_add}
@@ -408,29 +604,8 @@ The AI agent will begin processing this issue shortly. Updates will be posted as
         """Deploy agent to AWS Lambda"""
         
         try:
-            # Create the payload for the Lambda function
-            payload = {
-                'github_token': self.github_token,
-                'issue_event': {
-                    'repository': issue_event.repository,
-                    'issue_number': issue_event.issue_number,
-                    'issue_title': issue_event.issue_title,
-                    'issue_body': issue_event.issue_body,
-                    'labels': issue_event.issue_labels
-                },
-                'agent_config': {
-                    'agent_name': agent_assignment.agent_name,
-                    'agent_type': agent_assignment.agent_type,
-                    'timeout_minutes': agent_assignment.timeout_minutes
-                }
-            }
-            
             # Invoke Lambda function
-            response = self.lambda_client.invoke(
-                FunctionName=self.aws_config['lambda_function_name'],
-                InvocationType='Event',  # Async execution
-                Payload=json.dumps(payload)
-            )
+            response = self.lambda_client.invoke(**self._lambda_request(issue_event, agent_assignment))
             
             logger.info(f"Lambda invoked for issue #{issue_event.issue_number}")
             
@@ -444,50 +619,37 @@ The AI agent will begin processing this issue shortly. Updates will be posted as
             logger.error(f"Lambda deployment failed: {e}")
             return {'platform': 'lambda', 'status': 'failed', 'error': str(e)}
     
+    def _lambda_request(self, issue_event: IssueEvent, agent_assignment: AgentAssignment) -> Dict[str, Any]:
+        """lambda.invoke arguments for one issue"""
+        # Create the payload for the Lambda function
+        payload = {
+            'github_token': self.github_token,
+            'issue_event': {
+                'repository': issue_event.repository,
+                'issue_number': issue_event.issue_number,
+                'issue_title': issue_event.issue_title,
+                'issue_body': issue_event.issue_body,
+                'labels': issue_event.issue_labels
+            },
+            'agent_config': {
+                'agent_name': agent_assignment.agent_name,
+                'agent_type': agent_assignment.agent_type,
+                'timeout_minutes': agent_assignment.timeout_minutes
+            }
+        }
+        
+        return {
+            'FunctionName': self.aws_config['lambda_function_name'],
+            'InvocationType': 'Event',  # Async execution
+            'Payload': json.dumps(payload)
+        }
+    
     def deploy_to_fargate(self, issue_event: IssueEvent, agent_assignment: AgentAssignment) -> Dict[str, Any]:
         """Deploy agent to AWS Fargate"""
         
         try:
-            # Create task definition override
-            task_override = {
-                'containerOverrides': [
-                    {
-                        'name': 'ai-agent-container',
-                        'environment': [
-                            {'name': 'GITHUB_TOKEN', 'value': self.github_token},
-                            {'name': 'GITHUB_REPO', 'value': issue_event.repository},
-                            {'name': 'ISSUE_NUMBER', 'value': str(issue_event.issue_number)},
-                            {'name': 'AGENT_TYPE', 'value': agent_assignment.agent_type},
-                            {'name': 'AGENT_NAME', 'value': agent_assignment.agent_name},
-                            {'name': 'AWS_REGION', 'value': self.aws_region}
-                        ],
-                        'memory': agent_assignment.memory_mb,
-                        'cpu': agent_assignment.cpu_units
-                    }
-                ],
-                'cpu': str(agent_assignment.cpu_units),
-                'memory': str(agent_assignment.memory_mb)
-            }
-            
             # Run Fargate task
-            response = self.ecs_client.run_task(
-                cluster=self.aws_config['fargate_cluster'],
-                taskDefinition=self.aws_config['fargate_task_definition'],
-                launchType='FARGATE',
-                networkConfiguration={
-                    'awsvpcConfiguration': {
-                        'subnets': [os.environ.get('AWS_SUBNET_ID', 'subnet-12345')],
-                        'securityGroups': [os.environ.get('AWS_SECURITY_GROUP_ID', 'sg-12345')],
-                        'assignPublicIp': 'ENABLED'
-                    }
-                },
-                overrides=task_override,
-                tags=[
-                    {'key': 'GitHubIssue', 'value': str(issue_event.issue_number)},
-                    {'key': 'AgentType', 'value': agent_assignment.agent_type},
-                    {'key': 'Repository', 'value': issue_event.repository}
-                ]
-            )
+            response = self.ecs_client.run_task(**self._fargate_request(issue_event, agent_assignment))
             
             task_arn = response['tasks'][0]['taskArn']
             logger.info(f"Fargate task started: {task_arn}")
@@ -503,34 +665,57 @@ The AI agent will begin processing this issue shortly. Updates will be posted as
             logger.error(f"Fargate deployment failed: {e}")
             return {'platform': 'fargate', 'status': 'failed', 'error': str(e)}
     
+    def _fargate_request(self, issue_event: IssueEvent, agent_assignment: AgentAssignment) -> Dict[str, Any]:
+        """ecs.run_task arguments for one issue"""
+        # Create task definition override
+        task_override = {
+            'containerOverrides': [
+                {
+                    'name': 'ai-agent-container',
+                    'environment': [
+                        {'name': 'GITHUB_TOKEN', 'value': self.github_token},
+                        {'name': 'GITHUB_REPO', 'value': issue_event.repository},
+                        {'name': 'ISSUE_NUMBER', 'value': str(issue_event.issue_number)},
+                        {'name': 'AGENT_TYPE', 'value': agent_assignment.agent_type},
+                        {'name': 'AGENT_NAME', 'value': agent_assignment.agent_name},
+                        {'name': 'AWS_REGION', 'value': self.aws_region},
+                        *self._job_environment(agent_assignment)
+                    ],
+                    'memory': agent_assignment.memory_mb,
+                    'cpu': agent_assignment.cpu_units
+                }
+            ],
+            'cpu': str(agent_assignment.cpu_units),
+            'memory': str(agent_assignment.memory_mb)
+        }
+        
+        return dict(
+            cluster=self.aws_config['fargate_cluster'],
+            taskDefinition=self.aws_config['fargate_task_definition'],
+            launchType='FARGATE',
+            networkConfiguration={
+                'awsvpcConfiguration': {
+                    'subnets': [os.environ.get('AWS_SUBNET_ID', 'subnet-12345')],
+                    'securityGroups': [os.environ.get('AWS_SECURITY_GROUP_ID', 'sg-12345')],
+                    'assignPublicIp': 'ENABLED'
+                }
+            },
+            overrides=task_override,
+            tags=[
+                {'key': 'GitHubIssue', 'value': str(issue_event.issue_number)},
+                {'key': 'AgentType', 'value': agent_assignment.agent_type},
+                {'key': 'Repository', 'value': issue_event.repository}
+            ]
+        )
+    
     def deploy_to_batch(self, issue_event: IssueEvent, agent_assignment: AgentAssignment) -> Dict[str, Any]:
         """Deploy agent to AWS Batch"""
         
         try:
-            # Create job name
-            job_name = f"ai-agent-{issue_event.issue_number}-{int(datetime.now().timestamp())}"
-            
             # Submit batch job
-            response = self.batch_client.submit_job(
-                jobName=job_name,
-                jobQueue=self.aws_config['batch_job_queue'],
-                jobDefinition=self.aws_config['batch_job_definition'],
-                parameters={
-                    'githubToken': self.github_token,
-                    'githubRepo': issue_event.repository,
-                    'issueNumber': str(issue_event.issue_number),
-                    'agentType': agent_assignment.agent_type,
-                    'agentName': agent_assignment.agent_name
-                },
-                timeout={
-                    'attemptDurationSeconds': agent_assignment.timeout_minutes * 60
-                },
-                tags={
-                    'GitHubIssue': str(issue_event.issue_number),
-                    'AgentType': agent_assignment.agent_type,
-                    'Repository': issue_event.repository
-                }
-            )
+            request = self._batch_job_request(issue_event, agent_assignment)
+            job_name = request['jobName']
+            response = self.batch_client.submit_job(**request)
             
             job_id = response['jobId']
             logger.info(f"Batch job submitted: {job_id}")
@@ -546,6 +731,80 @@ The AI agent will begin processing this issue shortly. Updates will be posted as
             logger.error(f"Batch deployment failed: {e}")
             return {'platform': 'batch', 'status': 'failed', 'error': str(e)}
     
+    def _batch_job_request(self, issue_event: IssueEvent, agent_assignment: AgentAssignment) -> Dict[str, Any]:
+        """batch.submit_job arguments for one issue"""
+        return dict(
+            jobName=f"ai-agent-{issue_event.issue_number}-{int(datetime.now().timestamp())}",
+            jobQueue=self.aws_config['batch_job_queue'],
+            jobDefinition=self.aws_config['batch_job_definition'],
+            parameters={
+                'githubToken': self.github_token,
+                'githubRepo': issue_event.repository,
+                'issueNumber': str(issue_event.issue_number),
+                'agentType': agent_assignment.agent_type,
+                'agentName': agent_assignment.agent_name
+            },
+            containerOverrides={
+                'resourceRequirements': self._batch_resources(agent_assignment),
+                'environment': self._job_environment(agent_assignment)
+            },
+            timeout={
+                'attemptDurationSeconds': agent_assignment.timeout_minutes * 60
+            },
+            tags={
+                'GitHubIssue': str(issue_event.issue_number),
+                'AgentType': agent_assignment.agent_type,
+                'Repository': issue_event.repository
+            }
+        )
+    
+    def _batch_array_request(self, issue_events: List[IssueEvent], agent_assignment: AgentAssignment) -> Dict[str, Any]:
+        """batch.submit_job arguments for one array job covering several issues of one agent type
+        
+        Child N processes ISSUE_BATCH[N] (the processor picks its entry with
+        AWS_BATCH_JOB_ARRAY_INDEX).
+        """
+        issue_batch = [[event.repository, event.issue_number] for event in issue_events]
+        first = issue_events[0]
+        return dict(
+            jobName=f"ai-agent-{agent_assignment.agent_type}-x{len(issue_events)}-{int(datetime.now().timestamp())}",
+            jobQueue=self.aws_config['batch_job_queue'],
+            jobDefinition=self.aws_config['batch_job_definition'],
+            arrayProperties={'size': len(issue_events)},
+            parameters={
+                'githubToken': self.github_token,
+                'githubRepo': first.repository,
+                'issueNumber': str(first.issue_number),
+                'agentType': agent_assignment.agent_type,
+                'agentName': agent_assignment.agent_name
+            },
+            containerOverrides={
+                'resourceRequirements': self._batch_resources(agent_assignment),
+                'environment': [
+                    {'name': 'ISSUE_BATCH', 'value': json.dumps(issue_batch, separators=(',', ':'))},
+                    {'name': 'AGENT_TYPE', 'value': agent_assignment.agent_type},
+                    {'name': 'AGENT_NAME', 'value': agent_assignment.agent_name},
+                    *self._job_environment(agent_assignment)
+                ]
+            },
+            timeout={
+                'attemptDurationSeconds': agent_assignment.timeout_minutes * 60
+            },
+            tags={
+                'GitHubIssues': str(len(issue_events)),
+                'AgentType': agent_assignment.agent_type,
+                'Repository': first.repository
+            }
+        )
+    
+    @staticmethod
+    def _batch_resources(agent_assignment: AgentAssignment) -> List[Dict[str, str]]:
+        """Batch (Fargate) resource requirements for an assignment's cpu units and memory"""
+        return [
+            {'type': 'VCPU', 'value': f"{agent_assignment.cpu_units / 1024:g}"},
+            {'type': 'MEMORY', 'value': str(agent_assignment.memory_mb)}
+        ]
+    
     def create_agent_containers(self):
         """Create Docker containers for all agents"""
         
@@ -717,6 +976,271 @@ echo "All containers pushed successfully!"
         logger.info(f"Created {len(containers_created)} agent containers")
         return containers_created
 
+class DispatchPipeline:
+    """Buffers routed issue events and dispatches them in bulk
+    
+    Events are coalesced per compute target (platform + agent type), and
+    repeated events for the same issue collapse into the latest one. A flush
+    sends the GitHub assignment updates and the AWS submissions through a
+    bounded thread pool: Batch buckets become array jobs, Lambda invokes and
+    Fargate tasks run in parallel. Throttling is retried by the AWS clients;
+    Fargate capacity failures are retried here with exponential backoff and
+    full jitter.
+    """
+    
+    def __init__(self, dispatcher: GitHubAgentDispatcher, max_concurrency: int = 8,
+                 flush_interval: float = 2.0, max_buffer: int = 500, max_array_size: int = 100,
+                 max_array_payload: int = 20000, max_attempts: int = 5,
+                 base_delay: float = 0.5, max_delay: float = 20.0, max_results: int = 10000):
+        self.dispatcher = dispatcher
+        self.max_concurrency = max_concurrency
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.max_array_size = max_array_size  # Batch allows 2-10000 children
+        self.max_array_payload = max_array_payload  # bytes of ISSUE_BATCH per array job
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='dispatch')
+        self._cond = threading.Condition()
+        self._buckets: Dict[Tuple[str, str], Dict[Tuple[str, int], Tuple[IssueEvent, AgentAssignment]]] = defaultdict(dict)
+        self._targets: Dict[Tuple[str, int], Tuple[str, str]] = {}  # issue -> bucket it is buffered in
+        self._first_buffered_at: Optional[float] = None
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._running = False
+        
+        # "owner/repo#N" -> latest deployment result, the max_results most recent only
+        self.results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_results = max_results
+        self._waiters: Dict[str, List[Future]] = defaultdict(list)  # futures resolved by the key's next result
+        self._results_lock = threading.Lock()
+        self.stats = defaultdict(int)
+        self._stats_lock = threading.Lock()
+    
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[name] += n
+    
+    @staticmethod
+    def issue_key(issue_event: IssueEvent) -> str:
+        return f"{issue_event.repository}#{issue_event.issue_number}"
+    
+    def submit(self, issue_event: IssueEvent, agent_assignment: AgentAssignment,
+               waiter: Optional[Future] = None) -> str:
+        """Buffer a routed event; returns its dispatch key
+        
+        waiter, if given, is resolved with the deployment result once the event is dispatched.
+        """
+        if waiter is not None:
+            with self._results_lock:
+                self._waiters[self.issue_key(issue_event)].append(waiter)
+        issue = (issue_event.repository, issue_event.issue_number)
+        target = (agent_assignment.compute_type, agent_assignment.agent_type)
+        with self._cond:
+            previous = self._targets.get(issue)
+            if previous is not None:
+                # Latest event wins, even if it re-routes the issue
+                self._buckets[previous].pop(issue, None)
+                self._count('coalesced')
+            self._buckets[target][issue] = (issue_event, agent_assignment)
+            self._targets[issue] = target
+            self._count('buffered')
+            if self._first_buffered_at is None:
+                self._first_buffered_at = time.time()
+            if len(self._targets) >= self.max_buffer:
+                self._cond.notify()
+        return self.issue_key(issue_event)
+    
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._targets)
+    
+    def flush(self) -> Dict[str, Dict[str, Any]]:
+        """Dispatch everything buffered so far; returns deployment results by dispatch key"""
+        with self._flush_lock:
+            with self._cond:
+                buckets, self._buckets = self._buckets, defaultdict(dict)
+                self._targets = {}
+                self._first_buffered_at = None
+            
+            futures, updates = [], []
+            for (compute_type, agent_type), items in buckets.items():
+                items = list(items.values())
+                if not items:
+                    continue
+                updates.extend(self.executor.submit(self._update_issue, *item) for item in items)
+                
+                if compute_type == 'batch':
+                    for chunk in self._array_chunks(items):
+                        futures.append(self.executor.submit(self._dispatch_batch, chunk))
+                elif compute_type == 'lambda':
+                    futures.extend(self.executor.submit(self._dispatch_lambda, *item) for item in items)
+                elif compute_type == 'fargate':
+                    futures.extend(self.executor.submit(self._dispatch_fargate, *item) for item in items)
+                else:
+                    for issue_event, _ in items:
+                        self._record(issue_event, {'platform': compute_type, 'status': 'failed',
+                                                   'error': f"Unknown compute type: {compute_type}"})
+            
+            results = {}
+            for future in futures:
+                results.update(future.result())
+            for future in updates:
+                future.result()
+            return results
+    
+    def start(self):
+        """Flush in the background when the buffer fills or flush_interval passes"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True, name='dispatch-flusher')
+        self._thread.start()
+    
+    def stop(self):
+        """Stop the background flusher and dispatch whatever is still buffered"""
+        self._running = False
+        with self._cond:
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=30)
+        self.flush()
+    
+    def shutdown(self):
+        self.stop()
+        self.executor.shutdown(wait=True)
+    
+    def _flush_loop(self):
+        while self._running:
+            with self._cond:
+                due = (self._first_buffered_at is not None and
+                       (len(self._targets) >= self.max_buffer or
+                        time.time() - self._first_buffered_at >= self.flush_interval))
+                if not due:
+                    wait = self.flush_interval
+                    if self._first_buffered_at is not None:
+                        wait = max(0.0, self._first_buffered_at + self.flush_interval - time.time())
+                    self._cond.wait(wait)
+                    continue
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Dispatch flush failed: {e}")
+    
+    def _array_chunks(self, items: List[Tuple[IssueEvent, AgentAssignment]]):
+        """Split a Batch bucket into array jobs bounded by size and ISSUE_BATCH payload"""
+        chunk, size = [], 2
+        for item in items:
+            entry_size = len(item[0].repository) + len(str(item[0].issue_number)) + 8
+            if chunk and (len(chunk) >= self.max_array_size or size + entry_size > self.max_array_payload):
+                yield chunk
+                chunk, size = [], 2
+            chunk.append(item)
+            size += entry_size
+        if chunk:
+            yield chunk
+    
+    def _call(self, operation, request: Dict[str, Any], validate=None):
+        """Call an AWS operation, retrying responses validate rejects as transient with backoff
+        
+        Throttling, 5xx and connection errors are retried by the clients' botocore retry config.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                self._count('aws_calls')
+                response = operation(**request)
+                if validate:
+                    validate(response)
+                return response
+            except TransientDispatchError as e:
+                if attempt == self.max_attempts:
+                    raise
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+                self._count('retries')
+                logger.warning(f"Retrying {getattr(operation, '__name__', 'AWS call')} in {delay:.1f}s "
+                               f"(attempt {attempt}/{self.max_attempts}): {e}")
+                time.sleep(delay)
+    
+    def _record(self, issue_event: IssueEvent, result: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        key = self.issue_key(issue_event)
+        with self._results_lock:
+            self.results[key] = result
+            self.results.move_to_end(key)
+            while len(self.results) > self.max_results:
+                self.results.popitem(last=False)
+            waiters = self._waiters.pop(key, [])
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+        self._count('failed' if result.get('status') == 'failed' else 'dispatched')
+        return {key: result}
+    
+    def _update_issue(self, issue_event: IssueEvent, agent_assignment: AgentAssignment):
+        try:
+            self.dispatcher.update_issue_assignment(issue_event, agent_assignment)
+        except Exception as e:
+            logger.warning(f"Could not update issue #{issue_event.issue_number}: {e}")
+    
+    def _dispatch_batch(self, chunk: List[Tuple[IssueEvent, AgentAssignment]]) -> Dict[str, Dict[str, Any]]:
+        events = [issue_event for issue_event, _ in chunk]
+        # Array children share one size: the largest any issue in the chunk was placed with
+        assignments = [assignment for _, assignment in chunk]
+        agent_assignment = replace(
+            assignments[0],
+            memory_mb=max(assignment.memory_mb for assignment in assignments),
+            cpu_units=max(assignment.cpu_units for assignment in assignments),
+            timeout_minutes=max(assignment.timeout_minutes for assignment in assignments)
+        )
+        results = {}
+        try:
+            if len(chunk) == 1:
+                request = self.dispatcher._batch_job_request(events[0], agent_assignment)
+            else:
+                request = self.dispatcher._batch_array_request(events, agent_assignment)
+            response = self._call(self.dispatcher.batch_client.submit_job, request)
+            job_id = response['jobId']
+            logger.info(f"Batch job {job_id} submitted for {len(chunk)} {agent_assignment.agent_type} issues")
+            for index, issue_event in enumerate(events):
+                result = {'platform': 'batch', 'status': 'submitted', 'job_name': request['jobName'],
+                          'job_id': job_id if len(chunk) == 1 else f"{job_id}:{index}"}
+                if len(chunk) > 1:
+                    result.update({'array_job_id': job_id, 'array_index': index})
+                results.update(self._record(issue_event, result))
+        except Exception as e:
+            logger.error(f"Batch dispatch of {len(chunk)} issues failed: {e}")
+            for issue_event in events:
+                results.update(self._record(issue_event, {'platform': 'batch', 'status': 'failed', 'error': str(e)}))
+        return results
+    
+    def _dispatch_lambda(self, issue_event: IssueEvent, agent_assignment: AgentAssignment) -> Dict[str, Dict[str, Any]]:
+        try:
+            response = self._call(self.dispatcher.lambda_client.invoke,
+                                  self.dispatcher._lambda_request(issue_event, agent_assignment))
+            result = {'platform': 'lambda', 'status': 'invoked', 'response_metadata': response['ResponseMetadata']}
+        except Exception as e:
+            logger.error(f"Lambda dispatch for issue #{issue_event.issue_number} failed: {e}")
+            result = {'platform': 'lambda', 'status': 'failed', 'error': str(e)}
+        return self._record(issue_event, result)
+    
+    def _dispatch_fargate(self, issue_event: IssueEvent, agent_assignment: AgentAssignment) -> Dict[str, Dict[str, Any]]:
+        def placed(response):
+            if not response.get('tasks'):
+                reasons = [failure.get('reason') for failure in response.get('failures', [])]
+                raise TransientDispatchError(f"Task not placed: {reasons}")
+        
+        try:
+            response = self._call(self.dispatcher.ecs_client.run_task,
+                                  self.dispatcher._fargate_request(issue_event, agent_assignment),
+                                  validate=placed)
+            result = {'platform': 'fargate', 'status': 'started', 'task_arn': response['tasks'][0]['taskArn'],
+                      'cluster': self.dispatcher.aws_config['fargate_cluster']}
+        except Exception as e:
+            logger.error(f"Fargate dispatch for issue #{issue_event.issue_number} failed: {e}")
+            result = {'platform': 'fargate', 'status': 'failed', 'error': str(e)}
+        return self._record(issue_event, result)
+
 def create_github_actions_workflow():
     """Create GitHub Actions workflow for agent dispatch"""
     
@@ -16,8 +16,14 @@ from dataclasses import dataclass, asdict
 from collections import defaultdict
 import re
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import hashlib
+import sys
+
+sys.path.append(str(Path(__file__).parent))
+from agent_work_queue import AgentWorkQueue, PRIORITY_ORDER
+from issue_routing import IssueRoutingEngine
 
 # Setup logging
 logging.basicConfig(
@@ -67,6 +73,170 @@ class WorkTicket:
     dependencies: List[str] = None
     subtasks: List[str] = None
 
+class IssueSyncEngine:
+    """Incremental issue sync driven by per-repository updated_at watermarks
+    
+    Each sync asks GitHub only for issues updated since the repository's last
+    watermark, paginates through all of them, and returns just the issues whose
+    updated_at changed since they were last seen. The new watermarks only take
+    effect (and are persisted) when commit() is called after the issues have been
+    processed, so a crash mid-batch refetches them. Watermarks survive restarts.
+    """
+    
+    def __init__(self, owner: str, state_file: str = 'github_issues_sync_state.json',
+                 max_workers: int = 8, rate_limit_reserve: int = 200):
+        self.owner = owner
+        self.state_file = state_file
+        self.max_workers = max_workers
+        self.rate_limit_reserve = rate_limit_reserve
+        
+        self.watermarks: Dict[str, str] = {}  # repo -> newest updated_at seen
+        self.seen: Dict[str, str] = {}  # "repo#number" -> updated_at last analyzed
+        self.last_synced: Dict[str, float] = {}  # repo -> epoch seconds of last successful sync
+        # repo -> (watermark, {issue_key: updated_at}, synced_at) awaiting commit()
+        self.pending: Dict[str, Tuple[str, Dict[str, str], float]] = {}
+        self._lock = threading.Lock()
+        
+        self.load_state()
+    
+    def load_state(self):
+        """Load persisted watermarks"""
+        if not os.path.exists(self.state_file):
+            return
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            self.watermarks = state.get('watermarks', {})
+            self.seen = state.get('seen', {})
+            self.last_synced = state.get('last_synced', {})
+            logger.info(f"Sync state loaded: {len(self.watermarks)} repository watermarks")
+        except Exception as e:
+            logger.error(f"Failed to load sync state: {e}")
+    
+    def save_state(self):
+        """Persist watermarks atomically"""
+        with self._lock:
+            state = {
+                'watermarks': self.watermarks,
+                'seen': self.seen,
+                'last_synced': self.last_synced
+            }
+            tmp_file = f"{self.state_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_file, self.state_file)
+    
+    def remaining_rate_budget(self) -> Optional[int]:
+        """Remaining core REST requests for this token, or None if unknown"""
+        try:
+            result = subprocess.run(
+                ['gh', 'api', 'rate_limit', '--jq', '.resources.core.remaining'],
+                capture_output=True, text=True, timeout=30
+            )
+            if result.returncode == 0:
+                return int(result.stdout.strip())
+        except Exception as e:
+            logger.warning(f"Could not read rate limit: {e}")
+        return None
+    
+    def fetch_updated(self, repo: str, since: Optional[str]) -> Optional[List[Dict[str, Any]]]:
+        """Fetch every issue updated since the watermark, following all pages"""
+        cmd = [
+            'gh', 'api', '--method', 'GET', '--paginate',
+            f'repos/{self.owner}/{repo}/issues',
+            '-f', 'sort=updated',
+            '-f', 'direction=asc',
+            '-f', 'per_page=100',
+            # Pull requests share the issues endpoint; emit one compact issue per line
+            '--jq', '.[] | select(has("pull_request") | not)'
+        ]
+        if since:
+            # Closed issues matter once we have a baseline, so their tickets get completed
+            cmd.extend(['-f', 'state=all', '-f', f'since={since}'])
+        else:
+            cmd.extend(['-f', 'state=open'])
+        
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        except Exception as e:
+            logger.error(f"Error fetching issues from {repo}: {e}")
+            return None
+        
+        if result.returncode != 0:
+            logger.error(f"Failed to fetch issues from {repo}: {result.stderr}")
+            return None
+        
+        return [json.loads(line) for line in result.stdout.splitlines() if line.strip()]
+    
+    def sync_repository(self, repo: str) -> List[Dict[str, Any]]:
+        """Sync one repository, returning only issues changed since they were last seen"""
+        since = self.watermarks.get(repo)
+        started_at = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
+        issues_data = self.fetch_updated(repo, since)
+        if issues_data is None:
+            return []  # Keep the old watermark so the next cycle retries
+        
+        changed = []
+        seen = {}
+        newest = since
+        with self._lock:
+            for issue_data in issues_data:
+                updated_at = issue_data['updated_at']
+                if newest is None or updated_at > newest:
+                    newest = updated_at
+                
+                # since= is inclusive, so issues at the watermark come back every cycle
+                issue_key = f"{repo}#{issue_data['number']}"
+                if self.seen.get(issue_key) == updated_at or seen.get(issue_key) == updated_at:
+                    continue
+                seen[issue_key] = updated_at
+                changed.append(issue_data)
+            
+            # An empty repository still gets a baseline so later syncs are incremental
+            self.pending[repo] = (newest or started_at, seen, time.time())
+        
+        logger.info(f"Synced {repo}: {len(issues_data)} updated, {len(changed)} changed")
+        return changed
+    
+    def sync(self, repositories: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+        """Sync repositories concurrently within the remaining rate budget"""
+        # Least recently synced repositories go first when the budget is short
+        repos = sorted(repositories, key=lambda repo: self.last_synced.get(repo, 0))
+        
+        budget = self.remaining_rate_budget()
+        if budget is not None:
+            allowed = max(budget - self.rate_limit_reserve, 0)
+            if allowed < len(repos):
+                logger.warning(f"Rate budget low ({budget} remaining) - syncing {allowed} of {len(repos)} repositories")
+                repos = repos[:allowed]
+        
+        # Candidates from a batch that was never committed are refetched now
+        with self._lock:
+            self.pending.clear()
+        
+        if not repos:
+            return []
+        
+        changed = []
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(repos))) as pool:
+            for repo, issues_data in zip(repos, pool.map(self.sync_repository, repos)):
+                changed.extend((repo, issue_data) for issue_data in issues_data)
+        
+        return changed
+    
+    def commit(self, repositories: Optional[List[str]] = None):
+        """Adopt and persist the watermarks of the last sync once its issues are processed"""
+        with self._lock:
+            for repo in list(self.pending if repositories is None else repositories):
+                if repo not in self.pending:
+                    continue
+                watermark, seen, synced_at = self.pending.pop(repo)
+                self.watermarks[repo] = watermark
+                self.seen.update(seen)
+                self.last_synced[repo] = synced_at
+        self.save_state()
+
+
 class GitHubIssuesAgent:
     """Main agent for monitoring and distributing GitHub issues"""
     
@@ -80,8 +250,11 @@ class GitHubIssuesAgent:
         
         # Work queue management
         self.work_queue = []
+        self.tickets_by_issue: Dict[str, WorkTicket] = {}  # "repo#number" -> ticket
         self.processed_issues = set()
         self.agent_assignments = defaultdict(list)
+        self.agent_queues: Dict[str, AgentWorkQueue] = {}
+        self._state_lock = threading.Lock()  # monitor thread and main() both save state
         
         # Agent specializations
         self.agent_specializations = {
@@ -95,6 +268,12 @@ class GitHubIssuesAgent:
             'data-agent': ['data', 'analytics', 'ml', 'ai', 'pipeline']
         }
         
+        # Specializations plus the frontend hints used to split feature work
+        self.routing_engine = IssueRoutingEngine({
+            'specializations': self.agent_specializations,
+            'frontend_hints': {'frontend-dev-agent': ['ui', 'frontend', 'react', 'component', 'css']}
+        })
+        
         # Priority mapping
         self.priority_map = {
             'P0': 'critical',
@@ -129,6 +308,7 @@ class GitHubIssuesAgent:
         self.monitoring = True
         self.poll_interval = 30  # seconds
         self.monitor_thread = None
+        self.sync_engine = IssueSyncEngine(self.owner)
         
         # Communication hub integration
         self.hub_enabled = False
@@ -193,6 +373,29 @@ class GitHubIssuesAgent:
             logger.error(f"Error fetching issues from {repo}: {e}")
             return []
     
+    def _issue_from_api(self, repo: str, issue_data: Dict[str, Any]) -> Issue:
+        """Build an analyzed Issue from a REST API issue payload"""
+        issue = Issue(
+            number=issue_data['number'],
+            title=issue_data['title'],
+            body=issue_data.get('body') or '',
+            state=issue_data['state'].upper(),
+            labels=[label['name'] for label in issue_data.get('labels', [])],
+            assignees=[a['login'] for a in issue_data.get('assignees', [])],
+            created_at=issue_data['created_at'],
+            updated_at=issue_data['updated_at'],
+            repository=repo,
+            author=(issue_data.get('user') or {}).get('login', 'unknown'),
+            milestone=issue_data['milestone']['title'] if issue_data.get('milestone') else None
+        )
+        
+        # Extract priority and complexity
+        issue.priority = self._extract_priority(issue)
+        issue.complexity = self._estimate_complexity(issue)
+        issue.estimated_hours = self._estimate_hours(issue.complexity)
+        
+        return issue
+    
     def _extract_priority(self, issue: Issue) -> str:
         """Extract priority from issue labels or title"""
         # Check labels first
@@ -364,22 +567,22 @@ class GitHubIssuesAgent:
         """Assign work ticket to appropriate specialized agent"""
         start_time = datetime.now()
         
-        # Analyze ticket content for agent selection
-        combined_text = f"{ticket.title} {ticket.description}".lower()
+        # Analyze ticket content for agent selection (single pass over the text)
+        match = self.routing_engine.analyze(f"{ticket.title} {ticket.description}")
         
         # Score each agent based on keyword matches
-        agent_scores = {}
-        for agent, keywords in self.agent_specializations.items():
-            score = sum(1 for keyword in keywords if keyword in combined_text)
-            if score > 0:
-                agent_scores[agent] = score
+        specialization_scores = match.table_scores('specializations')
+        agent_scores = {
+            agent: specialization_scores[agent]
+            for agent in self.agent_specializations if specialization_scores.get(agent)
+        }
         
         # Add specific rules based on issue type and labels
         if ticket.issue_type == 'bug':
             agent_scores['qa-agent'] = agent_scores.get('qa-agent', 0) + 3
         elif ticket.issue_type == 'feature':
             # Determine if frontend or backend
-            if any(word in combined_text for word in ['ui', 'frontend', 'react', 'component', 'css']):
+            if match.first('frontend_hints'):
                 agent_scores['frontend-dev-agent'] = agent_scores.get('frontend-dev-agent', 0) + 3
             else:
                 agent_scores['backend-dev-agent'] = agent_scores.get('backend-dev-agent', 0) + 3
@@ -422,6 +625,12 @@ class GitHubIssuesAgent:
         
         return assigned_agent
     
+    def get_agent_queue(self, agent_name: str) -> AgentWorkQueue:
+        """Durable queue for an agent, opened once"""
+        if agent_name not in self.agent_queues:
+            self.agent_queues[agent_name] = AgentWorkQueue(agent_name)
+        return self.agent_queues[agent_name]
+    
     def distribute_work(self, ticket: WorkTicket):
         """Distribute work ticket to assigned agent"""
         if not ticket.assigned_agent:
@@ -443,29 +652,8 @@ class GitHubIssuesAgent:
             'assigned_at': datetime.now().isoformat()
         }
         
-        # Save work package to agent's queue
-        agent_queue_file = f"work_queues/{ticket.assigned_agent}_queue.json"
-        Path("work_queues").mkdir(exist_ok=True)
-        
-        # Load existing queue
-        existing_queue = []
-        if os.path.exists(agent_queue_file):
-            try:
-                with open(agent_queue_file, 'r') as f:
-                    existing_queue = json.load(f)
-            except:
-                existing_queue = []
-        
-        # Add new work package
-        existing_queue.append(work_package)
-        
-        # Sort by priority
-        priority_order = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3, 'trivial': 4}
-        existing_queue.sort(key=lambda x: priority_order.get(x['priority'], 5))
-        
-        # Save updated queue
-        with open(agent_queue_file, 'w') as f:
-            json.dump(existing_queue, f, indent=2)
+        # Append work package to agent's queue (priority ordering happens at claim time)
+        self.get_agent_queue(ticket.assigned_agent).enqueue(work_package)
         
         # Track assignment
         self.agent_assignments[ticket.assigned_agent].append(ticket.ticket_id)
@@ -476,56 +664,89 @@ class GitHubIssuesAgent:
                 ticket.assigned_agent,
                 'task_assignment',
                 work_package,
-                priority=priority_order.get(ticket.priority, 5)
+                priority=PRIORITY_ORDER.get(ticket.priority, 5)
             )
         
         logger.info(f"Distributed work package to {ticket.assigned_agent}: {ticket.title}")
     
+    def _track_ticket(self, ticket: WorkTicket):
+        """Add a ticket to the work queue and its issue index"""
+        self.work_queue.append(ticket)
+        self.tickets_by_issue[f"{ticket.repository}#{ticket.issue_number}"] = ticket
+    
+    def process_new_issue(self, issue: Issue):
+        """Create, assign and distribute a ticket for an issue seen for the first time"""
+        issue_key = f"{issue.repository}#{issue.number}"
+        logger.info(f"Processing new issue: {issue_key} - {issue.title}")
+        
+        # Process issue template
+        template_data = self.process_issue_templates(issue)
+        
+        # Create work ticket
+        ticket = self.create_work_ticket(issue, template_data)
+        
+        # Assign to agent
+        self.assign_to_agent(ticket)
+        
+        # Add to work queue
+        self._track_ticket(ticket)
+        
+        # Distribute work
+        self.distribute_work(ticket)
+        
+        # Mark as processed
+        self.processed_issues.add(issue_key)
+        
+        # Update metrics
+        self.metrics['total_issues_processed'] += 1
+        self.metrics['issues_by_type'][template_data['type']] += 1
+        self.metrics['issues_by_priority'][issue.priority] += 1
+    
+    def process_changed_issue(self, issue: Issue):
+        """Apply an update to an issue that already has a ticket"""
+        ticket = self.tickets_by_issue.get(f"{issue.repository}#{issue.number}")
+        if not ticket:
+            return
+        
+        if issue.state == 'CLOSED':
+            if ticket.status != 'completed':
+                self.handle_issue_update(issue.repository, issue.number, 'closed', {})
+            return
+        
+        ticket.title = issue.title
+        ticket.priority = issue.priority
+        ticket.complexity = issue.complexity
+        
+        if ticket.status == 'completed':
+            self.handle_issue_update(issue.repository, issue.number, 'reopened', {})
+    
     def monitor_issues(self):
         """Main monitoring loop"""
         logger.info("Starting issue monitoring...")
         
         while self.monitoring:
             try:
-                all_issues = []
-                
-                # Fetch issues from all repositories
-                for repo in self.repositories:
-                    issues = self.fetch_issues(repo)
-                    all_issues.extend(issues)
+                # Only issues updated since the last sync come back
+                changed = self.sync_engine.sync(self.repositories)
                 
-                # Process new issues
-                for issue in all_issues:
-                    issue_key = f"{issue.repository}#{issue.number}"
+                for repo, issue_data in changed:
+                    issue = self._issue_from_api(repo, issue_data)
+                    issue_key = f"{repo}#{issue.number}"
                     
-                    if issue_key not in self.processed_issues:
-                        logger.info(f"Processing new issue: {issue_key} - {issue.title}")
-                        
-                        # Process issue template
-                        template_data = self.process_issue_templates(issue)
-                        
-                        # Create work ticket
-                        ticket = self.create_work_ticket(issue, template_data)
-                        
-                        # Assign to agent
-                        self.assign_to_agent(ticket)
-                        
-                        # Add to work queue
-                        self.work_queue.append(ticket)
-                        
-                        # Distribute work
-                        self.distribute_work(ticket)
-                        
-                        # Mark as processed
-                        self.processed_issues.add(issue_key)
-                        
-                        # Update metrics
-                        self.metrics['total_issues_processed'] += 1
-                        self.metrics['issues_by_type'][template_data['type']] += 1
-                        self.metrics['issues_by_priority'][issue.priority] += 1
+                    if issue_key in self.processed_issues:
+                        self.process_changed_issue(issue)
+                    elif issue.state == 'OPEN':
+                        self.process_new_issue(issue)
+                
+                # Watermarks only advance past issues that were actually handled, and
+                # only once those issues and their tickets are persisted
+                if changed:
+                    self.save_state()
+                self.sync_engine.commit()
                 
                 # Log status
-                logger.info(f"Monitoring cycle complete. Processed: {self.metrics['total_issues_processed']} total issues")
+                logger.info(f"Monitoring cycle complete. {len(changed)} changed issues, "
+                           f"processed: {self.metrics['total_issues_processed']} total issues")
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
@@ -567,11 +788,7 @@ class GitHubIssuesAgent:
         logger.info(f"Handling {update_type} for {repo}#{issue_number}")
         
         # Find corresponding work ticket
-        ticket = None
-        for t in self.work_queue:
-            if t.repository == repo and t.issue_number == issue_number:
-                ticket = t
-                break
+        ticket = self.tickets_by_issue.get(f"{repo}#{issue_number}")
         
         if not ticket:
             logger.warning(f"No ticket found for {repo}#{issue_number}")
@@ -611,16 +828,19 @@ class GitHubIssuesAgent:
         return 'medium'
     
     def save_state(self):
-        """Save agent state to file"""
-        state = {
-            'processed_issues': list(self.processed_issues),
-            'work_queue': [asdict(t) for t in self.work_queue],
-            'agent_assignments': dict(self.agent_assignments),
-            'metrics': self.metrics
-        }
-        
-        with open('github_issues_agent_state.json', 'w') as f:
-            json.dump(state, f, indent=2)
+        """Save agent state to file atomically"""
+        with self._state_lock:
+            state = {
+                'processed_issues': list(self.processed_issues),
+                'work_queue': [asdict(t) for t in self.work_queue],
+                'agent_assignments': dict(self.agent_assignments),
+                'metrics': self.metrics
+            }
+            
+            tmp_file = 'github_issues_agent_state.json.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_file, 'github_issues_agent_state.json')
         
         logger.info("Agent state saved")
     
@@ -636,9 +856,10 @@ class GitHubIssuesAgent:
                 
                 # Reconstruct work queue
                 self.work_queue = []
+                self.tickets_by_issue = {}
                 for ticket_data in state.get('work_queue', []):
                     ticket = WorkTicket(**ticket_data)
-                    self.work_queue.append(ticket)
+                    self._track_ticket(ticket)
                 
                 self.agent_assignments = defaultdict(list, state.get('agent_assignments', {}))
                 
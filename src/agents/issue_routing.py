@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Issue Routing Engine - shared keyword routing for GitHub issue routers
+Compiles every keyword table of a router into one automaton so the title and
+body are scanned once, and all agents in all tables are scored from that
+single pass.
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Iterable, Optional, Set, Tuple
+
+
+class KeywordAutomaton:
+    """Finds which of a fixed set of keywords occur anywhere in a text
+
+    The keywords are compiled into a single alternation inside a lookahead,
+    ordered longest first, so the regex engine reports the longest keyword
+    starting at every position in one scan. Shorter keywords that are
+    prefixes of a match are added from a precomputed table, which gives the
+    same answer as running ``keyword in text`` for every keyword.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword}, key=len, reverse=True)
+        self._pattern = (
+            re.compile("(?=(" + "|".join(re.escape(keyword) for keyword in self.keywords) + "))")
+            if self.keywords else None
+        )
+        self._prefixes = {
+            keyword: [other for other in self.keywords if other != keyword and keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+
+    def find(self, text: str) -> Set[str]:
+        """Return the set of keywords present in the text (case-insensitive)"""
+        found: Set[str] = set()
+        if not self._pattern or not text:
+            return found
+        for match in self._pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            if keyword not in found:
+                found.add(keyword)
+                found.update(self._prefixes[keyword])
+        return found
+
+
+@dataclass
+class RoutingMatch:
+    """Keywords found in a text and the resulting per-table agent scores"""
+    keywords: Set[str]
+    scores: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    table_order: Dict[str, List[str]] = field(default_factory=dict)
+
+    def table_scores(self, table: str) -> Dict[str, int]:
+        return self.scores.get(table, {})
+
+    def first(self, table: str) -> Optional[str]:
+        """First agent, in table order, with any keyword present"""
+        scores = self.table_scores(table)
+        for agent in self.table_order.get(table, []):
+            if scores.get(agent):
+                return agent
+        return None
+
+    def best(self, table: str) -> Optional[str]:
+        """Agent with the most keywords present (ties go to table order)"""
+        scores = self.table_scores(table)
+        if not scores:
+            return None
+        return max(self.table_order[table], key=lambda agent: scores.get(agent, 0))
+
+
+class IssueRoutingEngine:
+    """Keyword tables for one router, compiled into a single automaton
+
+    ``tables`` maps a table name (e.g. "title", "body", "skills") to an
+    ordered mapping of agent -> keywords. Label tables are matched exactly
+    rather than as substrings and go in ``label_tables``.
+    """
+
+    def __init__(self, tables: Dict[str, Dict[str, List[str]]],
+                 label_tables: Optional[Dict[str, Dict[str, List[str]]]] = None):
+        self.tables = {
+            name: {agent: [keyword.lower() for keyword in keywords] for agent, keywords in table.items()}
+            for name, table in tables.items()
+        }
+        self.table_order = {name: list(table) for name, table in self.tables.items()}
+
+        # keyword -> [(table, agent), ...] so one scan scores every table
+        self._keyword_index: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for name, table in self.tables.items():
+            for agent, keywords in table.items():
+                for keyword in keywords:
+                    self._keyword_index[keyword].append((name, agent))
+        self.automaton = KeywordAutomaton(self._keyword_index)
+
+        # label -> [agent, ...] per label table, in table order
+        self.label_tables: Dict[str, Dict[str, List[str]]] = {}
+        for name, table in (label_tables or {}).items():
+            index: Dict[str, List[str]] = defaultdict(list)
+            for agent, labels in table.items():
+                for label in labels:
+                    index[label.lower()].append(agent)
+            self.label_tables[name] = dict(index)
+        self.label_table_order = {name: list(table) for name, table in (label_tables or {}).items()}
+
+    def analyze(self, text: str) -> RoutingMatch:
+        """Scan a text once and score every agent in every table"""
+        keywords = self.automaton.find(text)
+        scores: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for keyword in keywords:
+            for table, agent in self._keyword_index[keyword]:
+                scores[table][agent] += 1
+        return RoutingMatch(
+            keywords=keywords,
+            scores={table: dict(agent_scores) for table, agent_scores in scores.items()},
+            table_order=self.table_order
+        )
+
+    def matched_keyword(self, match: RoutingMatch, table: str, agent: str) -> Optional[str]:
+        """First keyword, in configuration order, that matched for an agent"""
+        for keyword in self.tables.get(table, {}).get(agent, []):
+            if keyword in match.keywords:
+                return keyword
+        return None
+
+    def analyze_many(self, texts: Iterable[str]) -> List[RoutingMatch]:
+        """Bulk re-routing: analyze many texts against the compiled automaton"""
+        return [self.analyze(text) for text in texts]
+
+    def agents_for_labels(self, table: str, labels: Iterable[str]) -> List[str]:
+        """Agents whose label table contains any of the labels, in label order"""
+        index = self.label_tables.get(table, {})
+        agents: List[str] = []
+        for label in labels:
+            for agent in index.get(label.lower(), []):
+                if agent not in agents:
+                    agents.append(agent)
+        return agents
+
+    def first_agent_for_labels(self, table: str, labels: Iterable[str]) -> Optional[str]:
+        """First agent, in table order, whose label table contains any of the labels"""
+        matched = set(self.agents_for_labels(table, labels))
+        for agent in self.label_table_order.get(table, []):
+            if agent in matched:
+                return agent
+        return None
@@ -12,13 +12,17 @@ import subprocess
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from collections import defaultdict
 from enum import Enum
 import threading
+import sys
 from pathlib import Path
 import hashlib
 
+sys.path.append(str(Path(__file__).parent))
+from board_metrics import BoardMetrics, DEFAULT_STORY_POINTS
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -59,6 +63,7 @@ class ProjectBoard:
     columns: Dict[str, str]  # column_name -> column_id
     cards_count: int
     repository: Optional[str]
+    column_node_ids: Dict[str, str] = field(default_factory=dict)  # column_name -> GraphQL node id
 
 @dataclass
 class ProjectCard:
@@ -77,6 +82,7 @@ class ProjectCard:
     creator: str
     labels: List[str]
     assignees: List[str]
+    node_id: Optional[str] = None  # GraphQL node id, used for batched moves
 
 @dataclass
 class Sprint:
@@ -93,6 +99,109 @@ class Sprint:
     completed_points: int
     issues: List[int]
     burndown_data: List[Dict[str, Any]]
+    story_points: Dict[str, int] = field(default_factory=dict)  # issue number (as str) -> points
+
+def parse_timestamp(value: str) -> float:
+    """ISO-8601 timestamp (naive local or 'Z'/offset aware) to epoch seconds"""
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+class BoardModel:
+    """In-memory index of project cards
+    
+    Cards are indexed by column, issue and PR number, and their timestamps are
+    parsed once on insert, so lookups and per-cycle scans don't touch GitHub
+    or re-parse dates. Kept current by the agent's own moves and by webhook
+    events (see ProjectBoardAgent.handle_webhook_event). Every change is also
+    emitted as a card event to the attached BoardMetrics, if any.
+    """
+    
+    def __init__(self, metrics: Optional[BoardMetrics] = None):
+        self.metrics = metrics
+        self.cards: Dict[str, ProjectCard] = {}
+        self.by_column_id: Dict[str, set] = defaultdict(set)
+        self.by_column_name: Dict[str, set] = defaultdict(set)
+        self.by_issue: Dict[int, str] = {}
+        self.by_pr: Dict[int, str] = {}
+        self.created_ts: Dict[str, float] = {}
+        self.updated_ts: Dict[str, float] = {}
+    
+    def add(self, card: ProjectCard):
+        if card.card_id in self.cards:
+            self.remove(card.card_id)
+        self.cards[card.card_id] = card
+        self.by_column_id[card.column_id].add(card.card_id)
+        self.by_column_name[card.column_name].add(card.card_id)
+        if card.issue_number is not None:
+            self.by_issue[card.issue_number] = card.card_id
+        if card.pr_number is not None:
+            self.by_pr[card.pr_number] = card.card_id
+        self.created_ts[card.card_id] = parse_timestamp(card.created_at)
+        self.updated_ts[card.card_id] = parse_timestamp(card.updated_at)
+        self._emit('card_added', card, ts=self.updated_ts[card.card_id])
+    
+    def remove(self, card_id: str) -> Optional[ProjectCard]:
+        card = self.cards.pop(card_id, None)
+        if card is None:
+            return None
+        self._emit('card_removed', card, ts=time.time())
+        self.by_column_id[card.column_id].discard(card_id)
+        self.by_column_name[card.column_name].discard(card_id)
+        if self.by_issue.get(card.issue_number) == card_id:
+            del self.by_issue[card.issue_number]
+        if self.by_pr.get(card.pr_number) == card_id:
+            del self.by_pr[card.pr_number]
+        self.created_ts.pop(card_id, None)
+        self.updated_ts.pop(card_id, None)
+        return card
+    
+    def move(self, card_id: str, column_id: str, column_name: str, updated_at: str = None):
+        card = self.cards[card_id]
+        from_column_id, from_column_name = card.column_id, card.column_name
+        self.by_column_id[card.column_id].discard(card_id)
+        self.by_column_name[card.column_name].discard(card_id)
+        card.column_id = column_id
+        card.column_name = column_name
+        card.updated_at = updated_at or datetime.now().isoformat()
+        self.by_column_id[column_id].add(card_id)
+        self.by_column_name[column_name].add(card_id)
+        self.updated_ts[card_id] = parse_timestamp(card.updated_at)
+        self._emit('card_moved', card, ts=self.updated_ts[card_id],
+                   from_column_id=from_column_id, from_column_name=from_column_name)
+    
+    def _emit(self, event_type: str, card: ProjectCard, ts: float, **extra):
+        if self.metrics is None:
+            return
+        self.metrics.apply({
+            'type': event_type,
+            'card_id': card.card_id,
+            'column_id': card.column_id,
+            'column_name': card.column_name,
+            'issue_number': card.issue_number,
+            'created_ts': self.created_ts.get(card.card_id, ts),
+            'ts': ts,
+            **extra
+        })
+    
+    def touch(self, card_id: str, updated_at: str = None):
+        card = self.cards[card_id]
+        card.updated_at = updated_at or datetime.now().isoformat()
+        self.updated_ts[card_id] = parse_timestamp(card.updated_at)
+    
+    def card_for_issue(self, issue_number: int) -> Optional[ProjectCard]:
+        card_id = self.by_issue.get(issue_number)
+        return self.cards.get(card_id) if card_id else None
+    
+    def card_for_pr(self, pr_number: int) -> Optional[ProjectCard]:
+        card_id = self.by_pr.get(pr_number)
+        return self.cards.get(card_id) if card_id else None
+    
+    def in_column(self, column_name: str) -> List[ProjectCard]:
+        return [self.cards[card_id] for card_id in self.by_column_name.get(column_name, ())]
+    
+    def count_in_column(self, column_id: str) -> int:
+        return len(self.by_column_id.get(column_id, ()))
+
 
 class ProjectBoardAgent:
     """Main agent for GitHub Projects management"""
@@ -100,7 +209,11 @@ class ProjectBoardAgent:
     def __init__(self, owner: str = "stevesurles"):
         self.owner = owner
         self.projects = {}
-        self.cards = {}
+        self.board_metrics = BoardMetrics(done_column=ColumnType.DONE.value)
+        self.board = BoardModel(self.board_metrics)
+        self.cards = self.board.cards
+        self.issue_cache = {}  # (repo, issue_number) -> issue details, kept current by webhooks
+        self.project_for_column = {}  # column_id -> project_id
         self.sprints = {}
         self.active_sprint = None
         
@@ -140,6 +253,9 @@ class ProjectBoardAgent:
             'trivial': 1
         }
         
+        # Batched GraphQL mutations per request
+        self.mutation_batch_size = 50
+        
         # Monitoring
         self.monitor_interval = 30
         self.monitoring = True
@@ -151,9 +267,6 @@ class ProjectBoardAgent:
             'total_cards': 0,
             'cards_moved': 0,
             'sprints_completed': 0,
-            'avg_cycle_time': 0,
-            'throughput': [],
-            'cycle_times': [],
             'velocity_trend': []
         }
     
@@ -183,10 +296,12 @@ class ProjectBoardAgent:
                 
                 # Create columns
                 column_ids = {}
+                column_node_ids = {}
                 for column_name in columns:
-                    column_id = self._create_column(project_id, column_name)
-                    if column_id:
-                        column_ids[column_name] = column_id
+                    column = self._create_column(project_id, column_name)
+                    if column:
+                        column_ids[column_name] = column['id']
+                        column_node_ids[column_name] = column['node_id']
                 
                 # Create project object
                 project = ProjectBoard(
@@ -198,10 +313,12 @@ class ProjectBoardAgent:
                     updated_at=datetime.now().isoformat(),
                     columns=column_ids,
                     cards_count=0,
-                    repository=repository
+                    repository=repository,
+                    column_node_ids=column_node_ids
                 )
                 
                 self.projects[project_id] = project
+                self._index_project_columns(project)
                 self.metrics['total_projects'] += 1
                 
                 logger.info(f"Created project: {name} (ID: {project_id})")
@@ -212,8 +329,12 @@ class ProjectBoardAgent:
         
         return None
     
-    def _create_column(self, project_id: str, column_name: str) -> Optional[str]:
-        """Create a project column"""
+    def _index_project_columns(self, project: ProjectBoard):
+        for column_id in project.columns.values():
+            self.project_for_column[column_id] = project.id
+    
+    def _create_column(self, project_id: str, column_name: str) -> Optional[Dict[str, str]]:
+        """Create a project column; returns its REST id and GraphQL node id"""
         try:
             result = subprocess.run(
                 ['gh', 'api', f'projects/{project_id}/columns',
@@ -226,7 +347,7 @@ class ProjectBoardAgent:
             if result.returncode == 0:
                 data = json.loads(result.stdout)
                 logger.info(f"Created column '{column_name}' in project {project_id}")
-                return data['id']
+                return {'id': data['id'], 'node_id': data.get('node_id')}
                 
         except Exception as e:
             logger.error(f"Failed to create column: {e}")
@@ -248,82 +369,148 @@ class ProjectBoardAgent:
             return None
         
         try:
-            # Get issue details first
+            # Get issue details first (cached from earlier batches and webhooks)
             issue_data = self._get_issue_details(repo, issue_number)
             if not issue_data:
                 return None
             
-            # Create card in project
-            column_id = project.columns[target_column]
-            
-            result = subprocess.run(
-                ['gh', 'api', f'projects/columns/{column_id}/cards',
-                 '--method', 'POST',
-                 '--field', f'content_id={issue_data["id"]}',
-                 '--field', 'content_type=Issue'],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                card_data = json.loads(result.stdout)
-                
-                # Create card object
-                card = ProjectCard(
-                    card_id=str(card_data['id']),
-                    column_id=column_id,
-                    column_name=target_column,
-                    content_type=CardType.ISSUE,
-                    content_url=card_data.get('content_url'),
-                    issue_number=issue_number,
-                    pr_number=None,
-                    note=None,
-                    created_at=card_data['created_at'],
-                    updated_at=card_data['updated_at'],
-                    position=0,
-                    creator=card_data.get('creator', {}).get('login', 'unknown'),
-                    labels=issue_data.get('labels', []),
-                    assignees=issue_data.get('assignees', [])
-                )
-                
-                self.cards[card.card_id] = card
-                project.cards_count += 1
-                self.metrics['total_cards'] += 1
-                
-                logger.info(f"Added issue #{issue_number} to {target_column} column")
-                return card
+            return self._create_issue_card(project, target_column, issue_number, issue_data)
                 
         except Exception as e:
             logger.error(f"Failed to add issue to board: {e}")
         
         return None
     
-    def _get_issue_details(self, repo: str, issue_number: int) -> Optional[Dict]:
-        """Get issue details from GitHub"""
-        try:
-            result = subprocess.run(
-                ['gh', 'issue', 'view', str(issue_number),
-                 '--repo', f'{self.owner}/{repo}',
-                 '--json', 'id,title,labels,assignees,state'],
-                capture_output=True,
-                text=True
+    def add_issues_to_board(self, project_id: str, repo: str,
+                            issue_numbers: List[int], column: str = None) -> List[ProjectCard]:
+        """Add many issues to a project board, fetching their details in one query"""
+        if project_id not in self.projects:
+            logger.error(f"Project {project_id} not found")
+            return []
+        
+        project = self.projects[project_id]
+        target_column = column or ColumnType.BACKLOG.value
+        if target_column not in project.columns:
+            logger.error(f"Column '{target_column}' not found in project")
+            return []
+        
+        details = self._get_issues_details(repo, issue_numbers)
+        cards = []
+        for issue_number in issue_numbers:
+            if issue_number not in details:
+                logger.warning(f"Issue #{issue_number} not found in {repo}")
+                continue
+            try:
+                card = self._create_issue_card(project, target_column, issue_number, details[issue_number])
+                if card:
+                    cards.append(card)
+            except Exception as e:
+                logger.error(f"Failed to add issue #{issue_number} to board: {e}")
+        return cards
+    
+    def _create_issue_card(self, project: ProjectBoard, target_column: str,
+                           issue_number: int, issue_data: Dict) -> Optional[ProjectCard]:
+        """Create a card for an issue in a column and index it"""
+        # Create card in project
+        column_id = project.columns[target_column]
+        
+        result = subprocess.run(
+            ['gh', 'api', f'projects/columns/{column_id}/cards',
+             '--method', 'POST',
+             '--field', f'content_id={issue_data["database_id"]}',
+             '--field', 'content_type=Issue'],
+            capture_output=True,
+            text=True
+        )
+        
+        if result.returncode == 0:
+            card_data = json.loads(result.stdout)
+            
+            # Create card object
+            card = ProjectCard(
+                card_id=str(card_data['id']),
+                column_id=column_id,
+                column_name=target_column,
+                content_type=CardType.ISSUE,
+                content_url=card_data.get('content_url'),
+                issue_number=issue_number,
+                pr_number=None,
+                note=None,
+                created_at=card_data['created_at'],
+                updated_at=card_data['updated_at'],
+                position=0,
+                creator=card_data.get('creator', {}).get('login', 'unknown'),
+                labels=issue_data.get('labels', []),
+                assignees=issue_data.get('assignees', []),
+                node_id=card_data.get('node_id')
             )
             
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                return {
-                    'id': data['id'],
-                    'title': data['title'],
-                    'labels': [l['name'] for l in data.get('labels', [])],
-                    'assignees': [a['login'] for a in data.get('assignees', [])],
-                    'state': data['state']
-                }
-                
-        except Exception as e:
-            logger.error(f"Failed to get issue details: {e}")
+            self.board.add(card)
+            self.project_for_column[column_id] = project.id
+            project.cards_count += 1
+            self.metrics['total_cards'] += 1
+            
+            logger.info(f"Added issue #{issue_number} to {target_column} column")
+            return card
         
         return None
     
+    def _get_issue_details(self, repo: str, issue_number: int) -> Optional[Dict]:
+        """Get issue details from GitHub (cached)"""
+        cached = self.issue_cache.get((repo, issue_number))
+        if cached:
+            return cached
+        return self._get_issues_details(repo, [issue_number]).get(issue_number)
+    
+    def _get_issues_details(self, repo: str, issue_numbers: List[int]) -> Dict[int, Dict]:
+        """Get details for many issues with aliased GraphQL lookups, using the cache where possible"""
+        details = {}
+        missing = []
+        for issue_number in issue_numbers:
+            cached = self.issue_cache.get((repo, issue_number))
+            if cached:
+                details[issue_number] = cached
+            else:
+                missing.append(issue_number)
+        
+        for start in range(0, len(missing), self.mutation_batch_size):
+            chunk = missing[start:start + self.mutation_batch_size]
+            aliases = " ".join(
+                f"i{number}: issue(number: {number}) {{ id databaseId number title state "
+                f"labels(first: 50) {{ nodes {{ name }} }} assignees(first: 20) {{ nodes {{ login }} }} }}"
+                for number in chunk
+            )
+            query = f'query {{ repository(owner: "{self.owner}", name: "{repo}") {{ {aliases} }} }}'
+            try:
+                result = subprocess.run(
+                    ['gh', 'api', 'graphql', '-f', f'query={query}'],
+                    capture_output=True,
+                    text=True
+                )
+                if result.returncode != 0 and not result.stdout:
+                    logger.error(f"Failed to get issue details: {result.stderr}")
+                    continue
+                
+                repository = (json.loads(result.stdout).get('data') or {}).get('repository') or {}
+                for data in repository.values():
+                    if not data:
+                        continue
+                    issue = {
+                        'id': data['id'],
+                        'database_id': data['databaseId'],
+                        'title': data['title'],
+                        'labels': [l['name'] for l in data['labels']['nodes']],
+                        'assignees': [a['login'] for a in data['assignees']['nodes']],
+                        'state': data['state']
+                    }
+                    self.issue_cache[(repo, data['number'])] = issue
+                    details[data['number']] = issue
+                    
+            except Exception as e:
+                logger.error(f"Failed to get issue details: {e}")
+        
+        return details
+    
     def move_card(self, card_id: str, target_column: str, 
                  position: str = "top") -> bool:
         """Move a card to a different column"""
@@ -333,26 +520,10 @@ class ProjectBoardAgent:
         
         card = self.cards[card_id]
         
-        # Find target column ID
-        target_column_id = None
-        for project in self.projects.values():
-            if target_column in project.columns:
-                target_column_id = project.columns[target_column]
-                break
-        
+        target_column_id = self._resolve_target_column(card, target_column)
         if not target_column_id:
-            logger.error(f"Target column '{target_column}' not found")
             return False
         
-        # Check workflow transition validity
-        current_col = ColumnType(card.column_name)
-        target_col = ColumnType(target_column)
-        
-        if target_col not in self.workflow_transitions.get(current_col, []) and \
-           current_col != target_col:
-            logger.warning(f"Invalid transition from {current_col.value} to {target_col.value}")
-            # Allow the move anyway for flexibility
-        
         try:
             result = subprocess.run(
                 ['gh', 'api', f'projects/columns/cards/{card_id}/moves',
@@ -364,22 +535,7 @@ class ProjectBoardAgent:
             )
             
             if result.returncode == 0:
-                # Update card
-                old_column = card.column_name
-                card.column_id = target_column_id
-                card.column_name = target_column
-                card.updated_at = datetime.now().isoformat()
-                
-                # Track cycle time
-                if target_column == ColumnType.DONE.value:
-                    created = datetime.fromisoformat(card.created_at.replace('Z', '+00:00'))
-                    cycle_time = (datetime.now() - created).total_seconds() / 3600  # hours
-                    self.metrics['cycle_times'].append(cycle_time)
-                    self.metrics['avg_cycle_time'] = sum(self.metrics['cycle_times']) / len(self.metrics['cycle_times'])
-                
-                self.metrics['cards_moved'] += 1
-                
-                logger.info(f"Moved card {card_id} from {old_column} to {target_column}")
+                self._apply_move(card, target_column_id, target_column)
                 return True
                 
         except Exception as e:
@@ -387,6 +543,100 @@ class ProjectBoardAgent:
         
         return False
     
+    def _resolve_target_column(self, card: ProjectCard, target_column: str) -> Optional[str]:
+        """Column id of target_column on the card's own board, after a workflow check"""
+        project = self.projects.get(self.project_for_column.get(card.column_id))
+        if project and target_column in project.columns:
+            target_column_id = project.columns[target_column]
+        else:
+            # Card's board unknown: fall back to the first board with that column
+            target_column_id = None
+            for project in self.projects.values():
+                if target_column in project.columns:
+                    target_column_id = project.columns[target_column]
+                    break
+        
+        if not target_column_id:
+            logger.error(f"Target column '{target_column}' not found")
+            return None
+        
+        # Check workflow transition validity
+        current_col = ColumnType(card.column_name)
+        target_col = ColumnType(target_column)
+        
+        if target_col not in self.workflow_transitions.get(current_col, []) and \
+           current_col != target_col:
+            logger.warning(f"Invalid transition from {current_col.value} to {target_col.value}")
+            # Allow the move anyway for flexibility
+        
+        return target_column_id
+    
+    def _apply_move(self, card: ProjectCard, target_column_id: str, target_column: str):
+        """Record a successful move in the board model and metrics"""
+        old_column = card.column_name
+        self.board.move(card.card_id, target_column_id, target_column)
+        
+        # Cycle time, throughput and burndown follow from the move event (see BoardMetrics)
+        self.metrics['cards_moved'] += 1
+        
+        logger.info(f"Moved card {card.card_id} from {old_column} to {target_column}")
+    
+    def move_cards(self, moves: List[Tuple[str, str]]) -> Dict[str, bool]:
+        """Move many cards with batched GraphQL moveProjectCard mutations
+        
+        moves is a list of (card_id, target_column). Cards without GraphQL node
+        ids fall back to one REST call each. Returns success per card id.
+        """
+        results = {}
+        batch = []  # (card, target_column_id, target_column, card_node_id, column_node_id)
+        for card_id, target_column in moves:
+            card = self.cards.get(card_id)
+            if not card:
+                logger.error(f"Card {card_id} not found")
+                results[card_id] = False
+                continue
+            
+            target_column_id = self._resolve_target_column(card, target_column)
+            if not target_column_id:
+                results[card_id] = False
+                continue
+            
+            project = self.projects.get(self.project_for_column.get(target_column_id))
+            column_node_id = project.column_node_ids.get(target_column) if project else None
+            if card.node_id and column_node_id:
+                batch.append((card, target_column_id, target_column, card.node_id, column_node_id))
+            else:
+                results[card_id] = self.move_card(card_id, target_column)
+        
+        for start in range(0, len(batch), self.mutation_batch_size):
+            chunk = batch[start:start + self.mutation_batch_size]
+            mutations = " ".join(
+                f'm{index}: moveProjectCard(input: {{cardId: "{card_node_id}", columnId: "{column_node_id}"}}) '
+                f'{{ cardEdge {{ node {{ id }} }} }}'
+                for index, (_, _, _, card_node_id, column_node_id) in enumerate(chunk)
+            )
+            try:
+                result = subprocess.run(
+                    ['gh', 'api', 'graphql', '-f', f'query=mutation {{ {mutations} }}'],
+                    capture_output=True,
+                    text=True
+                )
+                data = (json.loads(result.stdout).get('data') or {}) if result.stdout else {}
+            except Exception as e:
+                logger.error(f"Failed to move cards: {e}")
+                data = {}
+            
+            # Each alias succeeds or fails on its own
+            for index, (card, target_column_id, target_column, _, _) in enumerate(chunk):
+                if data.get(f'm{index}'):
+                    self._apply_move(card, target_column_id, target_column)
+                    results[card.card_id] = True
+                else:
+                    logger.error(f"Failed to move card {card.card_id} to {target_column}")
+                    results[card.card_id] = False
+        
+        return results
+    
     def create_sprint(self, name: str, goal: str, 
                      project_id: str, duration_days: int = None) -> Optional[Sprint]:
         """Create a new sprint"""
@@ -435,24 +685,28 @@ class ProjectBoardAgent:
         sprint = self.sprints[sprint_id]
         
         # Calculate total points
-        total_points = sum(story_points.values())
+        issue_points = {issue_num: story_points.get(issue_num, DEFAULT_STORY_POINTS)
+                        for issue_num in issue_numbers}
+        total_points = sum(issue_points.values())
         
         # Check against velocity
         if total_points > sprint.velocity * 1.2:  # Allow 20% over velocity
             logger.warning(f"Sprint overcommitted: {total_points} points vs {sprint.velocity} velocity")
         
         sprint.issues = issue_numbers
+        sprint.story_points = {str(issue_num): points for issue_num, points in issue_points.items()}
         sprint.planned_points = total_points
         sprint.status = 'planning'
+        self.board_metrics.plan_sprint(sprint_id, issue_points,
+                                       parse_timestamp(sprint.start_date), parse_timestamp(sprint.end_date))
         
-        # Move issues to TODO column
-        project = self.projects[sprint.project_id]
+        # Move issues to TODO column in batches
+        moves = []
         for issue_num in issue_numbers:
-            # Find card for issue
-            for card in self.cards.values():
-                if card.issue_number == issue_num:
-                    self.move_card(card.card_id, ColumnType.TODO.value)
-                    break
+            card = self.board.card_for_issue(issue_num)
+            if card:
+                moves.append((card.card_id, ColumnType.TODO.value))
+        self.move_cards(moves)
         
         logger.info(f"Planned sprint {sprint_id} with {len(issue_numbers)} issues, {total_points} points")
         return True
@@ -471,6 +725,8 @@ class ProjectBoardAgent:
         sprint.status = 'active'
         sprint.start_date = datetime.now().isoformat()
         self.active_sprint = sprint_id
+        self.board_metrics.start_sprint(sprint_id, parse_timestamp(sprint.start_date),
+                                        parse_timestamp(sprint.end_date))
         
         # Initialize burndown data
         sprint.burndown_data = [{
@@ -489,32 +745,24 @@ class ProjectBoardAgent:
         
         sprint = self.sprints[sprint_id]
         
-        # Calculate remaining points
-        remaining_points = sprint.planned_points
-        
-        # Check completed issues
-        for issue_num in sprint.issues:
-            for card in self.cards.values():
-                if card.issue_number == issue_num and \
-                   card.column_name == ColumnType.DONE.value:
-                    # Subtract points for completed issue
-                    # (Would need story points from issue labels or custom field)
-                    remaining_points -= 3  # Default 3 points
-        
-        # Calculate ideal burndown
-        days_elapsed = (datetime.now() - datetime.fromisoformat(sprint.start_date)).days
-        days_total = (datetime.fromisoformat(sprint.end_date) - 
-                     datetime.fromisoformat(sprint.start_date)).days
-        ideal_points = sprint.planned_points * (1 - days_elapsed / days_total)
-        
-        # Add data point
-        sprint.burndown_data.append({
+        # Remaining points are maintained by BoardMetrics as cards move
+        report = self.board_metrics.sprint_report(sprint_id)
+        if not report:
+            return
+        
+        # One data point per day: later updates on the same day replace it,
+        # keeping the sprint's starting point
+        point = {
             'date': datetime.now().isoformat(),
-            'remaining_points': remaining_points,
-            'ideal_points': max(0, ideal_points)
-        })
+            'remaining_points': report['remaining_points'],
+            'ideal_points': report['ideal_points']
+        }
+        if len(sprint.burndown_data) > 1 and sprint.burndown_data[-1]['date'][:10] == point['date'][:10]:
+            sprint.burndown_data[-1] = point
+        else:
+            sprint.burndown_data.append(point)
         
-        sprint.completed_points = sprint.planned_points - remaining_points
+        sprint.completed_points = report['completed_points']
     
     def complete_sprint(self, sprint_id: str) -> Dict[str, Any]:
         """Complete a sprint and generate retrospective data"""
@@ -525,21 +773,12 @@ class ProjectBoardAgent:
         sprint.status = 'completed'
         sprint.end_date = datetime.now().isoformat()
         
-        # Calculate sprint metrics
-        completed_issues = []
-        incomplete_issues = []
-        
-        for issue_num in sprint.issues:
-            completed = False
-            for card in self.cards.values():
-                if card.issue_number == issue_num:
-                    if card.column_name == ColumnType.DONE.value:
-                        completed_issues.append(issue_num)
-                        completed = True
-                    break
-            
-            if not completed:
-                incomplete_issues.append(issue_num)
+        # Freeze the sprint's running totals
+        self.update_burndown(sprint_id)
+        done = self.board_metrics.completed_issues(sprint_id)
+        self.board_metrics.close_sprint(sprint_id)
+        completed_issues = [issue_num for issue_num in sprint.issues if issue_num in done]
+        incomplete_issues = [issue_num for issue_num in sprint.issues if issue_num not in done]
         
         # Update velocity history
         self.velocity_history.append(sprint.completed_points)
@@ -593,41 +832,109 @@ class ProjectBoardAgent:
     def _handle_pr_merged(self, repo: str, pr_number: int):
         """Handle PR merged automation"""
         # Move related issue to Testing
-        # Find card for PR
-        for card in self.cards.values():
-            if card.pr_number == pr_number:
-                self.move_card(card.card_id, ColumnType.TESTING.value)
-                break
+        card = self.board.card_for_pr(pr_number)
+        if card:
+            self.move_card(card.card_id, ColumnType.TESTING.value)
     
     def _handle_issue_closed(self, repo: str, issue_number: int):
         """Handle issue closed automation"""
         # Move to Done column
-        for card in self.cards.values():
-            if card.issue_number == issue_number:
-                self.move_card(card.card_id, ColumnType.DONE.value)
-                
-                # Update sprint if active
-                if self.active_sprint:
-                    self.update_burndown(self.active_sprint)
-                break
+        card = self.board.card_for_issue(issue_number)
+        if card:
+            self.move_card(card.card_id, ColumnType.DONE.value)
+            
+            # Update sprint if active
+            if self.active_sprint:
+                self.update_burndown(self.active_sprint)
     
     def _handle_review_requested(self, repo: str, pr_number: int):
         """Handle review requested automation"""
         # Move to In Review column
-        for card in self.cards.values():
-            if card.pr_number == pr_number:
-                self.move_card(card.card_id, ColumnType.IN_REVIEW.value)
-                break
+        card = self.board.card_for_pr(pr_number)
+        if card:
+            self.move_card(card.card_id, ColumnType.IN_REVIEW.value)
     
     def _handle_review_completed(self, repo: str, pr_number: int, approved: bool):
         """Handle review completed automation"""
-        for card in self.cards.values():
-            if card.pr_number == pr_number:
-                if approved:
-                    self.move_card(card.card_id, ColumnType.TESTING.value)
-                else:
-                    self.move_card(card.card_id, ColumnType.IN_PROGRESS.value)
-                break
+        card = self.board.card_for_pr(pr_number)
+        if card:
+            if approved:
+                self.move_card(card.card_id, ColumnType.TESTING.value)
+            else:
+                self.move_card(card.card_id, ColumnType.IN_PROGRESS.value)
+    
+    def handle_webhook_event(self, event_type: str, payload: Dict[str, Any]):
+        """Keep the board model and issue cache in sync from GitHub webhook events"""
+        action = payload.get('action')
+        
+        if event_type == 'project_card':
+            card_data = payload.get('project_card', {})
+            card_id = str(card_data.get('id'))
+            column_id = card_data.get('column_id')
+            project_id = self.project_for_column.get(column_id)
+            
+            if action == 'deleted':
+                if self.board.remove(card_id) and project_id in self.projects:
+                    self.projects[project_id].cards_count -= 1
+                return
+            
+            column_name = None
+            if project_id:
+                column_name = next((name for name, cid in self.projects[project_id].columns.items()
+                                    if cid == column_id), None)
+            if column_name is None:
+                return  # Card on a board we don't manage
+            
+            card = self.cards.get(card_id)
+            if card and action == 'moved':
+                self.board.move(card_id, column_id, column_name, card_data.get('updated_at'))
+            elif card:
+                self.board.touch(card_id, card_data.get('updated_at'))
+            elif action in ('created', 'converted'):
+                content_url = card_data.get('content_url') or ''
+                number = int(content_url.rstrip('/').split('/')[-1]) if content_url else None
+                is_pr = '/pulls/' in content_url
+                self.board.add(ProjectCard(
+                    card_id=card_id,
+                    column_id=column_id,
+                    column_name=column_name,
+                    content_type=CardType.PULL_REQUEST if is_pr else (CardType.ISSUE if number else CardType.NOTE),
+                    content_url=content_url or None,
+                    issue_number=None if is_pr else number,
+                    pr_number=number if is_pr else None,
+                    note=card_data.get('note'),
+                    created_at=card_data.get('created_at', datetime.now().isoformat()),
+                    updated_at=card_data.get('updated_at', datetime.now().isoformat()),
+                    position=0,
+                    creator=(card_data.get('creator') or {}).get('login', 'unknown'),
+                    labels=[],
+                    assignees=[],
+                    node_id=card_data.get('node_id')
+                ))
+                self.projects[project_id].cards_count += 1
+        
+        elif event_type == 'issues':
+            issue = payload.get('issue', {})
+            repo = payload.get('repository', {}).get('name')
+            details = {
+                'id': issue.get('node_id'),
+                'database_id': issue.get('id'),
+                'title': issue.get('title'),
+                'labels': [l['name'] for l in issue.get('labels', [])],
+                'assignees': [a['login'] for a in issue.get('assignees', [])],
+                'state': (issue.get('state') or '').upper()
+            }
+            self.issue_cache[(repo, issue.get('number'))] = details
+            
+            card = self.board.card_for_issue(issue.get('number'))
+            if card:
+                card.labels = details['labels']
+                card.assignees = details['assignees']
+            
+            if action == 'opened':
+                self._handle_new_issue(repo, issue['number'])
+            elif action == 'closed':
+                self._handle_issue_closed(repo, issue['number'])
     
     def get_board_overview(self, project_id: str) -> Dict[str, Any]:
         """Get project board overview"""
@@ -637,26 +944,15 @@ class ProjectBoardAgent:
         project = self.projects[project_id]
         
         # Count cards by column
-        column_counts = defaultdict(int)
-        for card in self.cards.values():
-            if card.column_name in project.columns:
-                column_counts[card.column_name] += 1
-        
-        # Calculate throughput
-        done_cards = [c for c in self.cards.values() 
-                     if c.column_name == ColumnType.DONE.value]
-        
-        # Weekly throughput
-        week_ago = datetime.now() - timedelta(days=7)
-        recent_done = [c for c in done_cards 
-                      if datetime.fromisoformat(c.updated_at.replace('Z', '+00:00')) > week_ago]
+        column_counts = {name: self.board.count_in_column(column_id)
+                         for name, column_id in project.columns.items()}
         
         return {
             'project_name': project.name,
             'total_cards': project.cards_count,
             'column_distribution': dict(column_counts),
-            'weekly_throughput': len(recent_done),
-            'avg_cycle_time': self.metrics['avg_cycle_time'],
+            'weekly_throughput': self.board_metrics.weekly_throughput(project.columns.get(ColumnType.DONE.value)),
+            'avg_cycle_time': self.board_metrics.avg_cycle_time(),
             'active_sprint': self.active_sprint,
             'state': project.state
         }
@@ -666,10 +962,12 @@ class ProjectBoardAgent:
         reports = {
             'projects': [],
             'sprints': [],
-            'metrics': self.metrics,
+            'metrics': {**self.metrics,
+                        'avg_cycle_time': self.board_metrics.avg_cycle_time(),
+                        'column_counts': dict(self.board_metrics.column_counts)},
             'velocity_trend': self.velocity_history[-10:],  # Last 10 sprints
-            'throughput_trend': [],
-            'cycle_time_distribution': {}
+            'throughput_trend': self.board_metrics.throughput_trend(),
+            'cycle_time_distribution': self.board_metrics.cycle_time_summary()
         }
         
         # Project summaries
@@ -682,26 +980,24 @@ class ProjectBoardAgent:
             })
         
         # Sprint summaries
+        sprint_reports = self.sprint_reports()
         for sprint in self.sprints.values():
+            report = sprint_reports.get(sprint.sprint_id)
             reports['sprints'].append({
                 'name': sprint.name,
                 'status': sprint.status,
                 'velocity': sprint.velocity,
-                'completion': sprint.completed_points / sprint.planned_points * 100 
-                            if sprint.planned_points > 0 else 0
+                'completion': report['completion_rate'] if report else
+                              (sprint.completed_points / sprint.planned_points * 100
+                               if sprint.planned_points > 0 else 0)
             })
         
-        # Cycle time distribution
-        if self.metrics['cycle_times']:
-            reports['cycle_time_distribution'] = {
-                'min': min(self.metrics['cycle_times']),
-                'max': max(self.metrics['cycle_times']),
-                'avg': self.metrics['avg_cycle_time'],
-                'median': sorted(self.metrics['cycle_times'])[len(self.metrics['cycle_times'])//2]
-            }
-        
         return reports
     
+    def sprint_reports(self, sprint_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Burndown figures for many sprints at once, read from the running totals"""
+        return self.board_metrics.sprint_reports(sprint_ids)
+    
     def monitor_boards(self):
         """Monitor project boards for updates"""
         logger.info("Starting project board monitoring...")
@@ -712,34 +1008,18 @@ class ProjectBoardAgent:
                 if self.active_sprint:
                     self.update_burndown(self.active_sprint)
                 
-                # Check for stale cards
-                for card in self.cards.values():
-                    if card.column_name == ColumnType.IN_PROGRESS.value:
-                        updated = datetime.fromisoformat(card.updated_at.replace('Z', '+00:00'))
-                        if datetime.now() - updated > timedelta(days=3):
-                            logger.warning(f"Card {card.card_id} has been in progress for >3 days")
-                
-                # Calculate throughput
-                done_today = 0
-                today = datetime.now().date()
-                for card in self.cards.values():
-                    if card.column_name == ColumnType.DONE.value:
-                        updated = datetime.fromisoformat(card.updated_at.replace('Z', '+00:00'))
-                        if updated.date() == today:
-                            done_today += 1
+                # Check for stale cards (timestamps are pre-parsed in the board model)
+                stale_before = time.time() - 3 * 86400
+                for card_id in self.board.by_column_name.get(ColumnType.IN_PROGRESS.value, ()):
+                    if self.board.updated_ts[card_id] < stale_before:
+                        logger.warning(f"Card {card_id} has been in progress for >3 days")
                 
-                if done_today > 0:
-                    self.metrics['throughput'].append({
-                        'date': today.isoformat(),
-                        'count': done_today
-                    })
-                
-                # Log status
-                active_cards = len([c for c in self.cards.values() 
-                                  if c.column_name in [ColumnType.IN_PROGRESS.value, 
-                                                       ColumnType.IN_REVIEW.value]])
+                # Log status (throughput is kept per day by BoardMetrics)
+                column_counts = self.board_metrics.column_counts
+                active_cards = (column_counts[ColumnType.IN_PROGRESS.value] +
+                                column_counts[ColumnType.IN_REVIEW.value])
                 logger.info(f"Monitoring: {len(self.projects)} projects, "
-                          f"{active_cards} active cards")
+                          f"{active_cards} active cards, {self.board_metrics.done_on()} done today")
                 
             except Exception as e:
                 logger.error(f"Error in monitoring loop: {e}")
@@ -768,7 +1048,8 @@ class ProjectBoardAgent:
             'sprints': {sid: asdict(s) for sid, s in self.sprints.items()},
             'active_sprint': self.active_sprint,
             'velocity_history': self.velocity_history,
-            'metrics': self.metrics
+            'metrics': self.metrics,
+            'board_metrics': self.board_metrics.to_dict()
         }
         
         # Convert enums to strings for JSON serialization
@@ -789,24 +1070,45 @@ class ProjectBoardAgent:
                 
                 # Restore projects
                 self.projects = {}
+                self.project_for_column = {}
                 for pid, pdata in state.get('projects', {}).items():
                     self.projects[pid] = ProjectBoard(**pdata)
+                    self._index_project_columns(self.projects[pid])
                 
-                # Restore cards
-                self.cards = {}
+                # Restore cards; without a metrics snapshot, replaying the
+                # card additions rebuilds the metrics from the board
+                snapshot = state.get('board_metrics')
+                self.board_metrics = BoardMetrics(done_column=ColumnType.DONE.value)
+                self.board = BoardModel(None if snapshot else self.board_metrics)
+                self.cards = self.board.cards
                 for cid, cdata in state.get('cards', {}).items():
                     # Convert string back to enum
                     cdata['content_type'] = CardType(cdata['content_type'])
-                    self.cards[cid] = ProjectCard(**cdata)
+                    self.board.add(ProjectCard(**cdata))
                 
                 # Restore sprints
                 self.sprints = {}
                 for sid, sdata in state.get('sprints', {}).items():
                     self.sprints[sid] = Sprint(**sdata)
                 
+                if snapshot:
+                    self.board_metrics = BoardMetrics.from_dict(snapshot, done_column=ColumnType.DONE.value)
+                    self.board.metrics = self.board_metrics
+                else:
+                    for sprint in self.sprints.values():
+                        if sprint.status != 'completed':
+                            issue_points = {issue_num: sprint.story_points.get(str(issue_num), DEFAULT_STORY_POINTS)
+                                            for issue_num in sprint.issues}
+                            self.board_metrics.plan_sprint(sprint.sprint_id, issue_points,
+                                                           parse_timestamp(sprint.start_date),
+                                                           parse_timestamp(sprint.end_date))
+                
                 self.active_sprint = state.get('active_sprint')
                 self.velocity_history = state.get('velocity_history', [])
-                self.metrics = state.get('metrics', self.metrics)
+                self.metrics.update(state.get('metrics', {}))
+                # Superseded by the daily series in BoardMetrics
+                for legacy_key in ('throughput', 'cycle_times', 'avg_cycle_time'):
+                    self.metrics.pop(legacy_key, None)
                 
                 logger.info(f"Agent state loaded: {len(self.projects)} projects, "
                           f"{len(self.cards)} cards, {len(self.sprints)} sprints")
@@ -847,7 +1149,7 @@ def main():
             reports = agent.generate_reports()
             logger.info(f"Status: {len(agent.projects)} projects, "
                        f"{len(agent.cards)} cards, "
-                       f"Avg cycle time: {agent.metrics['avg_cycle_time']:.1f} hours")
+                       f"Avg cycle time: {agent.board_metrics.avg_cycle_time():.1f} hours")
             
     except KeyboardInterrupt:
         logger.info("Shutting down...")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Project Snapshot - one walk of a project tree shared by every QA analyzer
+The tree is scanned once with os.scandir (pruning node_modules, VCS metadata,
+caches and virtualenvs) into an index of files with sizes and languages.
+File contents are loaded on first use and cached, so the test runner,
+security scanner, performance analyzer and compliance checker never walk or
+reread the project themselves. Content hashes (the keys of the QA results
+cache) are computed once per file as well.
+"""
+
+import fnmatch
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+sys.path.append(str(Path(__file__).parent))
+from qa_cache import content_hash, file_hash
+
+logger = logging.getLogger('ProjectSnapshot')
+
+SKIP_DIRS = frozenset({
+    'node_modules', '.git', '.hg', '.svn', '__pycache__', 'venv', '.venv',
+    '.tox', '.nox', '.mypy_cache', '.pytest_cache', 'site-packages'
+})
+
+LANGUAGE_BY_EXTENSION = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.jsx': 'javascript',
+    '.mjs': 'javascript',
+    '.ts': 'typescript',
+    '.tsx': 'typescript',
+    '.go': 'go',
+    '.java': 'java',
+    '.rb': 'ruby',
+    '.rs': 'rust',
+    '.cs': 'csharp'
+}
+
+TEST_FILE_PATTERNS = ['test_*.py', '*_test.py', '*.test.js', '*.spec.js', '*.test.ts', '*.spec.ts']
+
+# Contents above this size are read on demand and never kept in memory
+CONTENT_CACHE_LIMIT = 1024 * 1024
+
+
+def is_skipped_dir(entry: os.DirEntry) -> bool:
+    """node_modules, VCS metadata, caches and virtualenvs (whatever they are called)"""
+    if entry.name in SKIP_DIRS:
+        return True
+    return os.path.exists(os.path.join(entry.path, 'pyvenv.cfg'))
+
+
+def walk_project(root: Path, directories: Optional[List[str]] = None) -> Iterator[os.DirEntry]:
+    """Every regular file under root, pruning skipped directories without descending into them
+
+    Paths of the directories walked are appended to ``directories`` when given.
+    """
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if not is_skipped_dir(entry):
+                                stack.append(entry.path)
+                                if directories is not None:
+                                    directories.append(entry.path)
+                        elif entry.is_file():
+                            yield entry
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {e}")
+
+
+@dataclass
+class ProjectFile:
+    """One file of the snapshot"""
+    rel_path: str  # relative to the project root, OS separators
+    name: str
+    extension: str
+    size: int
+    language: Optional[str]
+
+
+class ProjectSnapshot:
+    """File index of a project with lazily cached contents"""
+
+    def __init__(self, root: str, cache_limit: int = CONTENT_CACHE_LIMIT):
+        self.root = Path(root)
+        self.cache_limit = cache_limit
+        self.files: List[ProjectFile] = []
+        self.by_path: Dict[str, ProjectFile] = {}
+        self.dirs: Set[str] = set()
+        self._contents: Dict[str, bytes] = {}
+        self._hashes: Dict[str, str] = {}
+
+        root_path = str(self.root)
+        directories: List[str] = []
+        for entry in walk_project(self.root, directories):
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            extension = os.path.splitext(entry.name)[1].lower()
+            project_file = ProjectFile(
+                rel_path=os.path.relpath(entry.path, root_path),
+                name=entry.name,
+                extension=extension,
+                size=size,
+                language=LANGUAGE_BY_EXTENSION.get(extension)
+            )
+            self.files.append(project_file)
+            self.by_path[project_file.rel_path] = project_file
+        self.dirs = {os.path.relpath(path, root_path) for path in directories}
+
+        logger.info(f"Snapshot of {self.root}: {len(self.files)} files, {self.total_size / 1024 / 1024:.1f} MB")
+
+    @property
+    def total_size(self) -> int:
+        return sum(project_file.size for project_file in self.files)
+
+    def rel_paths(self) -> List[str]:
+        return [project_file.rel_path for project_file in self.files]
+
+    def exists(self, rel_path: str) -> bool:
+        """A file or directory of the snapshot (paths use / or OS separators)"""
+        rel_path = os.path.normpath(rel_path)
+        return rel_path in self.by_path or rel_path in self.dirs
+
+    def with_extension(self, *extensions: str) -> List[ProjectFile]:
+        return [project_file for project_file in self.files if project_file.extension in extensions]
+
+    def with_language(self, language: str) -> List[ProjectFile]:
+        return [project_file for project_file in self.files if project_file.language == language]
+
+    def matching(self, patterns: List[str]) -> List[ProjectFile]:
+        """Files whose name matches any of the glob patterns"""
+        return [project_file for project_file in self.files
+                if any(fnmatch.fnmatch(project_file.name, pattern) for pattern in patterns)]
+
+    def test_files(self) -> List[str]:
+        return [project_file.rel_path for project_file in self.matching(TEST_FILE_PATTERNS)]
+
+    def read_bytes(self, rel_path: str) -> bytes:
+        """File contents; files up to cache_limit are read once and cached"""
+        data = self._contents.get(rel_path)
+        if data is None:
+            with open(self.root / rel_path, 'rb') as f:
+                data = f.read()
+            if len(data) <= self.cache_limit:
+                self._contents[rel_path] = data
+        return data
+
+    def cached_bytes(self, rel_path: str) -> Optional[bytes]:
+        """Contents of a file small enough to cache, or None for large ones (callers stream those)"""
+        project_file = self.by_path.get(rel_path)
+        if project_file is None or project_file.size > self.cache_limit:
+            return None
+        return self.read_bytes(rel_path)
+
+    def content_hash(self, rel_path: str) -> str:
+        """Hash of the file contents; large files are hashed without being loaded whole"""
+        digest = self._hashes.get(rel_path)
+        if digest is None:
+            data = self.cached_bytes(rel_path)
+            digest = content_hash(data) if data is not None else file_hash(self.root / rel_path)
+            self._hashes[rel_path] = digest
+        return digest
+
+    def read_text(self, rel_path: str, errors: str = 'strict') -> str:
+        return self.read_bytes(rel_path).decode('utf-8', errors=errors)
+
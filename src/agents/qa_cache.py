@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+QA Cache - content-addressed per-file results for the AI QA agent
+Analyzer results are stored per file under (analyzer, analyzer version,
+content hash) in SQLite (WAL mode), so a QA pass only re-analyzes files whose
+contents changed since any earlier pass - of this project or another one
+with the same file - and merges the cached results back in. Bumping an
+analyzer's version (or changing its rules) invalidates its entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger('QACache')
+
+QA_CACHE_DB = Path("qa_cache.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    analyzer TEXT NOT NULL,
+    version TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (analyzer, version, content_hash)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_results_last_used ON results (last_used);
+"""
+
+# SQLite's default limit on host parameters is 999 before 3.32
+_BATCH = 500
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+def file_hash(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """content_hash of a file without loading it whole"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def rules_version(base: str, rules: Iterable[Any]) -> str:
+    """Analyzer version that also changes whenever its rules do"""
+    return f"{base}-{content_hash(repr(list(rules)).encode())[:12]}"
+
+
+class QAResultCache:
+    """Per-file analyzer results keyed on content hash and analyzer version"""
+
+    def __init__(self, db_path: Path = QA_CACHE_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {'hits': 0, 'misses': 0})
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Per-thread connection (sqlite3 connections can't be shared across threads)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, analyzer: str, version: str, hashes: Iterable[str]) -> Dict[str, Any]:
+        """Cached results by content hash; hashes without an entry are absent"""
+        wanted = list(dict.fromkeys(hashes))
+        found: Dict[str, Any] = {}
+        conn = self._connect()
+        now = time.time()
+        for start in range(0, len(wanted), _BATCH):
+            batch = wanted[start:start + _BATCH]
+            placeholders = ','.join('?' * len(batch))
+            params = [analyzer, version] + batch
+            rows = conn.execute(
+                f"SELECT content_hash, result FROM results WHERE analyzer = ? AND version = ? "
+                f"AND content_hash IN ({placeholders})", params
+            ).fetchall()
+            for digest, result in rows:
+                found[digest] = json.loads(result)
+            if rows:
+                conn.execute(
+                    f"UPDATE results SET last_used = ? WHERE analyzer = ? AND version = ? "
+                    f"AND content_hash IN ({placeholders})", [now] + params
+                )
+        self.stats[analyzer]['hits'] += len(found)
+        self.stats[analyzer]['misses'] += len(wanted) - len(found)
+        return found
+
+    def put_many(self, analyzer: str, version: str, results: Dict[str, Any]):
+        """Store results by content hash (one transaction)"""
+        if not results:
+            return
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT OR REPLACE INTO results (analyzer, version, content_hash, result, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(analyzer, version, digest, json.dumps(result, separators=(',', ':')), now, now)
+                 for digest, result in results.items()]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def prune(self, max_age_days: int = 30) -> int:
+        """Drop entries unused for max_age_days; returns how many were removed"""
+        cursor = self._connect().execute(
+            "DELETE FROM results WHERE last_used < ?", (time.time() - max_age_days * 86400,)
+        )
+        return cursor.rowcount
+
+    def summary(self) -> str:
+        return ', '.join(f"{analyzer} {counts['hits']} cached/{counts['misses']} analyzed"
+                         for analyzer, counts in self.stats.items()) or 'unused'
+
+
+def default_cache() -> Optional[QAResultCache]:
+    """Cache at QA_CACHE_DB, or None when QA_CACHE=0 or the database can't be opened"""
+    if os.environ.get('QA_CACHE', '1') == '0':
+        return None
+    try:
+        return QAResultCache(Path(os.environ.get('QA_CACHE_DB', QA_CACHE_DB)))
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"QA results cache disabled: {e}")
+        return None
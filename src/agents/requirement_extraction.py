@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Requirement Extraction - one text-analysis pass shared by the architect's helpers
+The issue text is lowercased once and checked once against the whole keyword
+vocabulary (requirement triggers, domain, scale, stack and priority words);
+the requirement patterns are compiled at import and only run when their
+trigger occurs, starting from its first occurrence. The result is a single
+TextFeatures that extract_requirements and the analyze_context helpers read
+instead of rescanning the text.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import FrozenSet, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RequirementRule:
+    """One requirement pattern; trigger is the literal every match starts with"""
+    pattern: str
+    req_type: str
+    category: str
+    trigger: str
+    # Matches end with this literal: only lines containing it are searched, and
+    # only up to its last occurrence (a greedy .+ ending in it is quadratic on long lines)
+    suffix: Optional[str] = None
+
+
+FUNCTIONAL_RULES = [
+    RequirementRule(r"user should be able to (.+)", 'functional', 'user_capability', 'user should be able to '),
+    RequirementRule(r"system must (.+)", 'functional', 'system_requirement', 'system must '),
+    RequirementRule(r"application needs to (.+)", 'functional', 'application_requirement', 'application needs to '),
+    RequirementRule(r"feature requires (.+)", 'functional', 'feature_requirement', 'feature requires '),
+    RequirementRule(r"support for (.+)", 'functional', 'support_requirement', 'support for '),
+    RequirementRule(r"enable (.+)", 'functional', 'enablement', 'enable '),
+]
+
+NONFUNCTIONAL_RULES = [
+    RequirementRule(r"performance[:\s]+(.+)", 'performance', 'metric', 'performance'),
+    RequirementRule(r"should handle (\d+) requests?", 'performance', 'throughput', 'should handle '),
+    RequirementRule(r"response time[:\s]+(.+)", 'performance', 'latency', 'response time'),
+    RequirementRule(r"security[:\s]+(.+)", 'security', 'requirement', 'security'),
+    RequirementRule(r"scalability[:\s]+(.+)", 'scalability', 'requirement', 'scalability'),
+    RequirementRule(r"availability[:\s]+(.+)", 'availability', 'requirement', 'availability'),
+    RequirementRule(r"must be (.+compatible)", 'compatibility', 'requirement', 'must be ', suffix='compatible'),
+    RequirementRule(r"integrate with (.+)", 'integration', 'external_system', 'integrate with '),
+]
+
+ACCEPTANCE_MARKERS = ['acceptance criteria', 'definition of done']
+ACCEPTANCE_ITEM = re.compile(r"[-*]\s*(.+)")
+
+DOMAIN_KEYWORDS = {
+    'ecommerce': ['cart', 'payment', 'checkout', 'product', 'order'],
+    'analytics': ['dashboard', 'metrics', 'report', 'analytics', 'visualization'],
+    'social': ['user', 'profile', 'feed', 'comment', 'share'],
+    'enterprise': ['workflow', 'approval', 'permission', 'role', 'audit'],
+    'iot': ['sensor', 'device', 'telemetry', 'mqtt', 'real-time'],
+    'ml': ['model', 'training', 'prediction', 'dataset', 'algorithm']
+}
+
+SCALE_KEYWORDS = {
+    'large': ['million', 'high traffic', 'large scale', 'enterprise'],
+    'medium': ['thousand', 'medium scale', 'moderate']
+}
+
+TECH_KEYWORDS = {
+    'react': 'React',
+    'angular': 'Angular',
+    'vue': 'Vue.js',
+    'node': 'Node.js',
+    'python': 'Python',
+    'django': 'Django',
+    'flask': 'Flask',
+    'postgres': 'PostgreSQL',
+    'mongodb': 'MongoDB',
+    'redis': 'Redis',
+    'docker': 'Docker',
+    'kubernetes': 'Kubernetes',
+    'aws': 'AWS',
+    'azure': 'Azure',
+    'gcp': 'Google Cloud'
+}
+
+HIGH_PRIORITY_WORDS = ['critical', 'urgent', 'must', 'required', 'essential']
+LOW_PRIORITY_WORDS = ['nice to have', 'optional', 'future', 'consider']
+
+
+@dataclass
+class TextFeatures:
+    """Everything the architect's helpers need from an issue's text"""
+    text: str  # lowercased "title body"
+    keywords: FrozenSet[str]  # vocabulary entries occurring anywhere in text
+    # (rule, captured text) in rule order, then match order
+    matches: List[Tuple[RequirementRule, str]] = field(default_factory=list)
+    acceptance_criteria: List[str] = field(default_factory=list)
+
+    def has_any(self, words: Iterable[str]) -> bool:
+        return any(word in self.keywords for word in words)
+
+
+class RequirementTextAnalyzer:
+    """Compiled requirement rules and keyword vocabulary, applied in one pass per issue"""
+
+    def __init__(self, rules: Optional[List[RequirementRule]] = None):
+        self.rules = rules or FUNCTIONAL_RULES + NONFUNCTIONAL_RULES
+        # The text is lowercased first, so the patterns need no IGNORECASE
+        self.compiled = [re.compile(rule.pattern) for rule in self.rules]
+        vocabulary = [rule.trigger for rule in self.rules]
+        vocabulary += [rule.suffix for rule in self.rules if rule.suffix]
+        vocabulary += ACCEPTANCE_MARKERS
+        for words in list(DOMAIN_KEYWORDS.values()) + list(SCALE_KEYWORDS.values()):
+            vocabulary += words
+        vocabulary += list(TECH_KEYWORDS)
+        # str.find is faster per keyword than any combined regex over the text
+        self.vocabulary = tuple(dict.fromkeys(vocabulary))
+
+    def analyze(self, title: str, body: str) -> TextFeatures:
+        text = f"{title} {body}".lower()
+        keywords = frozenset(word for word in self.vocabulary if word in text)
+        features = TextFeatures(text=text, keywords=keywords)
+
+        for rule, pattern in zip(self.rules, self.compiled):
+            if rule.trigger not in keywords or (rule.suffix and rule.suffix not in keywords):
+                continue
+            if rule.suffix:
+                captures = []
+                for line in text.split('\n'):
+                    end = line.rfind(rule.suffix)
+                    if end != -1 and rule.trigger in line:
+                        captures.extend(pattern.findall(line, 0, end + len(rule.suffix)))
+            else:
+                # No match can start before the trigger's first occurrence
+                captures = pattern.findall(text, text.find(rule.trigger))
+            features.matches.extend((rule, capture) for capture in captures)
+
+        present = [marker for marker in ACCEPTANCE_MARKERS if marker in keywords]
+        if present:
+            criteria_section = text.split(present[0])[-1]
+            features.acceptance_criteria = ACCEPTANCE_ITEM.findall(criteria_section)
+        return features
+
+
+def determine_priority(text: str) -> str:
+    """Requirement priority from keywords in its text"""
+    text_lower = text.lower()
+    if any(word in text_lower for word in HIGH_PRIORITY_WORDS):
+        return 'high'
+    elif any(word in text_lower for word in LOW_PRIORITY_WORDS):
+        return 'low'
+    else:
+        return 'medium'
@@ -16,9 +16,14 @@ from typing import Dict, List, Any, Optional
 import schedule
 import threading
 import queue
+import sys
+from contextlib import contextmanager
+
+sys.path.append(str(Path(__file__).parent))
+from worktree_pool import WorktreePool
 
 class SDLCIteratorAgent:
-    def __init__(self):
+    def __init__(self, ref: Optional[str] = None):
         self.base_dir = Path("E:/Projects")
         self.state_file = self.base_dir / ".agent_state.pkl"
         self.retry_file = self.base_dir / ".agent_retry_queue.json"
@@ -26,6 +31,11 @@ class SDLCIteratorAgent:
         # SDLC phases in order
         self.sdlc_phases = ["develop", "test", "deploy", "document"]
         
+        # Phases run in the local checkouts; with a ref (e.g. origin/main) they run
+        # in pooled worktrees of that ref instead, leaving the checkouts untouched
+        self.ref = ref
+        self.worktree_pool = WorktreePool("stevesurles", root=self.base_dir / ".worktrees") if ref else None
+        
         # Load saved state if exists
         self.state = self.load_state()
         self.retry_queue = self.load_retry_queue()
@@ -205,20 +215,19 @@ Previous phases completed: {iteration * 4 + self.sdlc_phases.index(phase)}
             'ready_for_next': False
         }
         
-        service_path = self.base_dir / repo / service
-        
         try:
-            if phase == "develop":
-                results = self.execute_develop_phase(service, service_path, results)
-                
-            elif phase == "test":
-                results = self.execute_test_phase(service, service_path, results)
-                
-            elif phase == "deploy":
-                results = self.execute_deploy_phase(service, service_path, results)
-                
-            elif phase == "document":
-                results = self.execute_document_phase(service, service_path, results)
+            with self.service_checkout(repo, service) as service_path:
+                if phase == "develop":
+                    results = self.execute_develop_phase(service, service_path, results)
+                    
+                elif phase == "test":
+                    results = self.execute_test_phase(service, service_path, results)
+                    
+                elif phase == "deploy":
+                    results = self.execute_deploy_phase(service, service_path, results)
+                    
+                elif phase == "document":
+                    results = self.execute_document_phase(service, service_path, results)
             
             # Check if phase passed
             results['ready_for_next'] = self.check_phase_success(phase, results)
@@ -232,6 +241,37 @@ Previous phases completed: {iteration * 4 + self.sdlc_phases.index(phase)}
         
         return results
     
+    @contextmanager
+    def service_checkout(self, repo: str, service: str):
+        """Path of the service in the local checkout, or in a leased worktree of self.ref"""
+        if not self.ref:
+            yield self.base_dir / repo / service
+            return
+        
+        with self.worktree_pool.worktree(repo, self.ref) as worktree:
+            service_path = worktree / service
+            self.prepare_service(service_path)
+            yield service_path
+    
+    def prepare_service(self, path: Path):
+        """Install node dependencies once per worktree (they survive worktree reuse)"""
+        if (path / "package.json").exists() and not (path / "node_modules").exists():
+            command = "npm ci" if (path / "package-lock.json").exists() else "npm install"
+            subprocess.run(command, shell=True, capture_output=True, text=True, cwd=str(path), timeout=600)
+    
+    def last_modified(self, path: Path) -> float:
+        """Modification time of a file; its last commit time in a worktree (checkouts reset mtimes)"""
+        if not self.ref:
+            return path.stat().st_mtime
+        
+        result = subprocess.run(
+            ['git', 'log', '-1', '--format=%ct', '--', path.name],
+            capture_output=True, text=True, cwd=str(path.parent)
+        )
+        if result.returncode == 0 and result.stdout.strip():
+            return float(result.stdout.strip())
+        return path.stat().st_mtime
+    
     def execute_develop_phase(self, service: str, path: Path, results: Dict) -> Dict:
         """Execute development phase"""
         
@@ -386,7 +426,7 @@ Previous phases completed: {iteration * 4 + self.sdlc_phases.index(phase)}
                 results['metrics'][metric_name] = True
                 
                 # Check if recently updated
-                mod_time = (path / doc_file).stat().st_mtime
+                mod_time = self.last_modified(path / doc_file)
                 days_old = (time.time() - mod_time) / 86400
                 
                 if days_old > 30:
@@ -755,10 +795,11 @@ def main():
     parser.add_argument('--continuous', action='store_true', help='Run continuous iteration')
     parser.add_argument('--check-retries', action='store_true', help='Check retry queue')
     parser.add_argument('--reset', action='store_true', help='Reset all state')
+    parser.add_argument('--ref', help='Run phases against this git ref (e.g. origin/main) instead of the local checkout')
     
     args = parser.parse_args()
     
-    agent = SDLCIteratorAgent()
+    agent = SDLCIteratorAgent(ref=args.ref)
     
     if args.reset:
         agent.state = {
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+Security Scan - single-pass, parallel pattern scanning of project sources
+Each language's rules are compiled once into a single alternation with a
+named group per rule, so a file is searched in one pass instead of once per
+rule per line; only the lines that hit are rechecked rule by rule. Files are
+read once (memory-mapped above a size threshold), the tree walk prunes
+node_modules, VCS metadata and virtualenvs instead of filtering afterwards,
+and large projects are spread over a process pool. With a QA results cache,
+files whose contents were already scanned with the same rules are not
+scanned again.
+"""
+
+import logging
+import mmap
+import os
+import re
+import sys
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+sys.path.append(str(Path(__file__).parent))
+from project_snapshot import walk_project
+from qa_cache import QAResultCache, rules_version
+
+logger = logging.getLogger('SecurityScan')
+
+
+@dataclass(frozen=True)
+class SecurityRule:
+    """One pattern and the issue it reports"""
+    pattern: str
+    issue_type: str
+    severity: str
+    recommendation: str
+
+
+PYTHON_RULES = [
+    SecurityRule(r'eval\s*\(', 'Use of eval()', 'critical', 'Avoid using eval() as it can execute arbitrary code'),
+    SecurityRule(r'exec\s*\(', 'Use of exec()', 'critical', 'Avoid using exec() as it can execute arbitrary code'),
+    SecurityRule(r'pickle\.loads?\s*\(', 'Unsafe deserialization', 'high', 'Use safer serialization formats like JSON'),
+    SecurityRule(r'os\.system\s*\(', 'Command injection risk', 'high', 'Use subprocess with proper input validation'),
+    SecurityRule(r'subprocess.*shell\s*=\s*True', 'Shell injection risk', 'high', 'Avoid shell=True in subprocess calls'),
+    SecurityRule(r'SECRET_KEY\s*=\s*["\'][\w]+["\']', 'Hardcoded secrets', 'high', 'Use environment variables for secrets'),
+    SecurityRule(r'password\s*=\s*["\'][\w]+["\']', 'Hardcoded password', 'critical', 'Never hardcode passwords'),
+    SecurityRule(r'verify\s*=\s*False', 'SSL verification disabled', 'medium', 'Always verify SSL certificates'),
+]
+
+JAVASCRIPT_RULES = [
+    SecurityRule(r'eval\s*\(', 'Use of eval()', 'critical', 'Avoid using eval() as it can execute arbitrary code'),
+    SecurityRule(r'innerHTML\s*=', 'XSS vulnerability', 'high', 'Use textContent or proper sanitization'),
+    SecurityRule(r'dangerouslySetInnerHTML', 'React XSS risk', 'high', 'Sanitize content before using dangerouslySetInnerHTML'),
+    SecurityRule(r'document\.write\s*\(', 'DOM-based XSS', 'medium', 'Use safer DOM manipulation methods'),
+    SecurityRule(r'localStorage\.setItem.*password', 'Password in localStorage', 'critical', 'Never store passwords in localStorage'),
+]
+
+RULE_SETS = {
+    'python': PYTHON_RULES,
+    'javascript': JAVASCRIPT_RULES
+}
+
+# File extension -> rule set
+EXTENSION_RULE_SETS = {
+    '.py': 'python',
+    '.js': 'javascript',
+    '.ts': 'javascript',
+    '.jsx': 'javascript',
+    '.tsx': 'javascript'
+}
+
+MMAP_THRESHOLD = 1024 * 1024
+
+# Bump when scanning changes in a way that alters findings for unchanged rules
+SCAN_VERSION = 'security-1'
+
+
+class Finding(NamedTuple):
+    file: str  # relative to the scanned root, OS separators
+    line: int
+    rule: SecurityRule
+
+
+class RuleSet:
+    """Rules compiled into one alternation with a named group per rule"""
+
+    def __init__(self, rules: Sequence[SecurityRule]):
+        self.rules = list(rules)
+        self.patterns = [re.compile(rule.pattern) for rule in self.rules]
+        # Each branch ends in an empty named group naming its rule (match.lastgroup). Wrapping
+        # the rule in a capturing group instead would hide its first character from the regex
+        # engine's prefix scan and make the combined search several times slower.
+        combined = '|'.join(f'(?:{rule.pattern})(?P<r{index}>)' for index, rule in enumerate(self.rules))
+        self.combined = re.compile(combined)
+        # Prefilter for memory-mapped files; \w and \s are ASCII-only in bytes patterns
+        self.combined_bytes = re.compile(combined.encode())
+
+    def scan(self, content) -> List[Tuple[int, int]]:
+        """(line number, rule index) for every rule that matches a line of content
+
+        content is str, bytes or an mmap. The combined pattern finds candidate
+        lines in one pass; each candidate line (including every line a match
+        spans) is then checked against the individual rules, so a rule whose
+        match is shadowed by an overlapping one is still reported.
+        """
+        text = isinstance(content, str)
+        newline = '\n' if text else b'\n'
+        combined = self.combined if text else self.combined_bytes
+
+        candidates: Dict[int, int] = {}  # line number -> offset of the line start
+        line_no, position = 1, 0
+        for match in combined.finditer(content):
+            start, end = match.span()
+            line_no += self._count(content, newline, position, start)
+            position = start
+            line_start = content.rfind(newline, 0, start) + 1
+            candidates.setdefault(line_no, line_start)
+            # A match crossing line ends (\s* can) makes every line it touches a candidate
+            spanned_start = line_start
+            for extra in range(1, self._count(content, newline, start, end) + 1):
+                spanned_start = content.find(newline, spanned_start) + 1
+                candidates.setdefault(line_no + extra, spanned_start)
+
+        hits = []
+        for line_no, line_start in candidates.items():
+            line_end = content.find(newline, line_start)
+            line = content[line_start:line_end if line_end != -1 else len(content)]
+            if not text:
+                line = line.decode('utf-8', errors='replace')
+            for index, pattern in enumerate(self.patterns):
+                if pattern.search(line):
+                    hits.append((line_no, index))
+        hits.sort(key=lambda hit: (hit[1], hit[0]))
+        return hits
+
+    @staticmethod
+    def _count(content, newline, start: int, end: int) -> int:
+        if isinstance(content, mmap.mmap):
+            return content[start:end].count(newline)
+        return content.count(newline, start, end)
+
+
+def scan_bytes(data: bytes, rule_set: RuleSet) -> List[Tuple[int, int]]:
+    return rule_set.scan(data.decode('utf-8', errors='replace')) if data else []
+
+
+def scan_file(path: str, rule_set: RuleSet, mmap_threshold: int = MMAP_THRESHOLD) -> List[Tuple[int, int]]:
+    """Read a file once and scan it; large files are memory-mapped"""
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return []
+        if size >= mmap_threshold:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return rule_set.scan(mapped)
+        data = f.read()
+    return scan_bytes(data, rule_set)
+
+
+# Compiled rule sets of a pool worker, built once by the initializer
+_worker_rule_sets: Dict[str, RuleSet] = {}
+
+
+def _init_worker(rule_sets: Dict[str, List[SecurityRule]]):
+    global _worker_rule_sets
+    _worker_rule_sets = {name: RuleSet(rules) for name, rules in rule_sets.items()}
+
+
+def _scan_chunk(root: str, files: List[Tuple[str, str]], mmap_threshold: int) -> List[Tuple[str, int, str, int]]:
+    """Scan (relative path, rule set) pairs; returns (path, line, rule set, rule index)"""
+    results = []
+    for rel_path, rule_set_name in files:
+        try:
+            for line_no, index in scan_file(os.path.join(root, rel_path), _worker_rule_sets[rule_set_name],
+                                            mmap_threshold):
+                results.append((rel_path, line_no, rule_set_name, index))
+        except Exception as e:
+            logger.warning(f"Error scanning {rel_path}: {e}")
+    return results
+
+
+class SecurityScanEngine:
+    """Scans a project tree with per-language rule sets, in parallel for large trees"""
+
+    def __init__(self, rule_sets: Optional[Dict[str, List[SecurityRule]]] = None,
+                 extensions: Optional[Dict[str, str]] = None, max_workers: Optional[int] = None,
+                 parallel_threshold: int = 200, chunk_size: int = 64,
+                 mmap_threshold: int = MMAP_THRESHOLD, cache: Optional[QAResultCache] = None):
+        self.rule_sets = rule_sets or RULE_SETS
+        self.extensions = extensions or EXTENSION_RULE_SETS
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = chunk_size
+        self.mmap_threshold = mmap_threshold
+        self.compiled = {name: RuleSet(rules) for name, rules in self.rule_sets.items()}
+        self.cache = cache
+        # Cache entries are only reused by the exact rules that produced them
+        self.versions = {name: rules_version(SCAN_VERSION, rules) for name, rules in self.rule_sets.items()}
+
+    def collect(self, root: Path, rule_set_names: Iterable[str], names: Iterable[str] = (),
+                files: Optional[Iterable[str]] = None) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """(relative path, rule set) of sources to scan, and relative paths of files called names
+
+        Uses the given relative file paths (e.g. from a ProjectSnapshot), or one walk of root.
+        """
+        wanted = set(rule_set_names)
+        names = set(names)
+        root = str(root)
+        if files is None:
+            files = (os.path.relpath(entry.path, root) for entry in walk_project(Path(root)))
+        sources, named = [], []
+        for rel_path in files:
+            name = os.path.basename(rel_path)
+            rule_set_name = self.extensions.get(os.path.splitext(name)[1])
+            if rule_set_name in wanted:
+                sources.append((rel_path, rule_set_name))
+            if name in names:
+                named.append(rel_path)
+        return sources, named
+
+    def scan(self, root: Path, sources: List[Tuple[str, str]],
+             read: Optional[Callable[[str], Optional[bytes]]] = None,
+             digest: Optional[Callable[[str], str]] = None) -> List[Finding]:
+        """Scan collected sources; files are ordered as given, findings by rule then line
+
+        ``read`` supplies already-loaded contents by relative path for the
+        serial scan (None means read the file here); pool workers always read
+        from disk. ``digest`` gives content hashes by relative path; with it
+        and a cache, only files whose contents have no cached hits are scanned.
+        """
+        root = str(root)
+        if self.cache is None or digest is None:
+            return self._findings(self._scan(root, sources, read))
+
+        hashes: Dict[str, str] = {}
+        for rel_path, _ in sources:
+            try:
+                hashes[rel_path] = digest(rel_path)
+            except OSError as e:
+                logger.warning(f"Error hashing {rel_path}: {e}")
+
+        # (rule set, content hash) -> [(line number, rule index)]
+        cached: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+        for rule_set_name in dict.fromkeys(name for _, name in sources):
+            found = self.cache.get_many(f'security-{rule_set_name}', self.versions[rule_set_name],
+                                        [hashes[rel_path] for rel_path, name in sources
+                                         if name == rule_set_name and rel_path in hashes])
+            cached.update(((rule_set_name, content), hits) for content, hits in found.items())
+
+        pending = [(rel_path, name) for rel_path, name in sources if (name, hashes.get(rel_path)) not in cached]
+        scanned: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for rel_path, line_no, _, index in self._scan(root, pending, read):
+            scanned[rel_path].append((line_no, index))
+        for rule_set_name in dict.fromkeys(name for _, name in pending):
+            # Files without hits are stored too, so clean files are skipped next time
+            self.cache.put_many(f'security-{rule_set_name}', self.versions[rule_set_name],
+                                {hashes[rel_path]: scanned.get(rel_path, []) for rel_path, name in pending
+                                 if name == rule_set_name and rel_path in hashes})
+
+        raw = []
+        for rel_path, rule_set_name in sources:
+            hits = cached.get((rule_set_name, hashes.get(rel_path)))
+            if hits is None:
+                hits = scanned.get(rel_path, [])
+            raw.extend((rel_path, line_no, rule_set_name, index) for line_no, index in hits)
+        return self._findings(raw)
+
+    def _scan(self, root: str, sources: List[Tuple[str, str]],
+              read: Optional[Callable[[str], Optional[bytes]]] = None) -> List[Tuple[str, int, str, int]]:
+        """(path, line, rule set, rule index) of every hit, serially or across the pool"""
+        if len(sources) < self.parallel_threshold or self.max_workers < 2:
+            return self._scan_serial(root, sources, read)
+
+        chunks = [sources[i:i + self.chunk_size] for i in range(0, len(sources), self.chunk_size)]
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks)),
+                                     initializer=_init_worker, initargs=(self.rule_sets,)) as pool:
+                futures = [pool.submit(_scan_chunk, root, chunk, self.mmap_threshold) for chunk in chunks]
+                raw = [hit for future in futures for hit in future.result()]
+        except (OSError, NotImplementedError, ImportError) as e:
+            # No working multiprocessing (e.g. Lambda has no /dev/shm)
+            logger.warning(f"Process pool unavailable, scanning serially: {e}")
+            raw = self._scan_serial(root, sources, read)
+        return raw
+
+    def _scan_serial(self, root: str, sources: List[Tuple[str, str]],
+                     read: Optional[Callable[[str], Optional[bytes]]] = None) -> List[Tuple[str, int, str, int]]:
+        raw = []
+        for rel_path, rule_set_name in sources:
+            try:
+                data = read(rel_path) if read else None
+                if data is not None:
+                    hits = scan_bytes(data, self.compiled[rule_set_name])
+                else:
+                    hits = scan_file(os.path.join(root, rel_path), self.compiled[rule_set_name], self.mmap_threshold)
+                for line_no, index in hits:
+                    raw.append((rel_path, line_no, rule_set_name, index))
+            except Exception as e:
+                logger.warning(f"Error scanning {rel_path}: {e}")
+        return raw
+
+    def _findings(self, raw: List[Tuple[str, int, str, int]]) -> List[Finding]:
+        return [Finding(rel_path, line_no, self.rule_sets[rule_set_name][index])
+                for rel_path, line_no, rule_set_name, index in raw]
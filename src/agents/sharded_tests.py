@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Sharded Tests - parallel test execution for the AI QA agent
+Python test files are split into shards with a longest-expected-first
+greedy plan over their historical durations, and each shard runs in its own
+pytest process (xdist style) so the slowest files start first and shards
+finish close together. Per-file outcomes are streamed as each file
+completes (this module doubles as the pytest plugin that reports how many
+tests each file has), every shard has a timeout, and measured durations
+feed the next plan. JavaScript suites run in one jest process with --maxWorkers, which
+does its own per-file scheduling.
+"""
+
+import heapq
+import json
+import logging
+import os
+import queue
+import re
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger('ShardedTests')
+
+TEST_DURATIONS_DB = Path("test_durations.db")
+SHARD_TIMEOUT = 300  # seconds
+DEFAULT_DURATION = 1.0  # expected seconds of a test file never timed before
+
+# Verbose pytest result lines: "tests/test_api.py::TestApi::test_get[x] PASSED   [ 12%]"
+PYTEST_RESULT = re.compile(r'^(?P<node>(?P<file>[^\s:][^:]*?)::\S.*?) (?P<outcome>PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS)\b')
+
+# Per-file node counts printed by the collection hook below: "SHARD-COLLECTED tests/test_api.py 12"
+PYTEST_COLLECTED = re.compile(r'^SHARD-COLLECTED (?P<file>.+) (?P<count>\d+)$')
+
+# Summary line of a file that failed to import: "ERROR tests/test_db.py - ModuleNotFoundError: ..."
+PYTEST_COLLECT_ERROR = re.compile(r'^ERROR (?P<file>[^\s:]+)(?: - (?P<reason>.*))?$')
+
+# pytest exit codes for "tests ran" and "no tests collected"
+PYTEST_OK = (0, 1, 5)
+
+
+@dataclass
+class Shard:
+    index: int
+    files: List[str]
+    expected: float  # seconds
+
+
+@dataclass
+class TestFileOutcome:
+    """Result of one test file"""
+    file: str
+    status: str  # passed, failed, skipped
+    tests: int
+    passed: int
+    failed: int
+    skipped: int
+    duration: float
+    shard: int
+    message: str
+    output: str = ''  # last lines of runner output on failure
+
+    @classmethod
+    def from_counts(cls, file: str, counts: Dict[str, int], duration: float, shard: int,
+                    timed_out: bool = False) -> 'TestFileOutcome':
+        tests = sum(counts.values())
+        if counts['failed'] or timed_out:
+            status = 'failed'
+        elif counts['passed']:
+            status = 'passed'
+        else:
+            status = 'skipped'
+        message = f"{counts['passed']}/{tests} tests passed"
+        if timed_out:
+            message += " (shard timed out)"
+        return cls(file, status, tests, counts['passed'], counts['failed'], counts['skipped'],
+                   round(duration, 3), shard, message)
+
+    @classmethod
+    def missing(cls, file: str, shard: int, status: str, message: str, output: str = '',
+                duration: float = 0.0) -> 'TestFileOutcome':
+        return cls(file, status, 0, 0, 0, 0, round(duration, 3), shard, message, output)
+
+
+class TestDurationStore:
+    """Smoothed historical duration per (project, test file) in SQLite (WAL mode)"""
+
+    SMOOTHING = 0.5
+
+    def __init__(self, db_path: Path = TEST_DURATIONS_DB):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connect().execute("""
+            CREATE TABLE IF NOT EXISTS test_durations (
+                project TEXT NOT NULL,
+                test_file TEXT NOT NULL,
+                duration REAL NOT NULL,
+                runs INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (project, test_file)
+            )
+        """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def durations(self, project: str) -> Dict[str, float]:
+        rows = self._connect().execute(
+            "SELECT test_file, duration FROM test_durations WHERE project = ?", (project,)
+        ).fetchall()
+        return dict(rows)
+
+    def record(self, project: str, durations: Dict[str, float]):
+        """Blend new measurements into the stored averages (one transaction)"""
+        if not durations:
+            return
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany("""
+                INSERT INTO test_durations (project, test_file, duration, runs, updated_at)
+                VALUES (?, ?, ?, 1, ?)
+                ON CONFLICT (project, test_file) DO UPDATE SET
+                    duration = duration * ? + excluded.duration * ?,
+                    runs = runs + 1,
+                    updated_at = excluded.updated_at
+            """, [(project, test_file, duration, now, 1 - self.SMOOTHING, self.SMOOTHING)
+                  for test_file, duration in durations.items()])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def plan_shards(files: List[str], durations: Dict[str, float], shard_count: int) -> List[Shard]:
+    """Longest-expected-first greedy split; shards come back longest first
+
+    Files never timed before are expected to take the median known duration.
+    Each shard keeps its files longest first too, so a timeout loses the
+    short tail rather than the expensive head.
+    """
+    known = sorted(durations[f] for f in files if f in durations)
+    default = known[len(known) // 2] if known else DEFAULT_DURATION
+    expected = {f: durations.get(f, default) for f in files}
+
+    shard_count = max(1, min(shard_count, len(files)))
+    shards = [Shard(index, [], 0.0) for index in range(shard_count)]
+    heap = [(0.0, index) for index in range(shard_count)]
+    for test_file in sorted(files, key=lambda f: (-expected[f], f)):
+        load, index = heapq.heappop(heap)
+        shards[index].files.append(test_file)
+        shards[index].expected = load + expected[test_file]
+        heapq.heappush(heap, (shards[index].expected, index))
+    return sorted((shard for shard in shards if shard.files), key=lambda shard: -shard.expected)
+
+
+class ShardedTestEngine:
+    """Runs test files across worker processes and streams per-file outcomes"""
+
+    def __init__(self, workers: Optional[int] = None, shard_timeout: float = SHARD_TIMEOUT,
+                 history: Optional[TestDurationStore] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.shard_timeout = shard_timeout
+        self.history = history
+
+    def run_pytest(self, project_path: str, files: List[str]) -> Iterator[TestFileOutcome]:
+        """pytest over sharded files; outcomes are yielded as each file finishes
+
+        A file whose results keep arriving after it was reported (a plugin
+        reordering tests across files) is reported again at shard end; the
+        later outcome supersedes the earlier one.
+        """
+        if not files:
+            return
+        project = str(Path(project_path).resolve())
+        durations = self.history.durations(project) if self.history else {}
+        shards = plan_shards(files, durations, self.workers)
+        logger.info(f"Running {len(files)} test files in {len(shards)} shards")
+
+        measured = {}
+        for outcome in self._run_shards(shards, lambda shard, emit: self._pytest_shard(project_path, shard, emit)):
+            if outcome.duration:
+                measured[outcome.file] = outcome.duration
+            yield outcome
+        if self.history:
+            self.history.record(project, measured)
+
+    def run_jest(self, project_path: str, files: List[str]) -> Iterator[TestFileOutcome]:
+        """One jest process with --maxWorkers; outcomes are yielded when it finishes"""
+        if not files:
+            return
+        shard = Shard(0, list(files), 0.0)
+        yield from self._run_shards([shard], lambda shard, emit: self._jest_shard(project_path, shard, emit))
+
+    def _run_shards(self, shards: List[Shard],
+                    run: Callable[[Shard, Callable[[TestFileOutcome], None]], None]) -> Iterator[TestFileOutcome]:
+        """Run shards on threads (each drives a subprocess) and yield outcomes as they arrive"""
+        outcomes: 'queue.Queue[Optional[TestFileOutcome]]' = queue.Queue()
+
+        def guarded(shard: Shard):
+            reported = set()
+
+            def emit(outcome: TestFileOutcome):
+                reported.add(outcome.file)
+                outcomes.put(outcome)
+
+            try:
+                run(shard, emit)
+            except Exception as e:
+                logger.error(f"Shard {shard.index} failed: {e}")
+                for test_file in shard.files:
+                    if test_file not in reported:
+                        outcomes.put(TestFileOutcome.missing(test_file, shard.index, 'failed',
+                                                             f"Error running tests: {e}"))
+            finally:
+                outcomes.put(None)
+
+        with ThreadPoolExecutor(max_workers=len(shards)) as pool:
+            for shard in shards:
+                pool.submit(guarded, shard)
+            remaining = len(shards)
+            while remaining:
+                outcome = outcomes.get()
+                if outcome is None:
+                    remaining -= 1
+                else:
+                    yield outcome
+
+    def _execute(self, cmd: List[str], cwd: str, on_line: Callable[[str], None],
+                 env: Optional[Dict[str, str]] = None) -> Tuple[int, bool, str]:
+        """Run cmd, feeding output lines to on_line; (exit code, timed out, output tail)"""
+        timed_out = threading.Event()
+        tail = deque(maxlen=40)
+        process = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   stdin=subprocess.DEVNULL, text=True, errors='replace',
+                                   start_new_session=(os.name == 'posix'))
+
+        def kill():
+            timed_out.set()
+            try:
+                # The whole process group, so test subprocesses go too
+                if os.name == 'posix':
+                    os.killpg(process.pid, signal.SIGKILL)
+                else:
+                    process.kill()
+            except OSError:
+                pass
+
+        timer = threading.Timer(self.shard_timeout, kill)
+        timer.start()
+        try:
+            for line in process.stdout:
+                tail.append(line)
+                on_line(line)
+            process.wait()
+        finally:
+            timer.cancel()
+            process.stdout.close()
+        return process.returncode, timed_out.is_set(), ''.join(tail)
+
+    def _pytest_shard(self, project_path: str, shard: Shard, emit: Callable[[TestFileOutcome], None]):
+        # Plugins like randomly would interleave files; the collection hook reports node counts per file
+        cmd = [sys.executable, '-m', 'pytest', '-v', '--color=no', '-p', 'no:cacheprovider', '-p', 'no:randomly',
+               '-p', __name__, '--continue-on-collection-errors', '--rootdir', '.', *shard.files]
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(filter(None, [str(Path(__file__).parent), env.get('PYTHONPATH')]))
+        wanted = {os.path.normpath(test_file): test_file for test_file in shard.files}
+        collected: Dict[str, int] = {}
+        nodes: Dict[str, Dict[str, str]] = {}  # test file -> node id -> passed/failed/skipped
+        emitted: Dict[str, TestFileOutcome] = {}
+        collect_errors: Dict[str, str] = {}
+        # A file's duration runs from the previous file's completion to its own last result
+        state = {'mark': time.time(), 'last': time.time(), 'done': None}
+
+        def complete(test_file: str) -> bool:
+            return test_file in collected and len(nodes[test_file]) >= collected[test_file]
+
+        def counts_of(test_file: str) -> Dict[str, int]:
+            counts = {'passed': 0, 'failed': 0, 'skipped': 0}
+            for outcome in nodes[test_file].values():
+                counts[outcome] += 1
+            return counts
+
+        def finish(test_file: str, timed_out: bool = False):
+            emitted[test_file] = TestFileOutcome.from_counts(test_file, counts_of(test_file),
+                                                             state['last'] - state['mark'], shard.index, timed_out)
+            emit(emitted[test_file])
+            state['mark'] = state['last']
+
+        def on_line(line: str):
+            match = PYTEST_RESULT.match(line)
+            if not match:
+                line = line.rstrip()
+                count = PYTEST_COLLECTED.match(line)
+                if count and os.path.normpath(count.group('file')) in wanted:
+                    collected[wanted[os.path.normpath(count.group('file'))]] = int(count.group('count'))
+                error = PYTEST_COLLECT_ERROR.match(line)
+                if error and os.path.normpath(error.group('file')) in wanted:
+                    collect_errors[wanted[os.path.normpath(error.group('file'))]] = error.group('reason') or ''
+                return
+            test_file = wanted.get(os.path.normpath(match.group('file')))
+            if test_file is None:
+                return
+            # A complete file is emitted once another one reports, so a teardown error of its last test still counts
+            if state['done'] not in (None, test_file):
+                finish(state['done'])
+                state['done'] = None
+            state['last'] = time.time()
+            outcome = match.group('outcome')
+            if outcome in ('PASSED', 'XFAIL'):
+                outcome = 'passed'
+            elif outcome in ('FAILED', 'ERROR', 'XPASS'):
+                outcome = 'failed'
+            else:
+                outcome = 'skipped'
+            # A node can report twice (PASSED, then ERROR at teardown); a failure sticks
+            file_nodes = nodes.setdefault(test_file, {})
+            if file_nodes.get(match.group('node')) != 'failed':
+                file_nodes[match.group('node')] = outcome
+            if test_file not in emitted and complete(test_file):
+                state['done'] = test_file
+
+        returncode, timed_out, output = self._execute(cmd, project_path, on_line, env)
+        # Files still open at shard end, complete ones first; the rest were cut short if the shard timed out
+        for test_file in sorted((f for f in nodes if f not in emitted), key=lambda f: not complete(f)):
+            finish(test_file, timed_out and not complete(test_file))
+        # Results that arrived after a file was reported supersede that outcome
+        for test_file, outcome in list(emitted.items()):
+            counts = counts_of(test_file)
+            if (outcome.passed, outcome.failed, outcome.skipped) != (counts['passed'], counts['failed'],
+                                                                     counts['skipped']):
+                emit(TestFileOutcome.from_counts(test_file, counts, outcome.duration, shard.index,
+                                                 timed_out and not complete(test_file)))
+
+        hung = None
+        for test_file in shard.files:
+            if test_file in nodes:
+                continue
+            if test_file in collect_errors:
+                reason = collect_errors[test_file]
+                emit(TestFileOutcome.missing(test_file, shard.index, 'failed',
+                                             f"Collection error: {reason}" if reason else "Collection error", output))
+            elif timed_out:
+                # The first file without results is the one that hung; its time is charged to it
+                # so the next plan starts it first
+                duration = 0.0
+                if hung is None:
+                    hung = test_file
+                    duration = time.time() - state['last']
+                emit(TestFileOutcome.missing(test_file, shard.index, 'failed',
+                                             f"Not run: shard timed out after {self.shard_timeout}s",
+                                             duration=duration))
+            elif returncode in PYTEST_OK:
+                emit(TestFileOutcome.missing(test_file, shard.index, 'skipped', "No tests collected"))
+            else:
+                emit(TestFileOutcome.missing(test_file, shard.index, 'failed',
+                                             f"pytest exited with code {returncode}", output))
+
+    def _jest_shard(self, project_path: str, shard: Shard, emit: Callable[[TestFileOutcome], None]):
+        fd, report_path = tempfile.mkstemp(prefix='jest-', suffix='.json')
+        os.close(fd)
+        try:
+            cmd = ['npx', '--no-install', 'jest', '--ci', '--json', f'--outputFile={report_path}',
+                   f'--maxWorkers={self.workers}', '--runTestsByPath', *shard.files]
+            returncode, timed_out, output = self._execute(cmd, project_path, lambda line: None)
+            try:
+                with open(report_path) as f:
+                    report = json.load(f)
+            except (OSError, ValueError):
+                report = {}
+        finally:
+            os.unlink(report_path)
+
+        root = Path(project_path).resolve()
+        reported = set()
+        for file_result in report.get('testResults', []):
+            try:
+                test_file = os.path.relpath(file_result['name'], root)
+            except ValueError:
+                test_file = file_result['name']
+            counts = {'passed': 0, 'failed': 0, 'skipped': 0}
+            for assertion in file_result.get('assertionResults', []):
+                status = assertion.get('status')
+                counts['passed' if status == 'passed' else 'failed' if status == 'failed' else 'skipped'] += 1
+            if file_result.get('status') == 'failed' and not counts['failed']:
+                counts['failed'] = 1  # suite failed to run
+            duration = (file_result.get('endTime', 0) - file_result.get('startTime', 0)) / 1000
+            emit(TestFileOutcome.from_counts(test_file, counts, max(duration, 0.0), shard.index))
+            reported.add(os.path.normpath(test_file))
+
+        for test_file in shard.files:
+            if os.path.normpath(test_file) in reported:
+                continue
+            if timed_out:
+                message = f"Not run: shard timed out after {self.shard_timeout}s"
+            else:
+                message = f"jest exited with code {returncode}"
+            emit(TestFileOutcome.missing(test_file, shard.index, 'failed', message, output))
+
+
+def default_history() -> Optional[TestDurationStore]:
+    """Duration history at TEST_DURATIONS_DB, or None when it can't be opened"""
+    try:
+        return TestDurationStore(Path(os.environ.get('TEST_DURATIONS_DB', TEST_DURATIONS_DB)))
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"Test duration history disabled: {e}")
+        return None
+
+
+def pytest_collection_finish(session):
+    """pytest hook (shards load this module with -p): print the node count of every test file"""
+    counts: Dict[str, int] = {}
+    for item in session.items:
+        test_file = item.nodeid.split('::', 1)[0]
+        counts[test_file] = counts.get(test_file, 0) + 1
+    for test_file, count in counts.items():
+        print(f"\nSHARD-COLLECTED {test_file} {count}", flush=True)
@@ -12,6 +12,10 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from pathlib import Path
+import sys
+
+sys.path.append(str(Path(__file__).parent))
+from issue_routing import IssueRoutingEngine
 
 # Setup logging
 logging.basicConfig(
@@ -94,35 +98,31 @@ class SimpleGitHubAgentRouter:
             }
         }
         
+        # Compile label and pattern tables once
+        self.routing_engine = IssueRoutingEngine(
+            {'patterns': {agent_type: config['patterns'] for agent_type, config in self.agent_mapping.items()}},
+            label_tables={'labels': {agent_type: config['labels'] for agent_type, config in self.agent_mapping.items()}}
+        )
+        
         logger.info("Simple GitHub Agent Router initialized")
     
     def analyze_issue(self, title: str, body: str, labels: List[str]) -> str:
         """Analyze issue to determine which agent should handle it"""
         
-        title_lower = title.lower()
-        body_lower = body.lower()
-        labels_lower = [label.lower() for label in labels]
-        
         # Priority 1: Explicit labels
-        for agent_type, config in self.agent_mapping.items():
-            for label in config['labels']:
-                if label in labels_lower:
-                    logger.info(f"Agent selected by label '{label}': {agent_type}")
-                    return agent_type
-        
-        # Priority 2: Title patterns
-        for agent_type, config in self.agent_mapping.items():
-            for pattern in config['patterns']:
-                if pattern in title_lower:
-                    logger.info(f"Agent selected by title pattern '{pattern}': {agent_type}")
-                    return agent_type
+        agent_type = self.routing_engine.first_agent_for_labels('labels', labels)
+        if agent_type:
+            logger.info(f"Agent selected by label: {agent_type}")
+            return agent_type
         
-        # Priority 3: Body content
-        for agent_type, config in self.agent_mapping.items():
-            for pattern in config['patterns']:
-                if pattern in body_lower:
-                    logger.info(f"Agent selected by body pattern '{pattern}': {agent_type}")
-                    return agent_type
+        # Priority 2: Title patterns, then Priority 3: Body content
+        for source, text in (('title', title), ('body', body)):
+            match = self.routing_engine.analyze(text)
+            agent_type = match.first('patterns')
+            if agent_type:
+                pattern = self.routing_engine.matched_keyword(match, 'patterns', agent_type)
+                logger.info(f"Agent selected by {source} pattern '{pattern}': {agent_type}")
+                return agent_type
         
         # Default: Developer agent
         logger.info("No specific match, defaulting to developer agent")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Worktree Pool - isolated git working copies for concurrent agents
+Keeps one bare mirror per repository and leases git worktrees from it, so
+PR, merge and SDLC operations never share a working copy. Worktrees are reset
+and reused between leases instead of recloning (ignored files such as
+node_modules survive the reset), the number per repository is bounded, and
+idle ones are garbage-collected.
+"""
+
+import logging
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger('WorktreePool')
+
+WORKTREE_ROOT = Path("worktrees")
+GIT_IDENTITY = ['-c', 'user.name=Agent Worktree', '-c', 'user.email=agent-worktree@users.noreply.github.com']
+
+
+class WorktreePoolTimeout(Exception):
+    """No worktree became free within the lease timeout"""
+
+
+class WorktreePool:
+    """Bounded pool of reusable git worktrees, one bare mirror per repository"""
+
+    def __init__(self, owner: str, root: Path = WORKTREE_ROOT, max_per_repo: int = 4,
+                 idle_ttl_seconds: int = 1800, fetch_interval_seconds: int = 15):
+        self.owner = owner
+        self.root = Path(root).resolve()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_per_repo = max_per_repo
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self.fetch_interval_seconds = fetch_interval_seconds
+
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._idle: Dict[str, List[Dict]] = defaultdict(list)  # repo -> [{'path', 'released_at'}], most recent last
+        self._leased: Dict[str, int] = defaultdict(int)
+        self._mirror_locks: Dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._last_fetch: Dict[str, float] = {}
+
+    def git(self, args: List[str], cwd: Path, check: bool = True, timeout: int = 600) -> subprocess.CompletedProcess:
+        """Run git with a fixed identity; raises RuntimeError on failure when check is set"""
+        result = subprocess.run(['git'] + GIT_IDENTITY + args, cwd=str(cwd),
+                                capture_output=True, text=True, timeout=timeout)
+        if check and result.returncode != 0:
+            raise RuntimeError(f"git {' '.join(args)} failed: {result.stderr.strip()}")
+        return result
+
+    def mirror_path(self, repo: str) -> Path:
+        return self.root / f"{repo}.git"
+
+    def mirror(self, repo: str, force_fetch: bool = False) -> Path:
+        """Bare mirror of the repository, cloned on first use and fetched at most every fetch_interval"""
+        path = self.mirror_path(repo)
+        with self._mirror_locks[repo]:
+            if not path.exists():
+                result = subprocess.run(
+                    ['gh', 'repo', 'clone', f'{self.owner}/{repo}', str(path), '--', '--bare'],
+                    capture_output=True, text=True, timeout=1800
+                )
+                if result.returncode != 0:
+                    raise RuntimeError(f"Failed to clone {repo}: {result.stderr.strip()}")
+                self.git(['config', 'remote.origin.fetch', '+refs/heads/*:refs/remotes/origin/*'], path)
+                force_fetch = True
+            if force_fetch or time.time() - self._last_fetch.get(repo, 0) >= self.fetch_interval_seconds:
+                self.git(['fetch', '--prune', 'origin'], path)
+                self._last_fetch[repo] = time.time()
+        return path
+
+    def fetch_pr(self, repo: str, pr_number: int) -> str:
+        """Fetch a PR head into the mirror; returns its ref"""
+        ref = f"refs/pr/{pr_number}"
+        with self._mirror_locks[repo]:
+            self.git(['fetch', 'origin', f'+pull/{pr_number}/head:{ref}'], self.mirror_path(repo))
+        return ref
+
+    def _acquire(self, repo: str, timeout: Optional[float]) -> Optional[Path]:
+        """Reserve a pool slot; returns an idle worktree path to reuse, or None to create one"""
+        deadline = None if timeout is None else time.time() + timeout
+        with self._available:
+            while not self._idle[repo] and self._leased[repo] >= self.max_per_repo:
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    raise WorktreePoolTimeout(f"No free worktree for {repo} after {timeout}s")
+                self._available.wait(remaining)
+            self._leased[repo] += 1
+            if self._idle[repo]:
+                return self._idle[repo].pop()['path']
+            return None
+
+    def _release(self, repo: str, path: Optional[Path], reusable: bool):
+        with self._available:
+            self._leased[repo] -= 1
+            if reusable and path is not None:
+                self._idle[repo].append({'path': path, 'released_at': time.time()})
+            self._available.notify()
+
+    def _reset(self, path: Path, start_point: str):
+        """Point a reused worktree at start_point and drop local changes (ignored files are kept)"""
+        self.git(['merge', '--abort'], path, check=False)
+        self.git(['rebase', '--abort'], path, check=False)
+        self.git(['checkout', '--force', '--detach', start_point], path)
+        self.git(['clean', '-fd'], path)
+
+    def _create(self, repo: str, mirror: Path, start_point: str) -> Path:
+        path = Path(tempfile.mkdtemp(prefix=f"{repo}-", dir=str(self.root)))
+        self.git(['worktree', 'add', '--force', '--detach', str(path), start_point], mirror)
+        return path
+
+    def _remove(self, repo: str, path: Path):
+        self.git(['worktree', 'remove', '--force', str(path)], self.mirror_path(repo), check=False)
+        shutil.rmtree(path, ignore_errors=True)
+
+    @contextmanager
+    def worktree(self, repo: str, start_point: str = "origin/main", timeout: Optional[float] = 600):
+        """Lease a detached worktree at start_point; it is returned to the pool afterwards"""
+        mirror = self.mirror(repo)
+        path = self._acquire(repo, timeout)
+        reusable = False
+        try:
+            if path is not None:
+                try:
+                    self._reset(path, start_point)
+                except Exception as e:
+                    logger.warning(f"Discarding worktree {path} that failed to reset: {e}")
+                    self._remove(repo, path)
+                    path = None
+            if path is None:
+                path = self._create(repo, mirror, start_point)
+            yield path
+            reusable = True
+        finally:
+            if path is not None and not reusable:
+                # An operation that raised may have left the worktree in any state
+                self._remove(repo, path)
+            self._release(repo, path, reusable)
+
+    def collect_garbage(self, max_idle_seconds: Optional[int] = None) -> int:
+        """Remove worktrees idle longer than the TTL; returns how many were removed"""
+        ttl = self.idle_ttl_seconds if max_idle_seconds is None else max_idle_seconds
+        cutoff = time.time() - ttl
+        expired = []
+        with self._lock:
+            for repo, idle in self._idle.items():
+                keep = [entry for entry in idle if entry['released_at'] >= cutoff]
+                expired.extend((repo, entry['path']) for entry in idle if entry['released_at'] < cutoff)
+                self._idle[repo] = keep
+
+        for repo, path in expired:
+            self._remove(repo, path)
+        for repo in {repo for repo, _ in expired}:
+            self.git(['worktree', 'prune'], self.mirror_path(repo), check=False)
+        if expired:
+            logger.info(f"Removed {len(expired)} idle worktrees")
+        return len(expired)
+
+    def status(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            repos = set(self._idle) | set(self._leased)
+            return {repo: {'idle': len(self._idle[repo]), 'leased': self._leased[repo]} for repo in repos}
@@ -11,6 +11,7 @@ import json
 import psutil
 import subprocess
 from datetime import datetime, timedelta
+from pathlib import Path
 from threading import Thread
 from flask import Flask, render_template, jsonify, request
 from flask_socketio import SocketIO, emit
@@ -56,20 +57,26 @@ class ComprehensiveDashboard:
     def initialize_team_systems(self):
         """Initialize AI development team systems"""
         try:
-            # Try to import and initialize team systems
-            import importlib.util
+            # The team systems are hyphenated scripts, so they can't be found by
+            # module name; load them by path through the agent registry
+            sys.path.append(str(Path(__file__).resolve().parent.parent / 'agents'))
+            from agent_registry import AgentRegistry
             
-            # Check if team communication is available
-            comm_spec = importlib.util.find_spec("team-communication-protocol")
-            if comm_spec:
-                from team_communication_protocol import communication_hub
-                self.team_communication = communication_hub
+            scripts_dir = Path(__file__).resolve().parent.parent.parent / 'scripts'
+            registry = AgentRegistry({
+                'team_communication': {'module': 'team-communication-protocol.py'},
+                'work_queue': {'module': 'work-queue-manager.py'}
+            }, base_dir=scripts_dir)
             
-            # Check if work queue is available
-            queue_spec = importlib.util.find_spec("work-queue-manager") 
-            if queue_spec:
-                from work_queue_manager import work_queue_manager
-                self.work_queue = work_queue_manager
+            for system, attribute, target in [('team_communication', 'communication_hub', 'team_communication'),
+                                              ('work_queue', 'work_queue_manager', 'work_queue')]:
+                try:
+                    setattr(self, target, getattr(registry.load_module(system), attribute))
+                except Exception as e:
+                    print(f"Team system {system} not yet available: {e}")
+            
+            if registry.profiles:
+                print(registry.format_import_report())
                 
         except Exception as e:
             print(f"Team systems not yet available: {e}")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Board Metrics snapshot tests - totals must survive a JSON save/load round trip
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "src" / "agents"))
+
+from board_metrics import BoardMetrics
+
+DONE_COLUMN_ID = 1002
+
+
+def card_event(kind, card_id, column_id, column_name, ts, **extra):
+    return {'type': kind, 'card_id': card_id, 'column_id': column_id, 'column_name': column_name,
+            'issue_number': card_id + 100, 'created_ts': ts - 7200, 'ts': ts, **extra}
+
+
+def round_trip(metrics: BoardMetrics) -> BoardMetrics:
+    return BoardMetrics.from_dict(json.loads(json.dumps(metrics.to_dict())))
+
+
+def test_save_load_round_trip_keeps_totals():
+    now = time.time()
+    metrics = BoardMetrics()
+    metrics.apply(card_event('card_added', 1, 1001, 'To Do', now))
+    metrics.apply(card_event('card_added', 2, DONE_COLUMN_ID, 'Done', now))
+    metrics.plan_sprint('sprint-1', {101: 5, 102: 3}, now, now + 14 * 86400)
+
+    loaded = round_trip(metrics)
+
+    assert loaded.to_dict() == metrics.to_dict()
+    assert loaded.weekly_throughput(DONE_COLUMN_ID, now) == 1
+    assert loaded.weekly_throughput(now=now) == 1
+    assert loaded.avg_cycle_time() == metrics.avg_cycle_time()
+    assert loaded.sprint_report('sprint-1', now) == metrics.sprint_report('sprint-1', now)
+
+
+def test_events_after_load_update_the_same_totals():
+    now = time.time()
+    metrics = BoardMetrics()
+    metrics.apply(card_event('card_added', 1, 1001, 'To Do', now))
+    metrics.apply(card_event('card_added', 2, DONE_COLUMN_ID, 'Done', now))
+    metrics.plan_sprint('sprint-1', {101: 5, 102: 3}, now, now + 14 * 86400)
+
+    loaded = round_trip(metrics)
+    # Card 2 is reopened, card 1 finished
+    loaded.apply(card_event('card_moved', 2, 1001, 'To Do', now,
+                            from_column_id=DONE_COLUMN_ID, from_column_name='Done'))
+    loaded.apply(card_event('card_moved', 1, DONE_COLUMN_ID, 'Done', now,
+                            from_column_id=1001, from_column_name='To Do'))
+
+    assert set(loaded.column_throughput) == {str(DONE_COLUMN_ID)}
+    assert loaded.weekly_throughput(DONE_COLUMN_ID, now) == 1
+    assert dict(loaded.column_counts) == {'To Do': 1, 'Done': 1}
+    assert list(loaded.done_cards) == ['1']
+    assert loaded.completed_issues('sprint-1') == {101}
+    assert loaded.sprint_report('sprint-1', now)['remaining_points'] == 3
+    assert round_trip(loaded).to_dict() == loaded.to_dict()